@@ -0,0 +1,274 @@
+# api/columnar_snapshot.py
+
+import json
+import os
+import pickle
+import shutil
+
+import numpy as np
+
+from tda.avl import AVL
+from tda.space_saving import SpaceSaving
+from tda.path_trie import PathTrie
+from tda.hash_map import Map
+from sim.visit_counter import VisitCounter
+from domain.order_table import OrderTable, ClientTable
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+CURRENT = "CURRENT"         # nombre de la versión publicada
+KEEP_VERSIONS = 2           # versiones que se conservan (la actual y la anterior)
+
+def intern(values):
+    """(códigos int32, vocabulario) de una secuencia de str/None; None = código -1."""
+    vocab, codes = {}, np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        codes[i] = -1 if value is None else vocab.setdefault(value, len(vocab))
+    return codes, np.array(list(vocab), dtype=str)
+
+def decode(codes, vocab):
+    return [None if c < 0 else str(vocab[c]) for c in codes.tolist()]
+
+def _strings(values):
+    return np.array(["" if v is None else str(v) for v in values], dtype=str)
+
+# ------------------ Escritura ------------------
+
+def current_version(directory):
+    """Versión publicada en directory, o None (directorio vacío o del formato sin versiones)."""
+    try:
+        with open(os.path.join(directory, CURRENT), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def _versions(directory):
+    return sorted(name for name in os.listdir(directory) if name.startswith("v") and name[1:].isdigit())
+
+def write_snapshot(state, directory):
+    """
+    Guarda el estado (el dict que usan dashboard y API) como columnas .npy y
+    un manifest.json en una versión nueva, directory/vNNNNNN, y devuelve su
+    nombre. Una versión no se modifica nunca: se publica reemplazando
+    atómicamente el archivo CURRENT, así quien tenga abierta una instantánea
+    sigue leyendo siempre la misma. Se conservan las KEEP_VERSIONS últimas.
+    """
+    if os.path.exists(os.path.join(directory, MANIFEST)):
+        # Formato anterior: columnas sueltas en el directorio
+        shutil.rmtree(directory)
+    os.makedirs(directory, exist_ok=True)
+    existing = _versions(directory)
+    version = f"v{int(existing[-1][1:]) + 1 if existing else 1:06d}"
+    tmp = os.path.join(directory, version)
+    os.makedirs(tmp)
+    manifest = {"version": FORMAT_VERSION, "tables": {}, "meta": {}}
+
+    def save(table, columns):
+        entry = manifest["tables"][table] = {"rows": None, "columns": {}}
+        for name, array in columns.items():
+            filename = f"{table}.{name}.npy"
+            np.save(os.path.join(tmp, filename), array)
+            entry["columns"][name] = {"file": filename, "dtype": array.dtype.str}
+            if not name.endswith(".vocab"):
+                entry["rows"] = len(array)
+
+    # OrderTable/ClientTable ya tienen estas columnas; una lista de objetos se convierte
+    orders = state.get("orders", [])
+    if not isinstance(orders, OrderTable):
+        orders = OrderTable.from_orders(orders)
+    save("orders", orders.to_columns())
+
+    clients = state.get("clients", [])
+    if not isinstance(clients, ClientTable):
+        clients = ClientTable.from_clients(clients)
+    save("clients", clients.to_columns())
+
+    visits = state.get("node_visits", Map())
+    if isinstance(visits, VisitCounter):
+        # Indexadas por id de vértice del trie (etiquetas en route_labels): se guarda la vista tal cual
+        save("visits", {"count": visits.counts()})
+    else:
+        items = list(visits.items())
+        save("visits", {
+            "node": _strings([k for k, _ in items]),
+            "count": np.array([v for _, v in items], dtype=np.int64),
+        })
+
+    # Rutas por id del PathTrie; el trie va en sus propias tablas de enteros
+    tracker = state.get("routes_avl", AVL())
+    routes = tracker.in_order()
+    columns = {
+        "route_id": np.array([k for k, _ in routes], dtype=np.int64),
+        "freq": np.array([f for _, f in routes], dtype=np.int64),
+    }
+    if isinstance(tracker, SpaceSaving):
+        # Heavy hitters: además del conteo estimado se guarda su error
+        columns["error"] = np.array([tracker.error(k) for k, _ in routes], dtype=np.int64)
+        manifest["routes"] = {"kind": "space_saving", "capacity": tracker.capacity, "total": tracker.total}
+    save("routes", columns)
+
+    trie = state.get("route_trie", PathTrie()).to_arrays()
+    save("route_trie", {name: np.array(trie[name], dtype=np.int64) for name in ("parent", "vertex", "route")})
+    save("route_ids", {"node": np.array(trie["route_node"], dtype=np.int64)})
+    save("route_labels", {"label": _strings(trie["labels"])})
+
+    roles = state.get("node_roles", {})
+    codes, vocab = intern(list(roles.values()))
+    save("roles", {"node": _strings(list(roles)), "role": codes, "role.vocab": vocab})
+
+    # Escalares pequeños (n_nodes, journal_id...) van en el manifest
+    for key, value in state.items():
+        if isinstance(value, (int, float, str, bool)) or value is None:
+            manifest["meta"][key] = value
+    with open(os.path.join(tmp, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1)
+
+    pointer = os.path.join(directory, f"{CURRENT}.tmp")
+    with open(pointer, "w", encoding="utf-8") as f:
+        f.write(version)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(pointer, os.path.join(directory, CURRENT))
+    for name in _versions(directory)[:-KEEP_VERSIONS]:
+        # Quien ya tenga mapeadas columnas de una versión borrada las sigue leyendo (POSIX)
+        shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+    return version
+
+# ------------------ Lectura ------------------
+
+class ColumnarSnapshot:
+    """
+    Instantánea columnar abierta con np.memmap (mmap=True): abrir cuesta leer
+    el manifest, y las páginas de cada columna se cargan recién al usarlas y
+    se comparten entre procesos a través de la caché del sistema operativo.
+
+    snapshot.column("orders", "status") -> arreglo (códigos si es internada)
+    snapshot.vocab("orders", "status")  -> vocabulario de esos códigos
+    """
+
+    def __init__(self, directory, mmap=True, version=None):
+        # La versión se resuelve una sola vez: las columnas que se abran después
+        # son de esta misma instantánea aunque se publique otra
+        version = version or current_version(directory)
+        self.directory = directory if version is None else os.path.join(directory, version)
+        self.version = version
+        with open(os.path.join(self.directory, MANIFEST), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        if self.manifest.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {self.manifest.get('version')}")
+        self._mode = "r" if mmap else None
+        self._columns = {}
+
+    @property
+    def meta(self):
+        return self.manifest["meta"]
+
+    def rows(self, table):
+        return self.manifest["tables"][table]["rows"]
+
+    def column(self, table, name):
+        key = (table, name)
+        if key not in self._columns:
+            info = self.manifest["tables"][table]["columns"][name]
+            self._columns[key] = np.load(os.path.join(self.directory, info["file"]), mmap_mode=self._mode)
+        return self._columns[key]
+
+    def vocab(self, table, name):
+        return self.column(table, f"{name}.vocab")
+
+    def decoded(self, table, name):
+        """Columna internada como lista de str (None donde no había valor)."""
+        return decode(self.column(table, name), self.vocab(table, name))
+
+    def code_of(self, table, name, value):
+        """Código de value en una columna internada, o -1 si no aparece."""
+        hits = np.flatnonzero(self.vocab(table, name) == value)
+        return int(hits[0]) if len(hits) else -1
+
+    def node_visits(self, trie=None):
+        """VisitCounter sobre los ids del trie, o Map {etiqueta: visitas} en instantáneas anteriores."""
+        if "node" not in self.manifest["tables"]["visits"]["columns"]:
+            return VisitCounter(trie, counts=self.column("visits", "count"))
+        visits = Map()
+        visits.update(zip(self.column("visits", "node").tolist(), self.column("visits", "count").tolist()))
+        return visits
+
+    def _route_keys(self):
+        # Instantáneas anteriores al PathTrie guardaban la ruta como texto
+        if "route_id" in self.manifest["tables"]["routes"]["columns"]:
+            return self.column("routes", "route_id").tolist()
+        return self.column("routes", "route").tolist()
+
+    def routes_avl(self):
+        """AVL de rutas (claves = ids del PathTrie), o SpaceSaving si se guardó en modo heavy hitters."""
+        info = self.manifest.get("routes")
+        if info is not None and info["kind"] == "space_saving":
+            return SpaceSaving.from_dict({
+                "capacity": info["capacity"],
+                "total": info["total"],
+                "counts": list(zip(self._route_keys(),
+                                   self.column("routes", "freq").tolist(),
+                                   self.column("routes", "error").tolist())),
+            })
+        # Las rutas se escribieron en orden (in_order): construcción en O(n)
+        return AVL.from_sorted(zip(self._route_keys(), self.column("routes", "freq").tolist()))
+
+    def route_trie(self):
+        """PathTrie de las rutas, o None si la instantánea es anterior a él."""
+        if "route_trie" not in self.manifest["tables"]:
+            return None
+        return PathTrie.from_arrays(
+            labels=self.column("route_labels", "label").tolist(),
+            parent=self.column("route_trie", "parent").tolist(),
+            vertex=self.column("route_trie", "vertex").tolist(),
+            route=self.column("route_trie", "route").tolist(),
+            route_node=self.column("route_ids", "node").tolist(),
+        )
+
+    def _table_columns(self, table):
+        return {name: self.column(table, name) for name in self.manifest["tables"][table]["columns"]}
+
+    def order_table(self):
+        """OrderTable sobre las columnas de la instantánea (sin copiarlas mientras no se modifique)."""
+        return OrderTable.from_columns(self._table_columns("orders"))
+
+    def client_table(self):
+        return ClientTable.from_columns(self._table_columns("clients"))
+
+    def node_roles(self):
+        return dict(zip(self.column("roles", "node").tolist(), self.decoded("roles", "role")))
+
+    def tables(self):
+        """
+        Las claves tabulares del estado. Órdenes y clientes quedan sobre las
+        columnas mapeadas; el nodo de cada cliente queda como etiqueta.
+        """
+        trie = self.route_trie()
+        tables = {
+            "clients": self.client_table(),
+            "orders": self.order_table(),
+            "routes_avl": self.routes_avl(),
+            "node_visits": self.node_visits(trie),
+            "node_roles": self.node_roles(),
+        }
+        if trie is not None:
+            tables["route_trie"] = trie
+        return tables
+
+    def to_state(self):
+        """El dict de estado con objetos (el formato del pickle), sin lo que no es tabular (p. ej. route_table)."""
+        state = dict(self.meta)
+        state.update(self.tables())
+        return state
+
+# ------------------ Conversores ------------------
+
+def pickle_to_columnar(pickle_path, directory):
+    with open(pickle_path, "rb") as f:
+        state = pickle.load(f)
+    write_snapshot(state, directory)
+
+def columnar_to_pickle(directory, pickle_path):
+    state = ColumnarSnapshot(directory, mmap=False).to_state()
+    with open(pickle_path, "wb") as f:
+        pickle.dump(state, f)
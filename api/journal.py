@@ -0,0 +1,175 @@
+# api/journal.py
+
+import json
+import os
+import time
+import uuid
+
+class Journal:
+    """
+    Bitácora de eventos (write-ahead) en JSON lines, solo de agregado.
+
+    La primera línea es {"journal_id": ...}: identifica la instantánea a la que
+    se aplican los eventos siguientes. Si la instantánea lleva otro id, la
+    bitácora ya está incluida en ella y se ignora.
+
+    Cada append escribe una línea y la entrega al sistema operativo; el fsync
+    se agrupa (cada sync_every eventos o sync_interval segundos, y en sync()),
+    así que una caída del proceso no pierde nada y una del sistema a lo sumo
+    la última tanda. Una línea final incompleta (escritura cortada) se ignora.
+    """
+
+    def __init__(self, path, sync_every=32, sync_interval=0.2):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.journal_id = None
+        self.entries = 0            # eventos desde la cabecera
+        self._file = None
+        self._inode = None          # inodo del archivo abierto (cambia si se reemplaza)
+        self._offset = 0            # bytes ya leídos/aplicados
+        self._own = set()           # ids de eventos escritos por este proceso
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    # ------------------ Apertura ------------------
+
+    def open(self, journal_id):
+        """
+        Abre la bitácora de journal_id y devuelve sus eventos para reproducirlos.
+        Si el archivo no existe o es de otra instantánea, se empieza uno vacío.
+        """
+        self.close()
+        self.journal_id = journal_id
+        self._offset = 0
+        self.entries = 0
+        self._own.clear()
+        header = self._read_header()
+        if header is None or header.get("journal_id") != journal_id:
+            self.reset(journal_id)
+            return []
+        events = self.read_new()
+        if os.path.getsize(self.path) > self._offset:
+            # Cola cortada por una caída: se descarta para que el próximo append
+            # no quede pegado a ella
+            with open(self.path, "r+b") as f:
+                f.truncate(self._offset)
+        self._open_append()
+        return events
+
+    def _open_append(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._inode = os.fstat(self._file.fileno()).st_ino
+
+    def reset(self, journal_id):
+        """Reemplaza (atómicamente) la bitácora por una vacía de journal_id."""
+        self.close()
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"journal_id": journal_id}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self.journal_id = journal_id
+        self.entries = 0
+        self._own.clear()
+        self._open_append()
+        self._offset = os.path.getsize(self.path)
+
+    def _read_header(self):
+        try:
+            with open(self.path, "rb") as f:
+                line = f.readline()
+        except FileNotFoundError:
+            return None
+        if not line.endswith(b"\n"):
+            return None
+        self._offset = len(line)
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None
+
+    def replaced(self):
+        """True si la ruta ya no es el archivo que se tiene abierto (otro proceso lo reemplazó)."""
+        try:
+            return os.stat(self.path).st_ino != self._inode
+        except FileNotFoundError:
+            return True
+
+    def _header_id(self):
+        try:
+            with open(self.path, "rb") as f:
+                return json.loads(f.readline()).get("journal_id")
+        except (FileNotFoundError, ValueError):
+            return None
+
+    # ------------------ Lectura ------------------
+
+    def has_unread(self):
+        """True si otro proceso agregó eventos que este aún no leyó."""
+        try:
+            return os.path.getsize(self.path) > self._offset
+        except FileNotFoundError:
+            return False
+
+    def read_new(self):
+        """Eventos completos agregados desde la última lectura (sin los propios)."""
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        end = data.rfind(b"\n") + 1
+        events = []
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            event_id = event.pop("id", None)
+            if event_id in self._own:
+                self._own.discard(event_id)
+                continue
+            self.entries += 1
+            events.append(event)
+        self._offset += end
+        return events
+
+    # ------------------ Escritura ------------------
+
+    def append(self, event):
+        """Agrega un evento (dict serializable en JSON)."""
+        if self.replaced():
+            # Escribir en el archivo viejo (ya desenlazado) perdería el evento
+            if self._header_id() != self.journal_id:
+                raise RuntimeError("Journal was compacted by another process; reload before appending")
+            self.sync()
+            self._file.close()
+            self._open_append()
+        event_id = uuid.uuid4().hex
+        self._file.write(json.dumps(dict(event, id=event_id)) + "\n")
+        self._file.flush()
+        # Se marca como propio: al releer la cola se salta en vez de aplicarlo dos veces
+        self._own.add(event_id)
+        self.entries += 1
+        self._pending += 1
+        if (self._pending >= self.sync_every
+                or time.monotonic() - self._last_sync >= self.sync_interval):
+            self.sync()
+
+    def sync(self):
+        if self._file is not None and self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._pending = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
@@ -1,22 +1,32 @@
 # api/main.py
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import FileResponse
+from fastapi import FastAPI, HTTPException, Query, Response
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Dict, Any
+from pydantic import BaseModel
+from typing import List, Optional
+import json
 import os
 import sys
+from collections import Counter
+
+import numpy as np
 
 # Carga los módulos del proyecto
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from tda.avl import AVL
+from tda.space_saving import SpaceSaving
+from tda.path_trie import PathTrie, SEPARATOR
 from tda.hash_map import Map
-from domain.client import Client
-from domain.order import Order
-from visual.report_generator import ReportGenerator
-
-import pickle
+from sim.contraction import ContractionHierarchy
+from sim.route_pool import RoutePool
+from api.state_store import StateStore
+from api.journal import Journal
+from api.columnar_snapshot import write_snapshot, ColumnarSnapshot
+from domain.order_table import OrderTable, ClientTable
+from sim.visit_stats import VisitStats
+from sim.visit_counter import VisitCounter
 
 app = FastAPI(title="Drone Logistics API")
 
@@ -32,82 +42,382 @@ app.add_middleware(
 # Usa archivos pickle para "persistir" el estado cuando cambia el dashboard.
 # Lo ideal sería tener un módulo de "estado compartido" real (singleton), pero así funciona simple para pruebas locales.
 STATE_FILE = "api_sim_state.pickle"
+HIERARCHY_FILE = "api_sim_state.ch.pickle"
+NETWORK_FILE = "api_sim_state.network.pickle"
+JOURNAL_FILE = "api_sim_state.journal"
+SNAPSHOT_DIR = "api_sim_state.columns"
 PDF_PATH = "reporte.pdf"
 
+def intern_routes(state):
+    """
+    Las rutas se identifican por un id entero del PathTrie (state["route_trie"]).
+    Un estado anterior, con las rutas como texto "a → b → c", se convierte aquí.
+    """
+    if "route_trie" in state:
+        return
+    trie = state["route_trie"] = PathTrie()
+    tracker = state.get("routes_avl")
+    if tracker is None or not len(tracker):
+        return
+    if isinstance(tracker, SpaceSaving):
+        data = tracker.to_dict()
+        data["counts"] = [[trie.intern(route.split(SEPARATOR)), count, error]
+                          for route, count, error in data["counts"]]
+        state["routes_avl"] = SpaceSaving.from_dict(data)
+    else:
+        ids = [(trie.intern(route.split(SEPARATOR)), freq) for route, freq in tracker.items()]
+        state["routes_avl"] = AVL.from_sorted(sorted(ids))
+
+def forget_untracked_routes(state):
+    """
+    En modo heavy hitters el trie guarda solo las rutas que sigue el
+    SpaceSaving; un estado anterior que guardaba también las desalojadas se
+    poda aquí.
+    """
+    tracker, trie = state.get("routes_avl"), state["route_trie"]
+    if isinstance(tracker, SpaceSaving):
+        for rid in trie.route_ids():
+            if rid not in tracker:
+                trie.remove(rid)
+
+def count_route(state, rid, count=1):
+    """
+    Suma count a la frecuencia de la ruta rid. Si el SpaceSaving desaloja
+    otra ruta para hacerle lugar, se borra también del trie: así el trie
+    queda acotado por la capacidad, como el resumen.
+    """
+    evicted = state["routes_avl"].insert(rid, count)
+    if evicted is not None:
+        state["route_trie"].remove(evicted)
+
+def count_visits_by_id(state):
+    """
+    node_visits es un VisitCounter sobre los ids de vértice del PathTrie.
+    Un estado anterior (Map {etiqueta: visitas}) se convierte aquí.
+    """
+    visits = state.get("node_visits")
+    if isinstance(visits, VisitCounter) or visits is None:
+        return
+    trie = state["route_trie"]
+    counter = state["node_visits"] = VisitCounter(trie)
+    items = list(visits.items())
+    counter.increment_many([trie.vertex_id(label) for label, _ in items],
+                           weights=[count for _, count in items])
+
+def path_ids(trie, rid):
+    # array('q') del trie -> int64 sin copiar
+    return np.frombuffer(trie.path(rid), dtype=np.int64)
+
+def route_ranking(state, k):
+    """[[ruta, frecuencia], ...] de las k rutas más frecuentes, con la ruta como texto."""
+    trie = state["route_trie"]
+    return [[trie.decode(rid), freq] for rid, freq in state["routes_avl"].top_k(k)]
+
+def routes_with_prefix(state, labels):
+    """
+    [(ruta, frecuencia), ...] de las rutas seguidas que empiezan con los nodos
+    labels, ordenadas por ruta: el trie da los ids (recorre solo ese subárbol)
+    y el AVL/SpaceSaving su frecuencia.
+    """
+    trie, tracker = state["route_trie"], state["routes_avl"]
+    return sorted((trie.decode(rid), tracker.get_freq(rid)) for rid in trie.with_prefix(labels)
+                  if tracker.get_freq(rid))
+
+def build_indexes(state):
+    """
+    Índices por id de órdenes y clientes, y rankings de visitas por rol; se
+    rehacen en cada carga. Órdenes y clientes son tablas por columnas que se
+    consultan directamente (un estado anterior con listas se convierte aquí).
+    """
+    intern_routes(state)
+    forget_untracked_routes(state)
+    count_visits_by_id(state)
+    orders, clients = state.get("orders", []), state.get("clients", [])
+    if not isinstance(orders, OrderTable):
+        orders = OrderTable.from_orders(orders)
+    if not isinstance(clients, ClientTable):
+        clients = ClientTable.from_clients(clients)
+    if "orders" in state:
+        state["orders"] = orders
+    if "clients" in state:
+        state["clients"] = clients
+    state["order_index"] = orders
+    state["client_index"] = clients
+    roles = {label: role for role, labels in state.get("role_index", {}).items() for label in labels}
+    roles = roles or state.get("node_roles", {})
+    if "node_visits" in state:
+        state["node_visits"].set_roles(roles)
+    state["visit_stats"] = VisitStats.from_visits(state.get("node_visits", {}), roles)
+
+def apply_event(state, event):
+    """
+    Aplica una mutación registrada en la bitácora:
+    - {"type": "order_status", "order_id", "status", "delivered_at"?}: solo
+      desde "pending"/"in_progress"; si no, ValueError (y no se registra).
+    - {"type": "route", "nodes"}: ruta calculada; se interna en el PathTrie,
+      suma la frecuencia de su id y una visita a cada nodo (también en los
+      rankings por rol). En modo heavy hitters, la ruta que el SpaceSaving
+      desaloja sale del trie (count_route).
+    - {"type": "routes", "paths"}: lote de rutas; las visitas se suman con un
+      solo increment_many y los rankings por rol se rehacen una vez.
+    """
+    kind = event["type"]
+    if kind == "order_status":
+        index = state["order_index"]
+        order = index.get(event["order_id"])
+        if order is None or order.status not in ("pending", "in_progress"):
+            raise ValueError(f"Order {event['order_id']} cannot change status")
+        changes = {"status": event["status"]}
+        if "delivered_at" in event:
+            changes["delivered_at"] = event["delivered_at"]
+        index.update(event["order_id"], **changes)
+    elif kind == "route":
+        trie = state["route_trie"]
+        rid = trie.intern(event["nodes"])
+        # Las visitas salen de la ruta internada (ids de vértice del trie)
+        state["node_visits"].increment_many(path_ids(trie, rid))
+        state["visit_stats"].record_path(trie.labels(rid))
+        count_route(state, rid)
+    elif kind == "routes":
+        trie = state["route_trie"]
+        # Cada ruta distinta se interna y se cuenta antes de internar la siguiente:
+        # contar una puede desalojar del SpaceSaving (y del trie) a otra del lote
+        ids = []
+        for path, count in Counter(tuple(path) for path in event["paths"]).items():
+            rid = trie.intern(path)
+            ids.append(np.repeat(path_ids(trie, rid), count))
+            count_route(state, rid, count)
+        if ids:
+            visits = state["node_visits"]
+            visits.increment_many(np.concatenate(ids))
+            state["visit_stats"].reload(visits)
+    else:
+        raise ValueError(f"Unknown event type: {kind}")
+
+# Claves que se guardan en la instantánea columnar (api/columnar_snapshot.py) y no en el pickle
+TABLE_KEYS = ("clients", "orders", "routes_avl", "node_visits", "node_roles", "route_trie")
+
+def write_tables(state):
+    return write_snapshot(state, SNAPSHOT_DIR)
+
+def read_tables(version):
+    # API y dashboard abren las columnas con np.memmap: las páginas se comparten
+    # por la caché del sistema, y órdenes/clientes se leen sin copiarlas
+    return ColumnarSnapshot(SNAPSHOT_DIR, version=version).tables()
+
+# El pickle (lo no tabular) se carga una vez por proceso y solo se relee si cambia
+# en disco; las mutaciones puntuales se agregan a la bitácora y se compactan cada
+# 1000 eventos
+store = StateStore(STATE_FILE, on_load=build_indexes,
+                   transient=("order_index", "client_index", "visit_stats"),
+                   journal=Journal(JOURNAL_FILE), apply_event=apply_event,
+                   table_keys=TABLE_KEYS, write_tables=write_tables, read_tables=read_tables)
+
 def save_state(state: dict):
-    with open(STATE_FILE, "wb") as f:
-        pickle.dump(state, f)
+    store.replace(state)
 
 def load_state() -> dict:
-    if not os.path.exists(STATE_FILE):
-        return {}
-    with open(STATE_FILE, "rb") as f:
-        return pickle.load(f)
+    with store.read() as state:
+        return state
+
+# Contraction Hierarchy precalculada por el dashboard; se carga al iniciar y
+# solo se vuelve a leer si el archivo cambia (nueva simulación).
+_hierarchy = {"mtime": None, "ch": None}
+
+def load_hierarchy():
+    if not os.path.exists(HIERARCHY_FILE):
+        return None
+    mtime = os.path.getmtime(HIERARCHY_FILE)
+    if _hierarchy["mtime"] != mtime:
+        _hierarchy["ch"] = ContractionHierarchy.load(HIERARCHY_FILE)
+        _hierarchy["mtime"] = mtime
+    return _hierarchy["ch"]
+
+# Procesos trabajadores para /routes/batch; cargan NETWORK_FILE una vez cada uno
+route_pool = RoutePool(NETWORK_FILE)
+
+@app.on_event("startup")
+def preload_hierarchy():
+    load_hierarchy()
+
+@app.on_event("shutdown")
+def stop_route_pool():
+    route_pool.shutdown()
+    store.close()
 
 def sim_ready(state):
     # Hay simulación si están los campos esenciales
     required = ["clients", "orders", "routes_avl", "node_visits", "node_roles"]
     return all(k in state for k in required)
 
+# ----------------- Paginación y streaming -----------------
+
+# Registros por lote al transmitir NDJSON: cada lote se lee con el lock de
+# lectura tomado y se suelta antes de escribir al socket.
+STREAM_BATCH = 500
+
+def paged_response(response, index, after, limit, stream, rows_of=None):
+    """
+    Registros de la tabla state[index] en orden, tras el cursor after (su id).
+    rows_of(tabla) da las filas que cumplen los filtros (None = todas).
+    Sin stream: lista JSON; si la página vino llena, X-Next-Cursor trae el id
+    con el que pedir la siguiente (after=...). Con stream: NDJSON por lotes,
+    memoria constante en el servidor aunque haya millones de registros.
+    Simulación y cursor se validan antes de responder en los dos modos.
+    """
+    with store.read() as state:
+        if not sim_ready(state):
+            raise HTTPException(status_code=400, detail="No simulation active.")
+        table = state[index]
+        try:
+            table.start_row(after)
+        except KeyError:
+            raise HTTPException(status_code=400, detail="Unknown cursor.")
+        if not stream:
+            page = table.page(after, limit, None if rows_of is None else rows_of(table))
+            if limit is not None and page and len(page) == limit:
+                response.headers["X-Next-Cursor"] = str(getattr(page[-1], table.KEY))
+            return [r.to_dict() for r in page]
+    return StreamingResponse(stream_rows(index, after, limit, rows_of), media_type="application/x-ndjson")
+
+def stream_rows(index, after, limit, rows_of=None):
+    """
+    Las filas que cumplen los filtros se calculan una vez por stream, y cada
+    lote es un corte de ellas: el costo total es lineal en lo enviado. Solo
+    si el estado se recarga (otra tabla) se recalculan, desde el último id enviado.
+    """
+    table = rows = None
+    pos = sent = 0
+    while limit is None or sent < limit:
+        size = STREAM_BATCH if limit is None else min(STREAM_BATCH, limit - sent)
+        with store.read() as state:
+            if not sim_ready(state):
+                return
+            if state[index] is not table:
+                table = state[index]
+                try:
+                    pos = table.start_row(after)
+                except KeyError:
+                    return  # el cursor desapareció (p. ej. nueva simulación)
+                rows = None if rows_of is None else rows_of(table)
+                if rows is not None:
+                    rows, pos = rows[np.searchsorted(rows, pos):], 0
+            if rows is None:
+                # Sin filtros se recorre la tabla por posición (incluye filas nuevas)
+                batch = range(pos, min(len(table), pos + size))
+            else:
+                batch = rows[pos:pos + size].tolist()
+            page = [table.ROW(table, row) for row in batch]
+            lines = "".join(json.dumps(r.to_dict()) + "\n" for r in page)
+        if not page:
+            return
+        yield lines
+        pos += len(page)
+        sent += len(page)
+        after = getattr(page[-1], table.KEY)
+        if len(page) < size:
+            return
+
 # ----------------- ENDPOINTS -----------------
 
 @app.get("/clients/", response_model=List[dict])
-def get_clients():
-    state = load_state()
-    if not sim_ready(state):
-        raise HTTPException(status_code=400, detail="No simulation active.")
-    return [c.to_dict() for c in state["clients"]]
+def get_clients(response: Response, limit: Optional[int] = Query(None, ge=1), after: Optional[str] = None,
+                stream: bool = False):
+    """Clientes en orden; limit/after paginan por client_id, stream=true responde NDJSON."""
+    return paged_response(response, "client_index", after, limit, stream)
 
 @app.get("/clients/{client_id}", response_model=dict)
 def get_client(client_id: str):
-    state = load_state()
-    if not sim_ready(state):
-        raise HTTPException(status_code=400, detail="No simulation active.")
-    client = next((c for c in state["clients"] if c.client_id == client_id), None)
-    if not client:
-        raise HTTPException(status_code=404, detail="Client not found.")
-    return client.to_dict()
+    with store.read() as state:
+        if not sim_ready(state):
+            raise HTTPException(status_code=400, detail="No simulation active.")
+        client = state["client_index"].get(client_id)
+        if not client:
+            raise HTTPException(status_code=404, detail="Client not found.")
+        return client.to_dict()
 
 @app.get("/orders/", response_model=List[dict])
-def get_orders():
-    state = load_state()
-    if not sim_ready(state):
-        raise HTTPException(status_code=400, detail="No simulation active.")
-    return [o.to_dict() for o in state["orders"]]
+def get_orders(response: Response, status: Optional[str] = None, client_id: Optional[str] = None,
+               priority: Optional[int] = None, created_from: Optional[str] = None,
+               created_to: Optional[str] = None, limit: Optional[int] = Query(None, ge=1),
+               after: Optional[str] = None, stream: bool = False):
+    """
+    Filtros opcionales (se combinan con AND); created_from/created_to en ISO 8601, inclusivos.
+    limit/after paginan por order_id; stream=true responde NDJSON.
+    """
+    def matching(orders):
+        return orders.matching_rows(status=status, client_id=client_id, priority=priority,
+                                    created_from=created_from, created_to=created_to)
+    return paged_response(response, "order_index", after, limit, stream, matching)
 
 @app.get("/orders/{order_id}", response_model=dict)
 def get_order(order_id: str):
-    state = load_state()
-    if not sim_ready(state):
-        raise HTTPException(status_code=400, detail="No simulation active.")
-    order = next((o for o in state["orders"] if o.order_id == order_id), None)
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found.")
-    return order.to_dict()
+    with store.read() as state:
+        if not sim_ready(state):
+            raise HTTPException(status_code=400, detail="No simulation active.")
+        order = state["order_index"].get(order_id)
+        if not order:
+            raise HTTPException(status_code=404, detail="Order not found.")
+        return order.to_dict()
 
 @app.post("/orders/{order_id}/cancel")
 def cancel_order(order_id: str):
-    state = load_state()
-    if not sim_ready(state):
+    if not sim_ready(load_state()):
         raise HTTPException(status_code=400, detail="No simulation active.")
-    for o in state["orders"]:
-        if o.order_id == order_id and o.status in ("pending", "in_progress"):
-            o.status = "cancelled"
-            save_state(state)
-            return {"status": "cancelled", "order_id": order_id}
-    raise HTTPException(status_code=400, detail="Order not cancelable or not found.")
+    try:
+        store.apply({"type": "order_status", "order_id": order_id, "status": "cancelled"})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Order not cancelable or not found.")
+    return {"status": "cancelled", "order_id": order_id}
 
 @app.post("/orders/{order_id}/complete")
 def complete_order(order_id: str):
-    state = load_state()
-    if not sim_ready(state):
+    if not sim_ready(load_state()):
         raise HTTPException(status_code=400, detail="No simulation active.")
-    for o in state["orders"]:
-        if o.order_id == order_id and o.status in ("pending", "in_progress"):
-            o.status = "completed"
-            save_state(state)
-            return {"status": "completed", "order_id": order_id}
-    raise HTTPException(status_code=400, detail="Order not completable or not found.")
+    try:
+        store.apply({"type": "order_status", "order_id": order_id, "status": "completed"})
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Order not completable or not found.")
+    return {"status": "completed", "order_id": order_id}
+
+class RouteRequest(BaseModel):
+    origin: str
+    destination: str
+    autonomy: Optional[float] = None
+
+@app.post("/routes/batch")
+def routes_batch(requests: List[RouteRequest], stream: bool = False):
+    """
+    Costea muchas rutas en paralelo. Con stream=true responde NDJSON a medida
+    que terminan; si no, un arreglo en el mismo orden de la entrada.
+    """
+    if not route_pool.ready():
+        raise HTTPException(status_code=400, detail="No simulation active.")
+    pairs = [(r.origin, r.destination, r.autonomy) for r in requests]
+    if stream:
+        lines = (json.dumps(result) + "\n" for result in route_pool.route_many(pairs))
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+    return sorted(route_pool.route_many(pairs), key=lambda result: result["index"])
+
+@app.get("/routes/shortest/{origin}/{destination}", response_model=dict)
+def get_unconstrained_route(origin: str, destination: str):
+    hierarchy = load_hierarchy()
+    if hierarchy is None:
+        raise HTTPException(status_code=400, detail="No simulation active.")
+    path, cost = hierarchy.shortest_path_labels(origin, destination)
+    if not path:
+        raise HTTPException(status_code=404, detail="Route not found.")
+    return {"origin": origin, "destination": destination, "path": path, "cost": cost}
+
+@app.get("/routes/{origin}/{destination}", response_model=dict)
+def get_route(origin: str, destination: str):
+    with store.read() as state:
+        if not sim_ready(state) or "route_table" not in state:
+            raise HTTPException(status_code=400, detail="No simulation active.")
+        path, cost = state["route_table"].lookup_labels(origin, destination)
+        if not path:
+            raise HTTPException(status_code=404, detail="Route not found.")
+        return {"origin": origin, "destination": destination, "path": [str(v) for v in path], "cost": cost}
 
 @app.get("/reports/pdf")
 def get_pdf_report():
@@ -115,76 +425,79 @@ def get_pdf_report():
         raise HTTPException(status_code=400, detail="No PDF available. Run simulation and generate report.")
     return FileResponse(PDF_PATH, media_type='application/pdf', filename="reporte.pdf")
 
-@app.get("/info/reports/visits/clients")
-def visits_clients():
-    state = load_state()
-    if not sim_ready(state):
-        raise HTTPException(status_code=400, detail="No simulation active.")
-    node_roles = state["node_roles"]
-    visits = state["node_visits"]
+def visits_by_role(state, role, k=None):
+    """[[etiqueta, visitas], ...] de los k nodos más visitados con ese rol (todos si k es None)."""
+    return [[label, count] for label, count in state["visit_stats"].top(role, k)]
 
-    result = []
-    for n in visits.keys():
-        n_str = str(n)
-        try:
-            if node_roles.get(n_str) == "client" and visits[n_str] is not None:
-                result.append([n_str, visits[n_str]])
-        except Exception:
-            continue  # Ignora cualquier KeyError u otro error puntual
-    return {"clients": sorted(result, key=lambda x: -x[1])}
+@app.get("/info/reports/visits/clients")
+def visits_clients(k: Optional[int] = Query(None, ge=1)):
+    with store.read() as state:
+        if not sim_ready(state):
+            raise HTTPException(status_code=400, detail="No simulation active.")
+        return {"clients": visits_by_role(state, "client", k)}
 
 @app.get("/info/reports/visits/recharges")
-def visits_recharges():
-    state = load_state()
-    if not sim_ready(state):
-        raise HTTPException(status_code=400, detail="No simulation active.")
-    node_roles = state["node_roles"]
-    visits = state["node_visits"]
-
-    result = []
-    for n in visits.keys():
-        n_str = str(n)
-        try:
-            if node_roles.get(n_str) == "recharge" and visits[n_str] is not None:
-                result.append([n_str, visits[n_str]])
-        except Exception:
-            continue
-    return {"recharges": sorted(result, key=lambda x: -x[1])}
+def visits_recharges(k: Optional[int] = Query(None, ge=1)):
+    with store.read() as state:
+        if not sim_ready(state):
+            raise HTTPException(status_code=400, detail="No simulation active.")
+        return {"recharges": visits_by_role(state, "recharge", k)}
 
 @app.get("/info/reports/visits/storages")
-def visits_storages():
-    state = load_state()
-    if not sim_ready(state):
-        raise HTTPException(status_code=400, detail="No simulation active.")
-    node_roles = state["node_roles"]
-    visits = state["node_visits"]
-
-    result = []
-    for n in visits.keys():
-        n_str = str(n)
-        try:
-            if node_roles.get(n_str) == "storage" and visits[n_str] is not None:
-                result.append([n_str, visits[n_str]])
-        except Exception:
-            continue
-    return {"storages": sorted(result, key=lambda x: -x[1])}
+def visits_storages(k: Optional[int] = Query(None, ge=1)):
+    with store.read() as state:
+        if not sim_ready(state):
+            raise HTTPException(status_code=400, detail="No simulation active.")
+        return {"storages": visits_by_role(state, "storage", k)}
 
 @app.get("/info/reports/summary")
-def summary():
-    state = load_state()
-    if not sim_ready(state):
-        raise HTTPException(status_code=400, detail="No simulation active.")
-    # Puedes personalizar los campos a exponer
-    return {
-        "n_nodes": state.get("n_nodes"),
-        "m_edges": state.get("m_edges"),
-        "n_orders": state.get("n_orders"),
-        "clients": len(state["clients"]),
-        "routes_registradas": len(state["routes_avl"].in_order())
-    }
+def summary(top: int = Query(10, ge=0)):
+    with store.read() as state:
+        if not sim_ready(state):
+            raise HTTPException(status_code=400, detail="No simulation active.")
+        routes = state["routes_avl"]
+        # Puedes personalizar los campos a exponer
+        result = {
+            "n_nodes": state.get("n_nodes"),
+            "m_edges": state.get("m_edges"),
+            "n_orders": state.get("n_orders"),
+            "clients": len(state["clients"]),
+            "orders_by_status": state["orders"].count_by("status"),
+            "routes_registradas": len(routes),
+            "top_routes": route_ranking(state, top),
+            "visits_by_role": state["node_visits"].role_sums(),
+        }
+        if isinstance(routes, SpaceSaving):
+            # Modo heavy hitters: rutas seguidas y cota del error de las frecuencias
+            result["routes_total"] = routes.total
+            result["routes_error_bound"] = routes.error_bound()
+        return result
 
 # ------------- Método para sincronizar el estado desde Streamlit (llámalo desde dashboard.py) -------------
 
+def record_route(labels):
+    """Registra una ruta calculada en el dashboard (un append en la bitácora)."""
+    store.apply({"type": "route", "nodes": [str(label) for label in labels]})
+
+def record_routes(paths):
+    """Registra un lote de rutas (listas de etiquetas) como un solo evento."""
+    store.apply({"type": "routes", "paths": [[str(label) for label in path] for path in paths]})
+
+def record_order_status(order_id, status, delivered_at=None):
+    event = {"type": "order_status", "order_id": order_id, "status": status}
+    if delivered_at is not None:
+        event["delivered_at"] = delivered_at
+    store.apply(event)
+
+def role_index(graph):
+    """{rol: [etiquetas]} desde los conjuntos por rol que mantiene el Graph."""
+    if graph is None:
+        return {}
+    index = {role: [str(v) for v in graph.vertices_with_role(role)]
+             for role in ("storage", "recharge", "client")}
+    # Un grafo sin roles asignados no aporta índice: la API usa node_roles
+    return index if any(index.values()) else {}
+
 def sync_state_from_streamlit():
     """Guarda el estado actual desde Streamlit para que lo lea la API."""
     import streamlit as st
@@ -194,10 +507,15 @@ def sync_state_from_streamlit():
         "routes_avl": st.session_state.get("routes_avl", AVL()),
         "node_visits": st.session_state.get("node_visits", Map()),
         "node_roles": {str(k): v for k, v in st.session_state.get("node_roles", {}).items()},
+        "role_index": role_index(st.session_state.get("graph")),
+        "route_table": st.session_state.get("route_table"),
         "n_nodes": st.session_state.get("n_nodes", 0),
         "m_edges": st.session_state.get("m_edges", 0),
         "n_orders": st.session_state.get("n_orders", 0),
     }
+    if "route_trie" in st.session_state:
+        # Sin trie (sesión anterior), intern_routes convierte las rutas en texto al cargar
+        state["route_trie"] = st.session_state["route_trie"]
     save_state(state)
 
 # ------------------ FIN ------------------
@@ -0,0 +1,253 @@
+# api/state_store.py
+
+import os
+import pickle
+import threading
+import uuid
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:     # Windows: solo se excluyen los hilos del proceso
+    fcntl = None
+
+class ReadWriteLock:
+    """Varios lectores a la vez o un solo escritor; los escritores en espera tienen prioridad."""
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self):
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+class ProcessLock:
+    """
+    Lock exclusivo entre procesos (fcntl.flock sobre un archivo aparte) y entre
+    los hilos de este proceso; reentrante. flock se asocia al descriptor
+    abierto, así que el lock de hilos es el que separa hilos del mismo proceso.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    @contextmanager
+    def hold(self):
+        with self._thread_lock:
+            if self._depth == 0:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                if fcntl is not None:
+                    fcntl.flock(self._fd, fcntl.LOCK_EX)
+            self._depth += 1
+            try:
+                yield
+            finally:
+                self._depth -= 1
+                if self._depth == 0:
+                    if fcntl is not None:
+                        fcntl.flock(self._fd, fcntl.LOCK_UN)
+                    os.close(self._fd)
+                    self._fd = None
+
+class StateStore:
+    """
+    Estado de la simulación en memoria para el proceso de la API.
+
+    El pickle se lee una sola vez y se vuelve a leer solo si el archivo cambió
+    (mtime o tamaño distintos, p. ej. porque el dashboard sincronizó) o si se
+    llama a reload(). Las lecturas se sirven desde memoria bajo un lock de
+    lectura; write() toma el lock exclusivo y guarda el archivo al salir.
+
+    on_load(state) se llama tras cada carga para agregar datos derivados
+    (p. ej. índices); las claves en transient no se guardan en el archivo.
+
+    Con journal (api/journal.py) y apply_event(state, event), apply() registra
+    una mutación como una línea agregada a la bitácora en vez de reescribir el
+    pickle. La bitácora se reproduce al cargar, se leen los eventos que agregue
+    otro proceso, y cada compact_every eventos se compacta: se guarda una
+    instantánea nueva y la bitácora vuelve a quedar vacía.
+
+    Con table_keys, write_tables y read_tables, las claves grandes (tablas)
+    no van en el pickle: write_tables(state) las guarda aparte y devuelve un
+    nombre de versión, que el pickle lleva en "tables_version"; al cargar,
+    read_tables(versión) devuelve esas claves. El pickle se reemplaza después
+    de escribir las tablas, así que siempre apunta a una versión completa.
+
+    Entre procesos (API y dashboard) todo lo que lee la bitácora, valida,
+    agrega o compacta se hace con un ProcessLock sobre path + ".lock": así
+    nadie agrega a una bitácora que otro acaba de reemplazar ni aplica un
+    evento validado contra un estado viejo. Se toma siempre antes que el
+    lock de lectura/escritura de los hilos.
+    """
+
+    def __init__(self, path, on_load=None, transient=(), journal=None, apply_event=None,
+                 compact_every=1000, table_keys=(), write_tables=None, read_tables=None):
+        self.path = path
+        self._on_load = on_load
+        self._transient = frozenset(transient)
+        self._journal = journal
+        self._apply_event = apply_event
+        self._compact_every = compact_every
+        self._table_keys = frozenset(table_keys)
+        self._write_tables = write_tables
+        self._read_tables = read_tables
+        self._state = {}
+        self._signature = None
+        self._lock = ReadWriteLock()
+        self._process_lock = ProcessLock(f"{path}.lock")
+
+    def _file_signature(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _load(self, signature):
+        if signature is None:
+            self._state = {}
+        else:
+            with open(self.path, "rb") as f:
+                self._state = pickle.load(f)
+            version = self._state.get("tables_version")
+            if version is not None and self._read_tables is not None:
+                self._state.update(self._read_tables(version))
+        if self._on_load is not None:
+            self._on_load(self._state)
+        self._signature = signature
+        if self._journal is not None and signature is not None:
+            journal_id = self._state.get("journal_id")
+            if journal_id is None:
+                # Instantánea anterior a la bitácora: se le asigna una
+                self._save()
+            else:
+                for event in self._journal.open(journal_id):
+                    self._apply_event(self._state, event)
+
+    def _save(self):
+        if self._journal is not None:
+            # Compactación: la instantánea nueva lleva otro id, así que la
+            # bitácora vieja deja de aplicarse aunque se caiga antes de vaciarla
+            self._state["journal_id"] = uuid.uuid4().hex
+        skip = self._transient
+        if self._write_tables is not None and any(k in self._state for k in self._table_keys):
+            self._state["tables_version"] = self._write_tables(self._state)
+            skip = skip | self._table_keys
+        # Escritura atómica: los lectores de otros procesos nunca ven un pickle a medias
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({k: v for k, v in self._state.items() if k not in skip}, f)
+        os.replace(tmp, self.path)
+        self._signature = self._file_signature()
+        if self._journal is not None:
+            self._journal.reset(self._state["journal_id"])
+
+    def _stale(self, signature):
+        if signature != self._signature:
+            return "load"
+        if self._journal is not None and self._signature is not None:
+            if self._journal.replaced():
+                # Otro proceso reemplazó la bitácora: se relee todo
+                return "load"
+            if self._journal.has_unread():
+                return "tail"
+        return None
+
+    def _refresh(self):
+        if self._stale(self._file_signature()) is None:
+            return
+        with self._process_lock.hold(), self._lock.write():
+            # Otro hilo pudo ponerse al día mientras se esperaba el lock
+            signature = self._file_signature()
+            stale = self._stale(signature)
+            if stale == "load":
+                self._load(signature)
+            elif stale == "tail":
+                for event in self._journal.read_new():
+                    self._apply_event(self._state, event)
+
+    def reload(self):
+        """Fuerza una relectura del archivo."""
+        with self._process_lock.hold(), self._lock.write():
+            self._load(self._file_signature())
+
+    @contextmanager
+    def read(self):
+        """with store.read() as state: ... (no modificar state aquí)."""
+        self._refresh()
+        with self._lock.read():
+            yield self._state
+
+    @contextmanager
+    def write(self):
+        """
+        with store.write() as state: ... modifica state y se guarda al salir.
+        Si el bloque lanza una excepción no se guarda (conviene validar antes de modificar).
+        """
+        with self._process_lock.hold():
+            self._refresh()
+            with self._lock.write():
+                yield self._state
+                self._save()
+
+    def apply(self, event):
+        """
+        Aplica un evento al estado en memoria y lo agrega a la bitácora (un
+        append pequeño en vez de reescribir todo). Sin bitácora, guarda el pickle.
+        """
+        # Ponerse al día, validar, agregar y compactar sin que otro proceso se intercale
+        with self._process_lock.hold():
+            self._refresh()
+            with self._lock.write():
+                self._apply_event(self._state, event)
+                if self._journal is None or self._signature is None:
+                    self._save()
+                    return
+                self._journal.append(event)
+                if self._journal.entries >= self._compact_every:
+                    self._save()
+
+    def replace(self, state):
+        """Reemplaza el estado completo y lo guarda."""
+        with self._process_lock.hold(), self._lock.write():
+            self._state = state
+            if self._on_load is not None:
+                self._on_load(self._state)
+            self._save()
+
+    def close(self):
+        """Fuerza el fsync pendiente de la bitácora."""
+        if self._journal is not None:
+            with self._lock.write():
+                self._journal.close()
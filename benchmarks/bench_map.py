@@ -0,0 +1,127 @@
+# benchmarks/bench_map.py
+#
+# Compara tda.hash_map.Map (direccionamiento abierto) con dict y con la
+# implementación anterior por listas de buckets (copiada abajo como ChainedMap).
+# Uso: python benchmarks/bench_map.py --sizes 10000 100000 1000000
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tda.hash_map import Map
+
+class ChainedMap:
+    """La Map anterior (encadenamiento con listas de tuplas), solo lo que se mide."""
+
+    def __init__(self, capacity=8):
+        self._capacity = capacity
+        self._table = [[] for _ in range(self._capacity)]
+        self._n = 0
+
+    def _hash(self, key):
+        return hash(key) % self._capacity
+
+    def __setitem__(self, key, value):
+        bucket = self._table[self._hash(key)]
+        for i, (k, v) in enumerate(bucket):
+            if k == key:
+                bucket[i] = (key, value)
+                return
+        bucket.append((key, value))
+        self._n += 1
+        if self._n > self._capacity * 0.7:
+            self._resize(2 * self._capacity)
+
+    def __getitem__(self, key):
+        for k, v in self._table[self._hash(key)]:
+            if k == key:
+                return v
+        raise KeyError(f"Key {key} not found")
+
+    def __delitem__(self, key):
+        bucket = self._table[self._hash(key)]
+        for i, (k, v) in enumerate(bucket):
+            if k == key:
+                del bucket[i]
+                self._n -= 1
+                if self._capacity > 8 and self._n < self._capacity * 0.2:
+                    self._resize(self._capacity // 2)
+                return
+        raise KeyError(f"Key {key} not found")
+
+    def _resize(self, new_capacity):
+        old_table = self._table
+        self._capacity = new_capacity
+        self._table = [[] for _ in range(new_capacity)]
+        self._n = 0
+        for bucket in old_table:
+            for key, value in bucket:
+                self[key] = value
+
+    def __contains__(self, key):
+        try:
+            _ = self[key]
+            return True
+        except KeyError:
+            return False
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def run(factory, keys, misses):
+    m = factory()
+    results = {}
+
+    def insert():
+        for i, key in enumerate(keys):
+            m[key] = i
+
+    def hit():
+        for key in keys:
+            m.get(key)
+
+    def miss():
+        for key in misses:
+            key in m
+
+    def delete():
+        for key in keys[::2]:
+            del m[key]
+
+    # El orden importa: delete deja la tabla con la mitad de las claves
+    for name, fn in (("insert", insert), ("get", hit), ("miss", miss), ("delete", delete)):
+        results[name] = timed(fn)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Map vs dict vs Map anterior")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    print(f"{'claves':>9} {'impl':>8} {'insert':>9} {'get':>9} {'miss':>9} {'delete':>9}")
+    for n in args.sizes:
+        # Claves como las del simulador: etiquetas de nodo en texto
+        keys = [str(rnd.randrange(10 * n)) for _ in range(n)]
+        keys = list(dict.fromkeys(keys))
+        misses = [f"x{i}" for i in range(len(keys))]
+        for name, factory in (("dict", dict), ("Map", Map), ("anterior", ChainedMap)):
+            r = run(factory, keys, misses)
+            print(f"{len(keys):>9} {name:>8} {r['insert']:>8.3f}s {r['get']:>8.3f}s "
+                  f"{r['miss']:>8.3f}s {r['delete']:>8.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# benchmarks/bench_mst.py
+#
+# Compara kruskal_mst con boruvka_mst sobre redes generadas al azar.
+# Uso: python benchmarks/bench_mst.py --sizes 1000 100000 1000000 --density 4
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from model.compact_graph import CompactGraph
+from sim.kruskal import kruskal_mst
+from sim.boruvka import boruvka_mst, boruvka_mst_arrays
+
+def random_network(n, density, seed):
+    """Árbol aleatorio (garantiza conexidad) más aristas extra al azar."""
+    rng = np.random.default_rng(seed)
+    tree_targets = np.arange(1, n)
+    tree_sources = (rng.random(n - 1) * tree_targets).astype(np.int64)
+    extra = max(0, density * n - (n - 1))
+    extra_sources = rng.integers(0, n, extra)
+    extra_targets = rng.integers(0, n, extra)
+    keep = extra_sources != extra_targets
+    sources = np.concatenate([tree_sources, extra_sources[keep]])
+    targets = np.concatenate([tree_targets, extra_targets[keep]])
+    weights = rng.integers(1, 100, len(sources)).astype(np.float64)
+    return CompactGraph.from_edges(sources, targets, weights, n_vertices=n)
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Kruskal vs Borůvka")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--density", type=int, default=4, help="aristas por nodo")
+    parser.add_argument("--workers", type=int, default=None, help="procesos para Borůvka")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # "arrays" = boruvka_mst_arrays, sin crear un Edge por arista del MST
+    print(f"{'nodos':>10} {'aristas':>10} {'kruskal (s)':>12} {'boruvka (s)':>12} "
+          f"{'arrays (s)':>11} {'speedup':>8}")
+    for n in args.sizes:
+        graph = random_network(n, args.density, args.seed)
+        mst_k, t_k = timed(kruskal_mst, graph)
+        mst_b, t_b = timed(boruvka_mst, graph, workers=args.workers)
+        (_, _, weights_a), t_a = timed(boruvka_mst_arrays, graph, workers=args.workers)
+        weight_k = sum(e.element() for e in mst_k)
+        weight_b = sum(e.element() for e in mst_b)
+        assert len(mst_k) == len(mst_b) == len(weights_a), "los MST no coinciden"
+        assert weight_k == weight_b == weights_a.sum(), "los MST no coinciden"
+        print(f"{n:>10} {graph.edge_count():>10} {t_k:>12.3f} {t_b:>12.3f} "
+              f"{t_a:>11.3f} {t_k / t_a:>8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# benchmarks/bench_orders.py
+#
+# Órdenes como lista de Order (+ dict por id) contra OrderTable (columnas NumPy):
+# memoria (tracemalloc) y tiempo de un filtro combinado y de un conteo por estado.
+# Uso: python benchmarks/bench_orders.py --orders 100000 1000000
+
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from domain.order import Order
+from domain.order_table import OrderTable
+
+def synthetic_orders(n, n_clients=1000, n_nodes=500, seed=0):
+    rnd = random.Random(seed)
+    start = datetime.datetime(2025, 1, 1)
+    for i in range(n):
+        c = rnd.randrange(n_clients)
+        yield Order(
+            order_id=f"O{i:07d}", client=f"Client{c}", client_id=f"C{c:05d}",
+            origin=str(rnd.randrange(n_nodes)), destination=str(c % n_nodes),
+            status=rnd.choice(("pending", "completed", "cancelled")), priority=rnd.randint(0, 1),
+            created_at=(start + datetime.timedelta(seconds=i)).isoformat(),
+            route_cost=rnd.randint(1, 100),
+        )
+
+def as_objects(orders):
+    # Lo que había antes del OrderTable: la lista de Order y un dict por id
+    orders = list(orders)
+    return orders, {o.order_id: o for o in orders}
+
+def measured(build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size, elapsed
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Lista de Order vs OrderTable")
+    parser.add_argument("--orders", type=int, nargs="+", default=[100_000])
+    args = parser.parse_args()
+
+    print(f"{'órdenes':>9} {'impl':>11} {'MB':>8} {'armado':>8} {'filtro':>8} {'por estado':>10}")
+    for n in args.orders:
+        # Lo que ocupan las órdenes como objetos más su dict por id, y lo que ocupa la tabla sola
+        (orders, by_id), size, build = measured(lambda: as_objects(synthetic_orders(n)))
+        query = timed(lambda: [o for o in orders if o.status == "pending" and o.priority == 1
+                               and o.created_at >= "2025-01-01T06:00:00"])
+        group = timed(lambda: Counter(o.status for o in orders))
+        print(f"{n:>9} {'objetos':>11} {size / 2**20:>8.1f} {build:>7.2f}s {query:>7.3f}s {group:>9.4f}s")
+        del orders, by_id
+
+        table, size, build = measured(lambda: OrderTable.from_orders(synthetic_orders(n)))
+        query = timed(lambda: table.query(status="pending", priority=1, created_from="2025-01-01T06:00:00"))
+        group = timed(lambda: table.count_by("status"))
+        print(f"{n:>9} {'OrderTable':>11} {size / 2**20:>8.1f} {build:>7.2f}s {query:>7.3f}s {group:>9.4f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# benchmarks/bench_snapshot.py
+#
+# Tiempo de carga del estado: pickle de objetos vs instantánea columnar con memmap.
+# Uso: python benchmarks/bench_snapshot.py --orders 100000 1000000
+
+import argparse
+import datetime
+import os
+import pickle
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tda.avl import AVL
+from tda.path_trie import PathTrie
+from tda.hash_map import Map
+from domain.client import Client
+from domain.order import Order
+from api.columnar_snapshot import write_snapshot, ColumnarSnapshot
+
+def synthetic_state(n_orders, n_clients=1000, n_nodes=500, seed=0):
+    rnd = random.Random(seed)
+    clients = [Client(f"C{i:05d}", f"Client{i}", "premium" if i % 2 == 0 else "normal", 0, str(i % n_nodes))
+               for i in range(n_clients)]
+    start = datetime.datetime(2025, 1, 1)
+    orders = []
+    for i in range(n_orders):
+        client = rnd.choice(clients)
+        client.total_orders += 1
+        orders.append(Order(
+            order_id=f"O{i:07d}", client=client.name, client_id=client.client_id,
+            origin=str(rnd.randrange(n_nodes)), destination=client.node,
+            status=rnd.choice(("pending", "completed", "cancelled")), priority=rnd.randint(0, 1),
+            created_at=(start + datetime.timedelta(seconds=i)).isoformat(),
+            route_cost=rnd.randint(1, 100),
+        ))
+    visits = Map()
+    for n in range(n_nodes):
+        visits[str(n)] = rnd.randint(0, 1000)
+    routes, trie = AVL(), PathTrie()
+    for _ in range(min(n_orders, 5000)):
+        routes.insert(trie.intern([str(rnd.randrange(n_nodes)) for _ in range(4)]))
+    roles = {str(n): rnd.choice(("storage", "recharge", "client")) for n in range(n_nodes)}
+    return {"clients": clients, "orders": orders, "routes_avl": routes, "route_trie": trie,
+            "node_visits": visits, "node_roles": roles, "n_nodes": n_nodes, "m_edges": 0, "n_orders": n_orders}
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def load_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+def dir_size(path):
+    # Incluye las versiones (subdirectorios) de la instantánea
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+def main():
+    parser = argparse.ArgumentParser(description="pickle vs instantánea columnar")
+    parser.add_argument("--orders", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        print(f"{'órdenes':>10} {'pickle MB':>10} {'cols MB':>8} {'pickle load':>12} "
+              f"{'memmap open':>12} {'filtro status':>14} {'a objetos':>10}")
+        for n in args.orders:
+            state = synthetic_state(n)
+            pickle_path = os.path.join(workdir, "state.pickle")
+            snapshot_dir = os.path.join(workdir, "state.columns")
+            with open(pickle_path, "wb") as f:
+                pickle.dump(state, f)
+            write_snapshot(state, snapshot_dir)
+            del state
+
+            _, t_pickle = timed(load_pickle, pickle_path)
+            snapshot, t_open = timed(ColumnarSnapshot, snapshot_dir)
+            # Consulta típica sin crear objetos: cuántas órdenes pendientes hay
+            start = time.perf_counter()
+            pending = int((snapshot.column("orders", "status") == snapshot.code_of("orders", "status", "pending")).sum())
+            t_filter = time.perf_counter() - start
+            _, t_objects = timed(ColumnarSnapshot(snapshot_dir).to_state)
+            print(f"{n:>10} {os.path.getsize(pickle_path) / 1e6:>10.1f} {dir_size(snapshot_dir) / 1e6:>8.1f} "
+                  f"{t_pickle:>11.3f}s {t_open:>11.4f}s {t_filter:>13.4f}s {t_objects:>9.3f}s")
+            assert pending > 0
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_visits.py
+#
+# Conteo de visitas de un lote de rutas: Map {etiqueta: visitas} sumando nodo
+# por nodo (lo que hacía apply_event) contra VisitCounter.increment_many sobre
+# los ids ya internados en el PathTrie.
+# Uso: python benchmarks/bench_visits.py --routes 10000 100000 --nodes 1000
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tda.hash_map import Map
+from tda.path_trie import PathTrie
+from sim.visit_counter import VisitCounter
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Visitas por nodo: Map vs VisitCounter")
+    parser.add_argument("--routes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--nodes", type=int, default=1000)
+    parser.add_argument("--length", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    print(f"{'rutas':>8} {'Map':>9} {'Counter':>9} {'top10 Map':>10} {'top10 VC':>9}")
+    for n in args.routes:
+        paths = [[str(rnd.randrange(args.nodes)) for _ in range(args.length)] for _ in range(n)]
+        trie = PathTrie()
+        rids = [trie.intern(path) for path in paths]
+
+        visits = Map()
+
+        def count_map():
+            for rid in rids:
+                for label in trie.labels(rid):
+                    visits[label] = visits.get(label, 0) + 1
+
+        counter = VisitCounter(trie)
+
+        def count_vector():
+            ids = np.concatenate([np.frombuffer(trie.path(rid), dtype=np.int64) for rid in rids])
+            counter.increment_many(ids)
+
+        t_map, t_vec = timed(count_map), timed(count_vector)
+        t_top_map = timed(lambda: sorted(visits.items(), key=lambda kv: -kv[1])[:10])
+        t_top_vec = timed(lambda: counter.top_k(10))
+        print(f"{n:>8} {t_map:>8.3f}s {t_vec:>8.3f}s {t_top_map:>9.4f}s {t_top_vec:>8.4f}s")
+
+if __name__ == "__main__":
+    main()
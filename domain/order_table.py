@@ -0,0 +1,583 @@
+# domain/order_table.py
+
+import numpy as np
+
+from domain.order import Order
+from domain.client import Client
+
+NAT = np.iinfo(np.int64).min    # int64 de np.datetime64("NaT"): timestamp ausente
+
+def timestamps_to_int(values):
+    """Textos ISO 8601 (o None) -> microsegundos desde epoch en int64 (NAT si falta)."""
+    return np.array([v if v is not None else "NaT" for v in values], dtype="datetime64[us]").astype(np.int64)
+
+def int_to_timestamps(column):
+    out = []
+    for value, text in zip(column.tolist(), np.datetime_as_string(column.astype("datetime64[us]"), unit="us")):
+        # datetime.isoformat() omite los microsegundos cuando son 0
+        out.append(None if value == NAT else (text[:-7] if text.endswith(".000000") else text))
+    return out
+
+def time_bounds(start=None, end=None):
+    """
+    (desde, hasta) en microsegundos para filtrar un rango inclusivo de textos
+    ISO 8601. end cubre toda su precisión: "2025-07-04" incluye todo ese día.
+    """
+    lo = None if start is None else int(np.datetime64(start, "us").astype(np.int64))
+    hi = None
+    if end is not None:
+        end = np.datetime64(end)
+        hi = int((end + 1).astype("datetime64[us]").astype(np.int64)) - 1
+    return lo, hi
+
+def _in_range(created, start=None, end=None):
+    """Máscara de los timestamps (int64) dentro del rango inclusivo start..end (ver time_bounds)."""
+    lo, hi = time_bounds(start, end)
+    mask = np.ones(len(created), dtype=bool)
+    if lo is not None:
+        mask &= created >= lo     # NAT es el mínimo de int64: nunca pasa
+    if hi is not None:
+        mask &= (created <= hi) & (created != NAT)
+    return mask
+
+def _number(value):
+    return int(value) if float(value).is_integer() else value
+
+def _int_dtype(lo, hi):
+    """El entero con signo más chico que guarda lo..hi."""
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return np.int64
+
+def _as_bytes(column):
+    # Tablas guardadas antes de usar bytes tenían los textos como str ("U")
+    return np.char.encode(column, "utf-8") if column.dtype.kind == "U" else column
+
+class _Vocab:
+    """Valores distintos de una columna de texto; el código es el orden de aparición."""
+
+    def __init__(self, values=()):
+        self.values = [str(v) for v in values]
+        self._codes = {v: i for i, v in enumerate(self.values)}
+
+    def code(self, value):
+        """Código de value, agregándolo si es nuevo (None = -1)."""
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def find(self, value):
+        # -2 no coincide con ninguna fila (los códigos son >= -1)
+        return -1 if value is None else self._codes.get(value, -2)
+
+    def decode(self, code):
+        return None if code < 0 else self.values[code]
+
+class ColumnTable:
+    """
+    Registros guardados por columnas (struct of arrays) en arreglos NumPy, en
+    orden de inserción. Cada fila se lee como un objeto vista (ROW) con los
+    mismos atributos que el objeto de dominio; asignar un atributo escribe en
+    la columna.
+
+    Tipos de columna (COLUMNS):
+    - "str": texto en UTF-8 como bytes de ancho fijo ("S"; se ensancha si llega uno más largo)
+    - "code": texto repetitivo como códigos + vocabulario (None = -1)
+    - "int": entero (None = 0)
+    - "time": texto ISO 8601 como microsegundos int64 (None = NAT)
+    - "float": float64 (None = NaN)
+    - "object": objetos Python (p. ej. vértices del grafo)
+    Códigos y enteros usan el entero más chico que alcanza (int8 de entrada)
+    y se ensanchan cuando llega un valor que no cabe.
+
+    El id (KEY) se busca con np.searchsorted sobre una permutación ordenada
+    que se arma al primer get(); las filas agregadas después van a un dict
+    chico hasta que conviene reordenar. No hay un dict por fila.
+
+    Las columnas de INDEXED tienen un índice secundario {valor: filas
+    crecientes} (rows_where), armado con un solo argsort al primer uso. Las
+    filas agregadas o modificadas después se revisan aparte hasta que
+    conviene rearmarlo, igual que el dict de ids recientes.
+    """
+
+    KEY = None
+    COLUMNS = {}
+    INDEXED = ()
+    ROW = None
+
+    def __init__(self):
+        self._n = 0
+        self._vocab = {name: _Vocab() for name, kind in self.COLUMNS.items() if kind == "code"}
+        self._cols = {name: self._empty(kind, 0) for name, kind in self.COLUMNS.items()}
+        self._reset_lookup()
+        self._index = {}
+
+    @staticmethod
+    def _empty(kind, n):
+        dtype = {"str": "S1", "code": np.int8, "int": np.int8, "time": np.int64,
+                 "float": np.float64, "object": object}[kind]
+        return np.zeros(n, dtype=dtype)
+
+    @classmethod
+    def from_records(cls, records):
+        """Tabla con los atributos de cada objeto (Order, Client o una vista), convertidos en bloque."""
+        records = list(records)
+        table = cls()
+        for name, kind in cls.COLUMNS.items():
+            values = [getattr(r, name) for r in records]
+            if kind == "str":
+                column = np.array([b"" if v is None else str(v).encode("utf-8") for v in values], dtype=bytes)
+            elif kind == "code":
+                codes = [table._vocab[name].code(v) for v in values]
+                column = np.array(codes, dtype=_int_dtype(-1, len(table._vocab[name].values) - 1))
+            elif kind == "int":
+                column = np.array([v or 0 for v in values], dtype=np.int64)
+                if len(column):
+                    column = column.astype(_int_dtype(column.min(), column.max()))
+            elif kind == "time":
+                column = timestamps_to_int(values)
+            elif kind == "float":
+                column = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            else:
+                column = np.empty(len(values), dtype=object)
+                column[:] = values
+            table._cols[name] = column
+        table._n = len(records)
+        return table
+
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        Envuelve columnas con el formato de to_columns() (p. ej. las de una
+        ColumnarSnapshot abierta con memmap) sin copiarlas; se copian recién
+        si la tabla se modifica.
+        """
+        table = cls.__new__(cls)
+        table._cols, table._vocab = {}, {}
+        for name, kind in cls.COLUMNS.items():
+            column = columns[name]
+            if kind == "str":
+                column = _as_bytes(column)
+            elif kind == "code":
+                table._vocab[name] = _Vocab(columns[f"{name}.vocab"].tolist())
+            elif kind == "object":
+                # En disco van como etiqueta (str, "" = sin valor)
+                labels = column.tolist()
+                column = np.empty(len(labels), dtype=object)
+                column[:] = [label or None for label in labels]
+            table._cols[name] = column
+        table._n = len(table._cols[cls.KEY])
+        table._reset_lookup()
+        table._index = {}
+        return table
+
+    def to_columns(self):
+        """{nombre: arreglo} con códigos + "nombre.vocab" por columna internada; los objetos van como str."""
+        columns = {}
+        for name, kind in self.COLUMNS.items():
+            column = self._cols[name][:self._n]
+            if kind == "code":
+                columns[f"{name}.vocab"] = np.array(self._vocab[name].values, dtype=str)
+            elif kind == "object":
+                column = np.array(["" if v is None else str(v) for v in column.tolist()], dtype=str)
+            columns[name] = column
+        return columns
+
+    # ------------------ Filas ------------------
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        return (self.ROW(self, i) for i in range(self._n))
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.ROW(self, j) for j in range(*i.indices(self._n))]
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError("row index out of range")
+        return self.ROW(self, i)
+
+    def all(self):
+        return list(self)
+
+    def value(self, row, name):
+        kind = self.COLUMNS[name]
+        value = self._cols[name][row]
+        if kind == "code":
+            return self._vocab[name].decode(value)
+        if kind == "str":
+            return value.decode("utf-8")
+        if kind == "int":
+            return int(value)
+        if kind == "time":
+            return None if value == NAT else int_to_timestamps(np.array([value], dtype=np.int64))[0]
+        if kind == "float":
+            return None if value != value else _number(value)
+        return value
+
+    def set_value(self, row, name, value):
+        if name == self.KEY and str(value) != self.value(row, name):
+            self._reset_lookup()
+        self._store(row, name, value)
+
+    def _store(self, row, name, value):
+        kind = self.COLUMNS[name]
+        self._writable(name)
+        if kind == "code":
+            value = self._vocab[name].code(value)
+            self._fit(name, value)
+        elif kind == "str":
+            value = b"" if value is None else str(value).encode("utf-8")
+            self._widen(name, len(value))
+        elif kind == "int":
+            value = value or 0
+            self._fit(name, value)
+        elif kind == "time":
+            value = NAT if value is None else int(np.datetime64(value, "us").astype(np.int64))
+        elif kind == "float":
+            value = np.nan if value is None else value
+        self._cols[name][row] = value
+        entry = self._index.get(name)
+        if entry is not None and row < entry[0]:
+            entry[2].add(row)
+
+    def append(self, record):
+        """
+        Agrega una fila con los atributos de record y devuelve su vista. Si el
+        id ya existe, se sobrescribe esa fila (conserva su posición).
+        """
+        key = getattr(record, self.KEY)
+        row = self.row_of(key)
+        if row < 0:
+            self._writable()
+            if self._n == len(self._cols[self.KEY]):
+                self._grow(max(8, 2 * self._n))
+            row = self._n
+            self._n += 1
+            if self._sorted is not None:
+                self._recent[str(key)] = row
+                if len(self._recent) > max(1024, self._n // 8):
+                    self._reset_lookup()
+        for name in self.COLUMNS:
+            self._store(row, name, getattr(record, name))
+        return self.ROW(self, row)
+
+    def _grow(self, capacity):
+        for name, column in self._cols.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self._n] = column[:self._n]
+            self._cols[name] = grown
+
+    def _widen(self, name, length):
+        column = self._cols[name]
+        if length > column.dtype.itemsize:
+            self._cols[name] = column.astype(f"S{length}")
+            if name == self.KEY:
+                self._reset_lookup()
+
+    def _fit(self, name, value):
+        column = self._cols[name]
+        info = np.iinfo(column.dtype)
+        if not info.min <= value <= info.max:
+            self._cols[name] = column.astype(_int_dtype(min(value, info.min), max(value, info.max)))
+
+    def _writable(self, *names):
+        # Las columnas de una instantánea con memmap son de solo lectura: se copia
+        # una vez cada columna que se modifica (sin nombres, todas)
+        for name in names or self._cols:
+            column = self._cols[name]
+            if not column.flags.writeable:
+                self._cols[name] = np.array(column)
+
+    # ------------------ Búsqueda por id ------------------
+
+    def _reset_lookup(self):
+        self._sorted = None     # permutación que ordena KEY (o "identity" si ya está ordenada)
+        self._sorted_n = 0      # filas que cubre _sorted
+        self._recent = {}       # id -> fila, agregadas después de armar _sorted
+
+    def _build_lookup(self):
+        keys = self._cols[self.KEY][:self._n]
+        if not len(keys) or bool(np.all(keys[1:] >= keys[:-1])):
+            self._sorted = "identity"
+        else:
+            self._sorted = np.argsort(keys, kind="stable")
+        self._sorted_n = self._n
+        self._recent = {}
+
+    def row_of(self, key):
+        """Fila del id dado, o -1."""
+        key = str(key)
+        row = self._recent.get(key)
+        if row is not None:
+            return row
+        if self._sorted is None:
+            self._build_lookup()
+        keys = self._cols[self.KEY][:self._sorted_n]
+        sorter = None if isinstance(self._sorted, str) else self._sorted
+        key = key.encode("utf-8")
+        i = int(np.searchsorted(keys, key, sorter=sorter))
+        if i < len(keys):
+            row = i if sorter is None else int(sorter[i])
+            if keys[row] == key:
+                return row
+        return -1
+
+    def get(self, key):
+        row = self.row_of(key)
+        return None if row < 0 else self.ROW(self, row)
+
+    def __contains__(self, key):
+        return self.row_of(key) >= 0
+
+    def update(self, key, **changes):
+        """Modifica campos de la fila del id dado y devuelve su vista (KeyError si no existe)."""
+        row = self.row_of(key)
+        if row < 0:
+            raise KeyError(f"Key {key} not found")
+        for name, value in changes.items():
+            self.set_value(row, name, value)
+        return self.ROW(self, row)
+
+    # ------------------ Consultas vectorizadas ------------------
+
+    def column(self, name):
+        """Columna como vista de solo lectura (códigos si es internada)."""
+        view = self._cols[name][:self._n]
+        view.flags.writeable = False
+        return view
+
+    def vocab(self, name):
+        return self._vocab[name].values
+
+    def equals(self, name, value):
+        """Máscara booleana de las filas con name == value."""
+        if self.COLUMNS[name] == "code":
+            return self.column(name) == self._vocab[name].find(value)
+        if self.COLUMNS[name] == "str":
+            value = str(value).encode("utf-8")
+        return self.column(name) == value
+
+    def mask(self, **filters):
+        """Filas que cumplen todos los filtros {columna: valor} (los None se ignoran)."""
+        mask = np.ones(self._n, dtype=bool)
+        for name, value in filters.items():
+            if value is not None:
+                mask &= self.equals(name, value)
+        return mask
+
+    # ------------------ Índices secundarios ------------------
+
+    def _build_index(self, name):
+        # [filas cubiertas, {valor: filas crecientes}, filas cubiertas modificadas después]
+        column = self._cols[name][:self._n]
+        order = np.argsort(column, kind="stable")
+        values, starts = np.unique(column[order], return_index=True)
+        self._index[name] = [self._n, dict(zip(values.tolist(), np.split(order, starts[1:]))), set()]
+
+    def rows_where(self, name, value):
+        """Filas (crecientes) con name == value, desde el índice de la columna (INDEXED)."""
+        if self.COLUMNS[name] == "code":
+            value = self._vocab[name].find(value)
+        entry = self._index.get(name)
+        if entry is None or len(entry[2]) + self._n - entry[0] > max(1024, self._n // 8):
+            self._build_index(name)
+            entry = self._index[name]
+        covered, groups, changed = entry
+        column = self._cols[name]
+        rows = groups.get(value, np.empty(0, dtype=np.intp))
+        if changed:
+            changed = np.fromiter(changed, dtype=np.intp, count=len(changed))
+            rows = np.union1d(rows[~np.isin(rows, changed)], changed[column[changed] == value])
+        if covered < self._n:
+            tail = np.arange(covered, self._n)
+            rows = np.concatenate([rows, tail[column[covered:self._n] == value]])
+        return rows
+
+    def start_row(self, after=None):
+        """Primera fila después del id after (None = 0); KeyError si no existe."""
+        if after is None:
+            return 0
+        row = self.row_of(after)
+        if row < 0:
+            raise KeyError(f"Key {after} not found")
+        return row + 1
+
+    def page(self, after=None, limit=None, rows=None):
+        """
+        Vistas en orden de inserción que siguen al id after (cursor; None =
+        desde el inicio), como mucho limit. rows (índices crecientes, p. ej.
+        np.flatnonzero(mask)) restringe a esas filas. Un cursor desconocido
+        lanza KeyError.
+        """
+        start = self.start_row(after)
+        if rows is None:
+            rows = range(start, self._n if limit is None else min(self._n, start + limit))
+        else:
+            rows = rows[np.searchsorted(rows, start):]
+            if limit is not None:
+                rows = rows[:limit]
+            rows = rows.tolist()
+        return [self.ROW(self, i) for i in rows]
+
+    def count_by(self, name, mask=None):
+        """{valor: filas} agrupando por una columna internada o entera (solo filas de mask)."""
+        column = self.column(name) if mask is None else self.column(name)[mask]
+        if self.COLUMNS[name] == "code":
+            values = self._vocab[name].values
+            counts = np.bincount(column[column >= 0], minlength=len(values))
+            return {value: int(count) for value, count in zip(values, counts) if count}
+        values, counts = np.unique(column, return_counts=True)
+        return {value: int(count) for value, count in zip(values.tolist(), counts)}
+
+    def sum_by(self, name, column, mask=None):
+        """{valor: suma de column} agrupando por name; los NaN y las filas sin valor no suman."""
+        keys = self.column(name)
+        weights = np.nan_to_num(self.column(column).astype(np.float64))
+        if mask is not None:
+            keys, weights = keys[mask], weights[mask]
+        if self.COLUMNS[name] == "code":
+            values = self._vocab[name].values
+            present = keys >= 0
+            counts = np.bincount(keys[present], minlength=len(values))
+            sums = np.bincount(keys[present], weights=weights[present], minlength=len(values))
+            return {value: _number(total) for value, total, count in zip(values, sums, counts) if count}
+        values, inverse = np.unique(keys, return_inverse=True)
+        sums = np.bincount(inverse, weights=weights, minlength=len(values))
+        return {value: _number(total) for value, total in zip(values.tolist(), sums)}
+
+    # ------------------ Pickle ------------------
+
+    # Solo las filas usadas; los objetos (p. ej. vértices) se guardan tal cual
+    def __getstate__(self):
+        return {
+            "columns": {name: self._cols[name][:self._n].copy() for name in self.COLUMNS},
+            "vocab": {name: vocab.values for name, vocab in self._vocab.items()},
+        }
+
+    def __setstate__(self, state):
+        self._cols = state["columns"]
+        for name, kind in self.COLUMNS.items():
+            if kind == "str":
+                self._cols[name] = _as_bytes(self._cols[name])
+        self._vocab = {name: _Vocab(values) for name, values in state["vocab"].items()}
+        self._n = len(self._cols[self.KEY])
+        self._reset_lookup()
+        self._index = {}
+
+def _column_property(name):
+    return property(lambda self: self._table.value(self._row, name),
+                    lambda self, value: self._table.set_value(self._row, name, value))
+
+class OrderRow(Order):
+    """Fila de un OrderTable con la interfaz de Order (to_dict, repr, atributos)."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+class ClientRow(Client):
+    """Fila de un ClientTable con la interfaz de Client."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+class OrderTable(ColumnTable):
+    """
+    Órdenes por columnas: ids, prioridad, costo y timestamps en arreglos
+    NumPy; cliente, origen, destino y estado internados como códigos
+    (mismas columnas que la tabla "orders" de la instantánea columnar).
+    Reemplaza la lista de Order y sus índices por id y por campo: los
+    filtros por igualdad de query salen de los índices secundarios y se
+    intersectan; el rango de fechas se compara solo sobre esas filas.
+    """
+
+    KEY = "order_id"
+    COLUMNS = {
+        "order_id": "str",
+        "client": "code",
+        "client_id": "code",
+        "origin": "code",
+        "destination": "code",
+        "status": "code",
+        "priority": "int",
+        "created_at": "time",
+        "delivered_at": "time",
+        "route_cost": "float",
+    }
+    INDEXED = ("status", "client_id", "origin", "destination", "priority")
+    ROW = OrderRow
+
+    @classmethod
+    def from_orders(cls, orders):
+        return cls.from_records(orders)
+
+    def mask(self, status=None, client_id=None, origin=None, destination=None,
+             priority=None, created_from=None, created_to=None):
+        mask = super().mask(status=status, client_id=client_id, origin=origin,
+                            destination=destination, priority=priority)
+        return mask & _in_range(self.column("created_at"), created_from, created_to)
+
+    def matching_rows(self, status=None, client_id=None, origin=None, destination=None,
+                      priority=None, created_from=None, created_to=None):
+        """Filas (crecientes) que cumplen los filtros, o None si no se dio ninguno."""
+        filters = {"status": status, "client_id": client_id, "origin": origin,
+                   "destination": destination, "priority": priority}
+        equal = {name: value for name, value in filters.items() if value is not None}
+        if not equal:
+            if created_from is None and created_to is None:
+                return None
+            return np.flatnonzero(_in_range(self.column("created_at"), created_from, created_to))
+        # Filas del filtro más selectivo (desde su índice); los demás se comparan solo sobre ellas
+        hits = {name: self.rows_where(name, value) for name, value in equal.items()}
+        name = min(hits, key=lambda name: len(hits[name]))
+        rows = hits[name]
+        del equal[name]
+        for name, value in equal.items():
+            if self.COLUMNS[name] == "code":
+                value = self._vocab[name].find(value)
+            rows = rows[self._cols[name][rows] == value]
+        if created_from is not None or created_to is not None:
+            rows = rows[_in_range(self.column("created_at")[rows], created_from, created_to)]
+        return rows
+
+    def query(self, status=None, client_id=None, origin=None, destination=None,
+              priority=None, created_from=None, created_to=None, after=None, limit=None):
+        """Órdenes que cumplen todos los filtros dados, en orden de inserción (paginadas con after/limit)."""
+        rows = self.matching_rows(status, client_id, origin, destination, priority, created_from, created_to)
+        return self.page(after, limit, rows)
+
+class ClientTable(ColumnTable):
+    """Clientes por columnas (tipo internado); node queda como objeto (el vértice del grafo)."""
+
+    KEY = "client_id"
+    COLUMNS = {
+        "client_id": "str",
+        "name": "str",
+        "type": "code",
+        "total_orders": "int",
+        "node": "object",
+    }
+    ROW = ClientRow
+
+    @classmethod
+    def from_clients(cls, clients):
+        return cls.from_records(clients)
+
+for _table in (OrderTable, ClientTable):
+    for _name in _table.COLUMNS:
+        setattr(_table.ROW, _name, _column_property(_name))
@@ -0,0 +1,219 @@
+import numpy as np
+
+from .vertex import Vertex
+from .edge import Edge
+
+
+def _frozen(array):
+    array.setflags(write=False)
+    return array
+
+
+class CompactGraph:
+    """
+    Vista inmutable de un grafo en formato CSR (compressed sparse row).
+
+    Los vértices se identifican con enteros 0..n-1. Las aristas salientes del
+    vértice i son targets[offsets[i]:offsets[i + 1]], con sus pesos en la misma
+    posición de weights. En grafos no dirigidos cada arista aparece en ambos
+    sentidos. No se crean objetos Edge salvo que se pidan explícitamente.
+    """
+
+    def __init__(self, offsets, targets, weights, elements, directed=False, vertices=None):
+        self._offsets = _frozen(np.ascontiguousarray(offsets, dtype=np.int64))
+        self._targets = _frozen(np.ascontiguousarray(targets, dtype=np.int64))
+        self._weights = _frozen(np.ascontiguousarray(weights))
+        self._elements = elements
+        self._vertices = vertices
+        self._directed = directed
+        self._init_caches()
+
+    def _init_caches(self):
+        # memoryviews: indexarlos devuelve int/float de Python, mucho más rápido que escalares NumPy
+        self._offsets_view = self._offsets.data
+        self._targets_view = self._targets.data
+        self._weights_view = self._weights.data
+        self._index = None
+        self._labels = None
+        self._reverse = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for key in ("_offsets_view", "_targets_view", "_weights_view", "_index", "_labels", "_reverse"):
+            del state[key]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_caches()
+
+    # ------------------ Construcción ------------------
+
+    @classmethod
+    def from_edges(cls, sources, targets, weights, elements=None, directed=False, n_vertices=None):
+        """
+        Construye el CSR directamente desde arreglos de aristas (sin objetos Edge).
+        - elements: secuencia id -> elemento del vértice; por defecto range(n).
+        - En grafos no dirigidos cada par (u, v) se guarda en ambos sentidos.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = np.asarray(weights)
+        if n_vertices is None:
+            if elements is not None:
+                n_vertices = len(elements)
+            else:
+                n_vertices = int(max(sources.max(initial=-1), targets.max(initial=-1))) + 1
+        if elements is None:
+            elements = range(n_vertices)
+        if not directed:
+            sources, targets = np.concatenate((sources, targets)), np.concatenate((targets, sources))
+            weights = np.concatenate((weights, weights))
+        order = np.lexsort((targets, sources))
+        offsets = np.zeros(n_vertices + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n_vertices), out=offsets[1:])
+        return cls(offsets, targets[order], weights[order], elements, directed)
+
+    def freeze(self):
+        return self
+
+    def thaw(self):
+        """Devuelve un Graph mutable equivalente."""
+        from .graph import Graph
+        graph = Graph(directed=self._directed)
+        vertices = [graph.insert_vertex(self._elements[i]) for i in range(self.vertex_count())]
+        for u, v, w in zip(*self.edge_arrays()):
+            graph.insert_edge(vertices[u], vertices[v], w.item())
+        return graph
+
+    # ------------------ Acceso por id ------------------
+
+    @property
+    def offsets(self):
+        return self._offsets
+
+    @property
+    def targets(self):
+        return self._targets
+
+    @property
+    def weights(self):
+        return self._weights
+
+    def is_directed(self):
+        return self._directed
+
+    def version(self):
+        # Inmutable: nunca cambia
+        return 0
+
+    def vertex_count(self):
+        return len(self._offsets) - 1
+
+    def edge_count(self):
+        m = len(self._targets)
+        return m if self._directed else m // 2
+
+    def vertex(self, i):
+        """Vertex correspondiente al id i (igual, por elemento, al Vertex original)."""
+        if self._vertices is not None:
+            return self._vertices[i]
+        return Vertex(self._elements[i])
+
+    def vertex_id(self, v):
+        """Id entero de un Vertex (o de su elemento)."""
+        element = v.element() if isinstance(v, Vertex) else v
+        elements = self._elements
+        if isinstance(elements, range) and elements.start == 0 and elements.step == 1:
+            if isinstance(element, int) and 0 <= element < len(elements):
+                return element
+            raise KeyError(f"Vertex {element} not in graph")
+        if self._index is None:
+            self._index = {e: i for i, e in enumerate(elements)}
+        try:
+            return self._index[element]
+        except KeyError:
+            raise KeyError(f"Vertex {element} not in graph") from None
+
+    def vertex_by_label(self, label):
+        """Vertex cuyo str() es label, o None (el índice se arma en la primera consulta)."""
+        if self._labels is None:
+            self._labels = {str(e): i for i, e in enumerate(self._elements)}
+        i = self._labels.get(str(label))
+        return None if i is None else self.vertex(i)
+
+    def weighted_neighbors(self, i):
+        """Itera pares (id vecino, peso) de las aristas salientes del id i."""
+        a, b = self._offsets_view[i], self._offsets_view[i + 1]
+        return zip(self._targets_view[a:b], self._weights_view[a:b])
+
+    def weighted_predecessors(self, i):
+        """Itera pares (id origen, peso) de las aristas que llegan al id i."""
+        return self.reverse().weighted_neighbors(i)
+
+    def out_degrees(self):
+        return np.diff(self._offsets)
+
+    def edge_arrays(self):
+        """(sources, targets, weights) con cada arista una sola vez."""
+        sources = np.repeat(np.arange(self.vertex_count(), dtype=np.int64), np.diff(self._offsets))
+        if self._directed:
+            return sources, self._targets, self._weights
+        mask = sources < self._targets
+        return sources[mask], self._targets[mask], self._weights[mask]
+
+    def reverse(self):
+        """Grafo con las aristas invertidas (el mismo objeto si no es dirigido)."""
+        if not self._directed:
+            return self
+        if self._reverse is None:
+            sources, targets, weights = self.edge_arrays()
+            self._reverse = CompactGraph.from_edges(
+                targets, sources, weights, self._elements, directed=True,
+                n_vertices=self.vertex_count()
+            )
+            self._reverse._vertices = self._vertices
+        return self._reverse
+
+    def _find(self, i, j):
+        a, b = self._offsets_view[i], self._offsets_view[i + 1]
+        k = a + int(np.searchsorted(self._targets[a:b], j))
+        if k < b and self._targets_view[k] == j:
+            return k
+        return None
+
+    # ------------------ Interfaz compatible con Graph ------------------
+
+    def vertices(self):
+        return [self.vertex(i) for i in range(self.vertex_count())]
+
+    def edges(self):
+        for u, v, w in zip(*self.edge_arrays()):
+            yield Edge(self.vertex(int(u)), self.vertex(int(v)), w.item())
+
+    def neighbors(self, v):
+        i = self.vertex_id(v)
+        a, b = self._offsets_view[i], self._offsets_view[i + 1]
+        return [self.vertex(j) for j in self._targets_view[a:b]]
+
+    def get_edge(self, u, v):
+        i, j = self.vertex_id(u), self.vertex_id(v)
+        k = self._find(i, j)
+        if k is None:
+            return None
+        return Edge(self.vertex(i), self.vertex(j), self._weights_view[k])
+
+    def degree(self, v, outgoing=True):
+        graph = self if outgoing else self.reverse()
+        i = graph.vertex_id(v)
+        return graph._offsets_view[i + 1] - graph._offsets_view[i]
+
+    def incident_edges(self, v, outgoing=True):
+        graph = self if outgoing else self.reverse()
+        i = graph.vertex_id(v)
+        vi = graph.vertex(i)
+        edges = []
+        for j, w in graph.weighted_neighbors(i):
+            vj = graph.vertex(j)
+            edges.append(Edge(vi, vj, w) if outgoing else Edge(vj, vi, w))
+        return edges
@@ -1,45 +1,127 @@
 from .vertex import Vertex
 from .edge import Edge
+from .compact_graph import CompactGraph
 
 class Graph:
     def __init__(self, directed=False):
         self._outgoing = {}
         self._incoming = {} if directed else self._outgoing
         self._directed = directed
+        self._version = 0
+        self._listeners = []
+        self._labels = {}       # str(v) -> Vertex
+        self._roles = {}        # Vertex -> rol
+        self._role_sets = {}    # rol -> set de Vertex
+
+    def __getstate__(self):
+        # Los suscriptores son objetos del proceso actual: no se serializan
+        state = self.__dict__.copy()
+        state["_listeners"] = []
+        return state
+
+    def __setstate__(self, state):
+        state.setdefault("_version", 0)
+        state.setdefault("_listeners", [])
+        state.setdefault("_roles", {})
+        self.__dict__.update(state)
+        if "_labels" not in state:
+            # Pickles anteriores a los índices: se reconstruyen
+            self._labels = {str(v): v for v in self._outgoing}
+            self._role_sets = {}
+
+    def subscribe(self, listener):
+        """
+        Registra listener(event, u, v, old, new), que se llama después de cada cambio:
+        - "insert_vertex" / "remove_vertex": u es el vértice; v, old y new son None.
+        - "insert_edge": old es el elemento anterior (None si la arista no existía).
+        - "remove_edge": old es el elemento eliminado y new es None.
+        """
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        self._listeners.remove(listener)
+
+    def _notify(self, event, u, v=None, old=None, new=None):
+        for listener in list(self._listeners):
+            listener(event, u, v, old, new)
 
     def is_directed(self):
         return self._directed
 
+    def version(self):
+        """Contador que aumenta con cada modificación (sirve para invalidar cachés)."""
+        return self._version
+
     def insert_vertex(self, element):
         v = Vertex(element)
         self._outgoing[v] = {}
         if self._directed:
             self._incoming[v] = {}
+        self._labels[str(v)] = v
+        self._version += 1
+        self._notify("insert_vertex", v)
         return v
 
     def insert_edge(self, u, v, element):
+        """Inserta la arista u-v; si ya existía, reemplaza su elemento (peso)."""
+        old = self._outgoing[u].get(v)
         e = Edge(u, v, element)
         self._outgoing[u][v] = e
         self._incoming[v][u] = e
+        self._version += 1
+        self._notify("insert_edge", u, v, old._element if old else None, element)
         return e
 
     def remove_edge(self, u, v):
         if u in self._outgoing and v in self._outgoing[u]:
-            del self._outgoing[u][v]
+            old = self._outgoing[u].pop(v)
             del self._incoming[v][u]
+            self._version += 1
+            self._notify("remove_edge", u, v, old._element)
 
     def remove_vertex(self, v):
         for u in list(self._outgoing.get(v, {})):
             self.remove_edge(v, u)
         for u in list(self._incoming.get(v, {})):
             self.remove_edge(u, v)
-        self._outgoing.pop(v, None)
-        if self._directed:
-            self._incoming.pop(v, None)
+        if v in self._outgoing:
+            self._outgoing.pop(v)
+            if self._directed:
+                self._incoming.pop(v, None)
+            self._labels.pop(str(v), None)
+            self.set_role(v, None)
+            self._version += 1
+            self._notify("remove_vertex", v)
 
     def get_edge(self, u, v):
         return self._outgoing.get(u, {}).get(v)
 
+    # ------------------ Índices por etiqueta y rol ------------------
+
+    def vertex_by_label(self, label):
+        """Vertex cuyo str() es label, o None (O(1))."""
+        return self._labels.get(str(label))
+
+    def set_role(self, v, role):
+        """Asigna el rol de v ("storage", "recharge", "client"...); None lo quita."""
+        old = self._roles.pop(v, None)
+        if old is not None:
+            self._role_sets[old].discard(v)
+        if role is not None:
+            self._roles[v] = role
+            self._role_sets.setdefault(role, set()).add(v)
+
+    def role(self, v, default=None):
+        return self._roles.get(v, default)
+
+    def roles(self):
+        """Copia del diccionario {Vertex: rol}."""
+        return dict(self._roles)
+
+    def vertices_with_role(self, role):
+        """Conjunto (copia) de vértices con ese rol."""
+        return set(self._role_sets.get(role, ()))
+
     def vertices(self):
         return self._outgoing.keys()
 
@@ -59,3 +141,26 @@ class Graph:
     def incident_edges(self, v, outgoing=True):
         adj = self._outgoing if outgoing else self._incoming
         return adj[v].values()
+
+    def weighted_neighbors(self, v):
+        return ((u, e._element) for u, e in self._outgoing[v].items())
+
+    def weighted_predecessors(self, v):
+        return ((u, e._element) for u, e in self._incoming[v].items())
+
+    def freeze(self):
+        """Devuelve una vista CSR inmutable (CompactGraph) del grafo actual."""
+        vertices = list(self._outgoing)
+        index = {v: i for i, v in enumerate(vertices)}
+        offsets = [0]
+        targets = []
+        weights = []
+        for u in vertices:
+            row = sorted((index[v], e._element) for v, e in self._outgoing[u].items())
+            targets.extend(j for j, _ in row)
+            weights.extend(w for _, w in row)
+            offsets.append(len(targets))
+        return CompactGraph(
+            offsets, targets, weights, [v.element() for v in vertices],
+            directed=self._directed, vertices=vertices
+        )
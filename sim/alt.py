@@ -0,0 +1,213 @@
+# sim/alt.py
+
+import heapq
+import random
+from itertools import count
+
+import numpy as np
+
+from model.compact_graph import CompactGraph
+from sim.utils import to_internal, to_external
+
+# A* con cotas inferiores ALT (A*, Landmarks, desigualdad Triangular).
+#
+# El preprocesamiento elige k landmarks y guarda las distancias desde (y hacia,
+# si el grafo es dirigido) cada uno. Para cualquier landmark L:
+#     d(v, t) >= d(L, t) - d(L, v)   y   d(v, t) >= d(v, L) - d(t, L)
+# El máximo sobre los landmarks es una heurística consistente, así que A*
+# puede cerrar cada vértice una sola vez.
+
+def _distances_from(graph, source):
+    """Dijkstra completo sobre ids de un CompactGraph; devuelve arreglo con nan en los no alcanzables."""
+    neighbors = graph.weighted_neighbors
+    dist = [float('inf')] * graph.vertex_count()
+    dist[source] = 0
+    heap = [(0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, w in neighbors(u):
+            nd = d + w
+            if nd < dist[v]:
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    dist = np.array(dist, dtype=np.float64)
+    dist[np.isinf(dist)] = np.nan
+    return dist
+
+class LandmarkIndex:
+    """
+    Preprocesamiento ALT: k landmarks elegidos por "farthest selection" y sus
+    arreglos de distancias (una fila por vértice, una columna por landmark).
+    Si recibe un Graph lo congela a CompactGraph.
+    """
+
+    def __init__(self, graph, k=8, seed=None):
+        if not isinstance(graph, CompactGraph):
+            graph = graph.freeze()
+        self.graph = graph
+        n = graph.vertex_count()
+        k = min(k, n)
+        rng = random.Random(seed)
+        reverse = graph.reverse()
+
+        landmarks = []
+        from_cols, to_cols = [], []
+        # El primer landmark es el vértice más lejano a uno elegido al azar
+        closest = _distances_from(graph, rng.randrange(n)) if n else None
+        while len(landmarks) < k:
+            candidates = np.where(np.isnan(closest), -1.0, closest)
+            candidates[landmarks] = -1.0
+            landmark = int(np.argmax(candidates))
+            if candidates[landmark] < 0:
+                break
+            landmarks.append(landmark)
+            d_from = _distances_from(graph, landmark)
+            from_cols.append(d_from)
+            to_cols.append(d_from if reverse is graph else _distances_from(reverse, landmark))
+            closest = d_from if len(landmarks) == 1 else np.fmin(closest, d_from)
+
+        self.landmarks = landmarks
+        self._from = np.column_stack(from_cols) if from_cols else np.empty((n, 0))
+        self._to = self._from if reverse is graph else (
+            np.column_stack(to_cols) if to_cols else np.empty((n, 0))
+        )
+
+    def _bound(self, diffs):
+        bound = np.fmax.reduce(diffs) if len(diffs) else np.nan
+        return 0.0 if bound != bound or bound < 0 else float(bound)
+
+    def bounds_to(self, target):
+        """Función v -> cota inferior de d(v, target) (con caché por consulta)."""
+        ft, tt = self._from[target], self._to[target]
+        cache = {}
+        undirected = self._to is self._from
+
+        def h(v):
+            bound = cache.get(v)
+            if bound is None:
+                fv = self._from[v]
+                if undirected:
+                    bound = self._bound(np.abs(ft - fv))
+                else:
+                    bound = self._bound(np.concatenate((ft - fv, self._to[v] - tt)))
+                cache[v] = bound
+            return bound
+        return h
+
+    def bounds_from(self, source):
+        """Función v -> cota inferior de d(source, v)."""
+        fs, ts = self._from[source], self._to[source]
+        cache = {}
+        undirected = self._to is self._from
+
+        def h(v):
+            bound = cache.get(v)
+            if bound is None:
+                fv = self._from[v]
+                if undirected:
+                    bound = self._bound(np.abs(fv - fs))
+                else:
+                    bound = self._bound(np.concatenate((fv - fs, ts - self._to[v])))
+                cache[v] = bound
+            return bound
+        return h
+
+def _unwind(prev, u):
+    path = []
+    while u is not None:
+        path.append(u)
+        u = prev[u]
+    return path
+
+def astar_shortest_path(landmarks, start, goal, stats=None):
+    """A* guiado por landmarks. Mismo contrato que dijkstra_shortest_path."""
+    graph = landmarks.graph
+    s, t = to_internal(graph, start), to_internal(graph, goal)
+    neighbors = graph.weighted_neighbors
+    h = landmarks.bounds_to(t)
+    dist = {s: 0}
+    prev = {s: None}
+    closed = set()
+    unique = count()
+    heap = [(h(s), next(unique), s)]
+
+    while heap:
+        _, _, u = heapq.heappop(heap)
+        if u in closed:
+            continue
+        closed.add(u)
+        if u == t:
+            break
+        du = dist[u]
+        for v, w in neighbors(u):
+            if v in closed:
+                continue
+            nd = du + w
+            if nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                prev[v] = u
+                heapq.heappush(heap, (nd + h(v), next(unique), v))
+
+    if stats is not None:
+        stats["settled"] = len(closed)
+    if t not in closed:
+        return None, float('inf')
+    path = _unwind(prev, t)
+    path.reverse()
+    return to_external(graph, path), dist[t]
+
+def bidirectional_astar_shortest_path(landmarks, start, goal, stats=None):
+    """
+    A* bidireccional con potenciales promedio p(v) = (h_t(v) - h_s(v)) / 2,
+    que hacen consistentes a la vez la búsqueda hacia adelante y la inversa.
+    Termina cuando la suma de los topes de ambos heaps alcanza al mejor camino visto.
+    """
+    graph = landmarks.graph
+    s, t = to_internal(graph, start), to_internal(graph, goal)
+    h_t, h_s = landmarks.bounds_to(t), landmarks.bounds_from(s)
+
+    def potential(v):
+        return (h_t(v) - h_s(v)) / 2
+
+    adjacency = (graph.weighted_neighbors, graph.reverse().weighted_neighbors)
+    dist = ({s: 0}, {t: 0})
+    prev = ({s: None}, {t: None})
+    closed = (set(), set())
+    unique = count()
+    heaps = ([(potential(s), next(unique), s)], [(-potential(t), next(unique), t)])
+    best, meeting = float('inf'), None
+    if s == t:
+        best, meeting = 0, s
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        sign = 1 if side == 0 else -1
+        _, _, u = heapq.heappop(heaps[side])
+        if u in closed[side]:
+            continue
+        closed[side].add(u)
+        du = dist[side][u]
+        other = dist[1 - side]
+        for v, w in adjacency[side](u):
+            nd = du + w
+            if nd < dist[side].get(v, float('inf')):
+                dist[side][v] = nd
+                prev[side][v] = u
+                heapq.heappush(heaps[side], (nd + sign * potential(v), next(unique), v))
+            if v in other and nd + other[v] < best:
+                best, meeting = nd + other[v], v
+
+    if stats is not None:
+        stats["forward"] = len(closed[0])
+        stats["backward"] = len(closed[1])
+        stats["settled"] = len(closed[0]) + len(closed[1])
+    if meeting is None:
+        return None, float('inf')
+    forward = _unwind(prev[0], meeting)
+    forward.reverse()
+    backward = _unwind(prev[1], meeting)
+    return to_external(graph, forward + backward[1:]), best
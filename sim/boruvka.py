@@ -0,0 +1,104 @@
+# sim/boruvka.py
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from model.compact_graph import CompactGraph
+from model.edge import Edge
+
+def boruvka_mst(graph, workers=None, chunk_size=1_000_000):
+    """
+    MST (bosque si el grafo no es conexo) con Borůvka sobre arreglos NumPy.
+
+    Cada ronda, todas las componentes eligen a la vez su arista más liviana
+    hacia afuera (np.minimum.at) y se unen saltando punteros, así que hay a lo
+    sumo log2(n) rondas sin ningún bucle Python por arista. Los empates se
+    rompen por la posición en un argsort estable de los pesos, igual que en
+    kruskal_mst: sobre un CompactGraph el resultado es la misma lista de
+    aristas, en el mismo orden (sobre un Graph, el mismo peso total).
+
+    workers > 1 reparte la búsqueda de mínimos por bloques de aristas en un
+    pool de procesos (solo conviene con decenas de millones de aristas).
+    """
+    compact = graph if isinstance(graph, CompactGraph) else graph.freeze()
+    us, vs, ws = boruvka_mst_arrays(compact, workers, chunk_size)
+    return _to_edges(graph, compact, us, vs, ws)
+
+def boruvka_mst_arrays(graph, workers=None, chunk_size=1_000_000):
+    """
+    Igual que boruvka_mst pero sobre un CompactGraph y sin crear objetos:
+    devuelve (sources, targets, weights) con ids de vértice. Para redes muy
+    grandes crear un Edge por arista del MST cuesta más que calcularlo.
+    """
+    n = graph.vertex_count()
+    sources, targets, weights = graph.edge_arrays()
+    order = np.argsort(weights, kind="stable")
+    # Aristas ordenadas por rango: el rango de una arista es su índice aquí
+    src, tgt = sources[order], targets[order]
+    m = len(order)
+
+    comp = np.arange(n, dtype=np.int64)
+    alive = np.arange(m, dtype=np.int64)
+    in_mst = np.zeros(m, dtype=bool)
+    executor = ProcessPoolExecutor(max_workers=workers) if workers and workers > 1 else None
+    try:
+        while True:
+            cu, cv = comp[src[alive]], comp[tgt[alive]]
+            crossing = cu != cv
+            alive, cu, cv = alive[crossing], cu[crossing], cv[crossing]
+            if len(alive) == 0:
+                break
+
+            best = _lightest_edges(executor, chunk_size, n, m, alive, cu, cv)
+            roots = np.flatnonzero(best < m)
+            picked = best[roots]
+            in_mst[picked] = True
+
+            # Cada componente apunta a la del otro extremo de su arista elegida;
+            # los pares que se eligen mutuamente forman ciclos de 2: gana la raíz menor
+            pu, pv = comp[src[picked]], comp[tgt[picked]]
+            parent = np.arange(n, dtype=np.int64)
+            parent[roots] = np.where(pu == roots, pv, pu)
+            mutual = (parent[parent[roots]] == roots) & (roots < parent[roots])
+            parent[roots[mutual]] = roots[mutual]
+            while True:
+                jumped = parent[parent]
+                if np.array_equal(jumped, parent):
+                    break
+                parent = jumped
+            comp = parent[comp]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    ranks = np.flatnonzero(in_mst)
+    return src[ranks], tgt[ranks], weights[order[ranks]]
+
+def _lightest_edges(executor, chunk_size, n, m, alive, cu, cv):
+    """Para cada componente, el rango de su arista saliente más liviana (m si no tiene)."""
+    if executor is None or len(alive) <= chunk_size:
+        return _chunk_minimum((n, m, alive, cu, cv))
+    chunks = [
+        (n, m, alive[i:i + chunk_size], cu[i:i + chunk_size], cv[i:i + chunk_size])
+        for i in range(0, len(alive), chunk_size)
+    ]
+    best = np.full(n, m, dtype=np.int64)
+    for partial in executor.map(_chunk_minimum, chunks):
+        np.minimum(best, partial, out=best)
+    return best
+
+def _chunk_minimum(args):
+    n, m, alive, cu, cv = args
+    best = np.full(n, m, dtype=np.int64)
+    np.minimum.at(best, cu, alive)
+    np.minimum.at(best, cv, alive)
+    return best
+
+def _to_edges(graph, compact, us, vs, ws):
+    # Un Vertex por id (no uno por extremo); con un Graph se devuelven sus propios Edge
+    ids = np.unique(np.concatenate([us, vs])).tolist()
+    vertex = dict(zip(ids, map(compact.vertex, ids)))
+    if graph is compact:
+        return [Edge(vertex[u], vertex[v], w)
+                for u, v, w in zip(us.tolist(), vs.tolist(), ws.tolist())]
+    return [graph.get_edge(vertex[u], vertex[v])
+            for u, v in zip(us.tolist(), vs.tolist())]
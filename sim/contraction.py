@@ -0,0 +1,260 @@
+# sim/contraction.py
+
+import heapq
+import pickle
+from itertools import count
+
+import numpy as np
+
+from model.compact_graph import CompactGraph
+
+# Contraction Hierarchies para consultas punto a punto sobre una red estática.
+#
+# Preprocesamiento: los vértices se contraen de a uno, en orden de importancia
+# (diferencia de aristas + vecinos ya contraídos). Al contraer v, por cada par
+# u -> v -> w se agrega el atajo u -> w si ninguna "ruta testigo" que evite v es
+# igual de corta. Cada atajo recuerda su vértice intermedio para desempaquetarlo.
+#
+# Consulta: Dijkstra bidireccional que solo sube en el orden (hacia adelante
+# desde el origen y hacia atrás desde el destino).
+
+# Vértices asentados por búsqueda testigo: más bajo al estimar prioridades
+# (solo ordena), más alto al contraer (menos atajos innecesarios)
+WITNESS_SETTLE_LIMIT = 60
+PRIORITY_SETTLE_LIMIT = 15
+
+def _witness_distances(out_adj, source, excluded, limit, settle_limit, targets):
+    dist = {source: 0}
+    heap = [(0, source)]
+    settled = 0
+    pending = len(targets)
+    while heap and settled < settle_limit:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        if d > limit:
+            break
+        settled += 1
+        if u in targets:
+            pending -= 1
+            if not pending:
+                break
+        for v, (w, _) in out_adj[u].items():
+            if v == excluded:
+                continue
+            nd = d + w
+            if nd < dist.get(v, float('inf')):
+                dist[v] = nd
+                heapq.heappush(heap, (nd, v))
+    return dist
+
+def _to_csr(n, rows, elements):
+    """rows[u] = [(v, peso, intermedio)] -> (CompactGraph dirigido, arreglo de intermedios alineado)."""
+    sources, targets, weights, middles = [], [], [], []
+    for u, row in enumerate(rows):
+        for v, w, m in sorted(row, key=lambda item: item[0]):
+            sources.append(u)
+            targets.append(v)
+            weights.append(w)
+            middles.append(m)
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(np.asarray(sources, dtype=np.int64), minlength=n), out=offsets[1:])
+    graph = CompactGraph(offsets, targets, weights, elements, directed=True)
+    return graph, np.asarray(middles, dtype=np.int64)
+
+class ContractionHierarchy:
+    def __init__(self, graph):
+        if not isinstance(graph, CompactGraph):
+            graph = graph.freeze()
+        n = graph.vertex_count()
+        elements = graph._elements
+
+        # Grafo dinámico: out_adj[u][v] = (peso, intermedio o -1 si es arista original)
+        out_adj = [dict() for _ in range(n)]
+        in_adj = [dict() for _ in range(n)]
+        for u in range(n):
+            for v, w in graph.weighted_neighbors(u):
+                if u != v and w < out_adj[u].get(v, (float('inf'), -1))[0]:
+                    out_adj[u][v] = (w, -1)
+                    in_adj[v][u] = (w, -1)
+
+        contracted_neighbors = [0] * n
+        rank = [0] * n
+        up_rows = [[] for _ in range(n)]
+        down_rows = [[] for _ in range(n)]
+        self.shortcut_count = 0
+
+        def shortcuts_for(v, settle_limit=WITNESS_SETTLE_LIMIT):
+            found = []
+            outgoing = out_adj[v]
+            if not outgoing:
+                return found
+            max_out = max(w for w, _ in outgoing.values())
+            for u, (w_uv, _) in in_adj[v].items():
+                dist = _witness_distances(out_adj, u, v, w_uv + max_out, settle_limit, outgoing)
+                for x, (w_vx, _) in outgoing.items():
+                    if x == u:
+                        continue
+                    via = w_uv + w_vx
+                    if dist.get(x, float('inf')) > via:
+                        found.append((u, x, via))
+            return found
+
+        def priority(v):
+            return (len(shortcuts_for(v, PRIORITY_SETTLE_LIMIT)) - len(in_adj[v]) - len(out_adj[v])
+                    + contracted_neighbors[v])
+
+        unique = count()
+        queue = [(priority(v), next(unique), v) for v in range(n)]
+        heapq.heapify(queue)
+        order = 0
+        while queue:
+            _, _, v = heapq.heappop(queue)
+            # Actualización perezosa: si su prioridad empeoró, vuelve a la cola
+            current = priority(v)
+            if queue and current > queue[0][0]:
+                heapq.heappush(queue, (current, next(unique), v))
+                continue
+
+            for u, x, via in shortcuts_for(v):
+                if via < out_adj[u].get(x, (float('inf'), -1))[0]:
+                    out_adj[u][x] = (via, v)
+                    in_adj[x][u] = (via, v)
+                    self.shortcut_count += 1
+
+            rank[v] = order
+            order += 1
+            # Todas las aristas que le quedan a v van hacia vértices de rango mayor
+            for x, (w, m) in out_adj[v].items():
+                up_rows[v].append((x, w, m))
+                del in_adj[x][v]
+                contracted_neighbors[x] += 1
+            for u, (w, m) in in_adj[v].items():
+                down_rows[v].append((u, w, m))
+                del out_adj[u][v]
+                contracted_neighbors[u] += 1
+            out_adj[v] = {}
+            in_adj[v] = {}
+
+        self._directed = graph.is_directed()
+        self._rank = np.asarray(rank, dtype=np.int64)
+        # _up: aristas u -> x con rank[x] > rank[u]; _down: por cada x, aristas u -> x con rank[u] > rank[x], invertidas
+        self._up, self._up_middle = _to_csr(n, up_rows, elements)
+        self._down, self._down_middle = _to_csr(n, down_rows, elements)
+        self._labels = None
+
+    # ------------------ Persistencia ------------------
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(path):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_labels"] = None
+        return state
+
+    # ------------------ Consultas ------------------
+
+    def vertex_id(self, v):
+        return self._up.vertex_id(v)
+
+    def vertex_id_from_label(self, label):
+        if self._labels is None:
+            self._labels = {str(self._up._elements[i]): i for i in range(self._up.vertex_count())}
+        return self._labels.get(str(label))
+
+    def _search(self, s, t):
+        up, down = self._up.weighted_neighbors, self._down.weighted_neighbors
+        dist = ({s: 0}, {t: 0})
+        prev = ({s: None}, {t: None})
+        heaps = ([(0, s)], [(0, t)])
+        adjacency = (up, down)
+        best, meeting = float('inf'), None
+        while heaps[0] or heaps[1]:
+            for side in (0, 1):
+                heap = heaps[side]
+                if not heap:
+                    continue
+                d, u = heapq.heappop(heap)
+                if d > dist[side][u]:
+                    continue
+                if d >= best:
+                    # Ningún camino por este lado puede mejorar: se vacía
+                    heap.clear()
+                    continue
+                other = dist[1 - side].get(u)
+                if other is not None and d + other < best:
+                    best, meeting = d + other, u
+                for v, w in adjacency[side](u):
+                    nd = d + w
+                    if nd < dist[side].get(v, float('inf')):
+                        dist[side][v] = nd
+                        prev[side][v] = u
+                        heapq.heappush(heap, (nd, v))
+        return best, meeting, prev
+
+    def _middle(self, u, x):
+        if self._rank[u] < self._rank[x]:
+            k = self._up._find(u, x)
+            return int(self._up_middle[k])
+        k = self._down._find(x, u)
+        return int(self._down_middle[k])
+
+    def _unpack(self, u, x, out):
+        # Expande u -> x (sin incluir u) recursivamente con una pila
+        stack = [(u, x)]
+        while stack:
+            a, b = stack.pop()
+            m = self._middle(a, b)
+            if m == -1:
+                out.append(b)
+            else:
+                stack.append((m, b))
+                stack.append((a, m))
+
+    def query_ids(self, s, t):
+        """Camino más corto entre ids: devuelve (lista de ids, costo) o (None, inf)."""
+        if s == t:
+            return [s], 0
+        best, meeting, prev = self._search(s, t)
+        if meeting is None:
+            return None, float('inf')
+        forward = []
+        u = meeting
+        while u is not None:
+            forward.append(u)
+            u = prev[0][u]
+        forward.reverse()
+        backward = []
+        u = prev[1][meeting]
+        while u is not None:
+            backward.append(u)
+            u = prev[1][u]
+        hops = forward + backward
+        path = [hops[0]]
+        for a, b in zip(hops, hops[1:]):
+            self._unpack(a, b, path)
+        return path, best
+
+    def shortest_path(self, start, goal):
+        """Mismo contrato que dijkstra_shortest_path: (path de Vertex, costo)."""
+        path, cost = self.query_ids(self.vertex_id(start), self.vertex_id(goal))
+        if path is None:
+            return None, cost
+        return [self._up.vertex(i) for i in path], cost
+
+    def shortest_path_labels(self, origin, destination):
+        """Consulta por etiquetas str (para la API): (lista de etiquetas, costo)."""
+        s, t = self.vertex_id_from_label(origin), self.vertex_id_from_label(destination)
+        if s is None or t is None:
+            return None, float('inf')
+        path, cost = self.query_ids(s, t)
+        if path is None:
+            return None, cost
+        return [str(self._up._elements[i]) for i in path], cost
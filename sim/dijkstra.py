@@ -2,38 +2,51 @@
 
 import heapq
 from itertools import count
+from sim.utils import to_internal, to_external
 
-def dijkstra_shortest_path(graph, start, goal):
-    dist = {v: float('inf') for v in graph.vertices()}
-    prev = {v: None for v in graph.vertices()}
-    dist[start] = 0
-    queue = [(0, start)]
+# Ambas funciones aceptan un Graph o un CompactGraph (graph.freeze()).
+# Internamente trabajan sobre graph.weighted_neighbors(u), que en un
+# CompactGraph recorre los arreglos CSR con ids enteros sin crear objetos Edge.
+
+def dijkstra_shortest_path(graph, start, goal, stats=None):
+    start_key, goal_key = to_internal(graph, start), to_internal(graph, goal)
+    neighbors = graph.weighted_neighbors
+    dist = {start_key: 0}
+    prev = {start_key: None}
+    unique = count()
+    queue = [(0, next(unique), start_key)]
+    settled = 0
 
     while queue:
-        curr_dist, u = heapq.heappop(queue)
-        if u == goal:
+        curr_dist, _, u = heapq.heappop(queue)
+        if curr_dist > dist[u]:
+            continue
+        settled += 1
+        if u == goal_key:
             break
-        for v in graph.neighbors(u):
-            edge = graph.get_edge(u, v)
-            weight = edge.element()
+        for v, weight in neighbors(u):
             alt = curr_dist + weight
-            if alt < dist[v]:
+            if alt < dist.get(v, float('inf')):
                 dist[v] = alt
                 prev[v] = u
-                heapq.heappush(queue, (alt, v))
+                heapq.heappush(queue, (alt, next(unique), v))
 
-    path = []
-    u = goal
-    if prev[u] or u == start:
-        while u is not None:
-            path.insert(0, u)
-            u = prev[u]
-        return path, dist[goal]
-    else:
+    if stats is not None:
+        stats["settled"] = settled
+    if goal_key not in prev:
         return None, float('inf')
+    path = []
+    u = goal_key
+    while u is not None:
+        path.append(u)
+        u = prev[u]
+    path.reverse()
+    return to_external(graph, path), dist[goal_key]
 
 def dijkstra_with_recharge(graph, start, goal, autonomy, recharge_nodes):
-    recharge_nodes = set(recharge_nodes)
+    recharge_nodes = {to_internal(graph, v) for v in recharge_nodes}
+    start, goal = to_internal(graph, start), to_internal(graph, goal)
+    neighbors = graph.weighted_neighbors
     heap = []
     unique = count()  # NUEVO: contador global para el heap
 
@@ -49,11 +62,9 @@ def dijkstra_with_recharge(graph, start, goal, autonomy, recharge_nodes):
         visited[key] = cost
 
         if u == goal:
-            return path, cost
+            return to_external(graph, path), cost
 
-        for v in graph.neighbors(u):
-            edge = graph.get_edge(u, v)
-            w = edge.element()
+        for v, w in neighbors(u):
             if w > autonomy:
                 continue
             if v in recharge_nodes and v not in recs:
@@ -69,3 +80,53 @@ def dijkstra_with_recharge(graph, start, goal, autonomy, recharge_nodes):
             heapq.heappush(heap, (cost + w, next(unique), v, next_battery, next_recs, path + [v]))
 
     return None, float('inf')
+
+def dijkstra_with_recharge_all(graph, start, autonomy, recharge_nodes, targets=None):
+    """
+    Misma búsqueda que dijkstra_with_recharge, pero desde un solo origen hacia
+    varios destinos: devuelve {destino: (path, cost)} para los alcanzables.
+    Si targets es None se consideran todos los vértices.
+    """
+    recharge_nodes = {to_internal(graph, v) for v in recharge_nodes}
+    start = to_internal(graph, start)
+    remaining = None if targets is None else {to_internal(graph, v) for v in targets}
+    neighbors = graph.weighted_neighbors
+    heap = [(0, 0, start, autonomy, frozenset(), [start])]
+    unique = count(1)
+    visited = dict()
+    found = {}
+
+    while heap:
+        cost, _, u, battery, recs, path = heapq.heappop(heap)
+        key = (u, battery, recs)
+        if key in visited and visited[key] <= cost:
+            continue
+        visited[key] = cost
+
+        # La primera vez que se extrae u su costo es mínimo
+        if u not in found and (remaining is None or u in remaining):
+            found[u] = (path, cost)
+            if remaining is not None:
+                remaining.discard(u)
+                if not remaining:
+                    break
+
+        for v, w in neighbors(u):
+            if w > autonomy:
+                continue
+            if v in recharge_nodes and v not in recs:
+                next_battery = autonomy
+                next_recs = frozenset(set(recs) | {v})
+            else:
+                next_battery = battery
+                next_recs = recs
+            next_battery -= w
+            if next_battery < 0:
+                continue
+            heapq.heappush(heap, (cost + w, next(unique), v, next_battery, next_recs, path + [v]))
+
+    results = {}
+    for path, cost in found.values():
+        path = to_external(graph, path)
+        results[path[-1]] = (path, cost)
+    return results
@@ -0,0 +1,162 @@
+# sim/dynamic_mst.py
+
+from itertools import count
+
+from sim.kruskal import kruskal_mst
+from tda.link_cut_tree import LinkCutTree
+
+class DynamicMST:
+    """
+    Árbol (bosque) de expansión mínima que se mantiene al día con las
+    modificaciones de un Graph no dirigido, sin volver a correr Kruskal.
+
+    El bosque vive en un link-cut tree donde cada arista del MST es un nodo
+    con su peso, de modo que "arista más pesada en el camino u..v" cuesta
+    O(log n) amortizado:
+    - insertar u-v: si u y v no están conectados se enlaza; si no, reemplaza
+      a la arista más pesada del ciclo solo si es más liviana.
+    - eliminar una arista fuera del MST: O(1).
+    - eliminar una arista del MST: se corta, y el reemplazo es la arista fuera
+      del árbol más liviana que cruza el corte. Los dos lados se recorren a la
+      par por las aristas del bosque hasta agotar el más chico, S, y solo se
+      miran las aristas del grafo incidentes a S: O(|S| + grados de S).
+    - cambiar un peso = eliminar + insertar.
+
+    Eliminar una arista del MST es lineal: en el peor caso (un corte que
+    parte el árbol por la mitad) cuesta O(n + m). La eliminación sublineal
+    de Holm, de Lichtenberg y Thorup (Euler-tour trees por niveles, O(log² n)
+    amortizado) no está implementada. Con las redes de la simulación (grado
+    acotado, cortes que suelen aislar ramas chicas) el lado más chico es
+    pequeño y no justifica esa complejidad.
+    """
+
+    def __init__(self, graph):
+        if graph.is_directed():
+            raise ValueError("DynamicMST requires an undirected graph")
+        self.graph = graph
+        self._lct = LinkCutTree()
+        self._tree = {}         # clave de arista -> Edge
+        self._adj = {}          # vértice -> vecinos en el bosque
+        self._non_tree = {}     # clave de arista -> (peso, secuencia, Edge)
+        self._seq = count()
+        self._total = 0
+
+        for v in graph.vertices():
+            self._lct.add_node(v)
+            self._adj[v] = set()
+        tree_keys = set()
+        for e in kruskal_mst(graph):
+            self._link(e)
+            tree_keys.add(self._key(*e.endpoints()))
+        for e in graph.edges():
+            if self._key(*e.endpoints()) not in tree_keys:
+                self._add_non_tree(e)
+        graph.subscribe(self._on_change)
+
+    def detach(self):
+        self.graph.unsubscribe(self._on_change)
+
+    # ------------------ Consultas ------------------
+
+    def edges(self):
+        return list(self._tree.values())
+
+    def total_weight(self):
+        return self._total
+
+    def __len__(self):
+        return len(self._tree)
+
+    # ------------------ Internos ------------------
+
+    @staticmethod
+    def _key(u, v):
+        return frozenset((u, v))
+
+    def _link(self, e):
+        u, v = e.endpoints()
+        key = self._key(u, v)
+        self._lct.add_node(key, e.element())
+        self._lct.link(u, key)
+        self._lct.link(key, v)
+        self._tree[key] = e
+        self._adj[u].add(v)
+        self._adj[v].add(u)
+        self._total += e.element()
+
+    def _cut(self, key):
+        e = self._tree.pop(key)
+        u, v = e.endpoints()
+        self._lct.cut(u, key)
+        self._lct.cut(key, v)
+        self._lct.remove_node(key)
+        self._adj[u].discard(v)
+        self._adj[v].discard(u)
+        self._total -= e.element()
+        return e
+
+    def _add_non_tree(self, e):
+        # La secuencia desempata pesos iguales (y evita comparar Edges)
+        self._non_tree[self._key(*e.endpoints())] = (e.element(), next(self._seq), e)
+
+    def _insert(self, e):
+        u, v = e.endpoints()
+        if u == v:
+            return
+        if not self._lct.connected(u, v):
+            self._link(e)
+            return
+        heaviest, weight = self._lct.path_max(u, v)
+        if e.element() < weight:
+            self._add_non_tree(self._cut(heaviest))
+            self._link(e)
+        else:
+            self._add_non_tree(e)
+
+    def _delete(self, key):
+        if key in self._non_tree:
+            del self._non_tree[key]
+            return
+        if key not in self._tree:
+            return
+        # Lineal en el lado más chico y sus grados: O(n + m) en el peor caso
+        side = self._smaller_side(*self._cut(key).endpoints())
+        # Una arista fuera del árbol que sale de side solo puede ir al otro lado
+        best = None
+        for x in side:
+            for y in self.graph.neighbors(x):
+                if y not in side:
+                    entry = self._non_tree.get(self._key(x, y))
+                    if entry is not None and (best is None or entry[:2] < best[:2]):
+                        best = entry
+        if best is not None:
+            e = best[2]
+            del self._non_tree[self._key(*e.endpoints())]
+            self._link(e)
+
+    def _smaller_side(self, u, v):
+        """Vértices del lado más chico tras cortar u-v (se recorren los dos a la par)."""
+        sides = [({u}, [u]), ({v}, [v])]
+        while True:
+            for seen, stack in sides:
+                if not stack:
+                    return seen
+                x = stack.pop()
+                for y in self._adj[x]:
+                    if y not in seen:
+                        seen.add(y)
+                        stack.append(y)
+
+    def _on_change(self, event, u, v, old, new):
+        if event == "insert_vertex":
+            self._lct.add_node(u)
+            self._adj[u] = set()
+        elif event == "remove_vertex":
+            self._lct.remove_node(u)
+            self._adj.pop(u, None)
+        elif event == "remove_edge":
+            self._delete(self._key(u, v))
+        elif event == "insert_edge":
+            if old is not None:
+                self._delete(self._key(u, v))
+            self._insert(self.graph.get_edge(u, v))
@@ -0,0 +1,179 @@
+# sim/dynamic_sssp.py
+
+import heapq
+from itertools import count
+
+INF = float('inf')
+
+class DynamicShortestPaths:
+    """
+    Árbol de caminos más cortos desde un origen que se repara de forma
+    incremental (estilo Ramalingam–Reps) cuando el grafo cambia.
+
+    - Si una arista empeora o se elimina y pertenecía al árbol, solo el
+      subárbol que colgaba de ella pierde su distancia; se vuelve a sembrar
+      desde sus vecinos no afectados y se propaga con Dijkstra.
+    - Si una arista mejora o se inserta, se propaga la mejora desde su
+      extremo sin tocar el resto.
+
+    Se suscribe a las modificaciones del Graph (insert_edge, remove_edge,
+    insert_vertex, remove_vertex); insert_edge sobre una arista existente es
+    un cambio de peso. apply_updates aplica varios cambios con una sola reparación.
+    """
+
+    def __init__(self, graph, source, attach=True):
+        self.graph = graph
+        self.source = source
+        self._dist = {}
+        self._parent = {}
+        self._children = {}
+        self._batch = None
+        self._recompute()
+        if attach:
+            graph.subscribe(self._on_change)
+
+    def detach(self):
+        self.graph.unsubscribe(self._on_change)
+
+    # ------------------ Consultas ------------------
+
+    def distance(self, v):
+        return self._dist.get(v, INF)
+
+    def parent(self, v):
+        return self._parent.get(v)
+
+    def path_to(self, v):
+        """(path, cost) desde el origen, o (None, inf) si no es alcanzable."""
+        if self._dist.get(v, INF) == INF:
+            return None, INF
+        path = []
+        u = v
+        while u is not None:
+            path.append(u)
+            u = self._parent.get(u)
+        path.reverse()
+        return path, self._dist[v]
+
+    def distances(self):
+        return dict(self._dist)
+
+    # ------------------ Actualizaciones ------------------
+
+    def apply_updates(self, updates):
+        """
+        Aplica al grafo una lista de cambios (u, v, peso); peso None elimina la
+        arista. La reparación se hace una sola vez al final, sobre la unión de
+        las regiones afectadas.
+        """
+        self._batch = []
+        try:
+            for u, v, weight in updates:
+                if weight is None:
+                    self.graph.remove_edge(u, v)
+                else:
+                    self.graph.insert_edge(u, v, weight)
+            changes = self._batch
+        finally:
+            self._batch = None
+        self._repair(changes)
+
+    def _on_change(self, event, u, v, old, new):
+        if event == "insert_vertex":
+            return
+        if event == "remove_vertex":
+            if u == self.source:
+                self._dist, self._parent, self._children = {}, {}, {}
+            else:
+                self._dist.pop(u, None)
+                self._parent.pop(u, None)
+                self._children.pop(u, None)
+            return
+        # Arcos dirigidos afectados: en un grafo no dirigido, ambos sentidos
+        arcs = [(u, v, old, new)]
+        if not self.graph.is_directed():
+            arcs.append((v, u, old, new))
+        if self._batch is not None:
+            self._batch.extend(arcs)
+        else:
+            self._repair(arcs)
+
+    def _set_parent(self, v, p):
+        old = self._parent.get(v)
+        if old is not None:
+            self._children[old].discard(v)
+        self._parent[v] = p
+        if p is not None:
+            self._children.setdefault(p, set()).add(v)
+
+    def _recompute(self):
+        self._dist = {self.source: 0}
+        self._parent = {self.source: None}
+        self._children = {}
+        heap = [(0, 0, self.source)]
+        self._propagate(heap, count(1))
+
+    def _propagate(self, heap, unique):
+        dist = self._dist
+        while heap:
+            d, _, u = heapq.heappop(heap)
+            if d > dist.get(u, INF):
+                continue
+            for v, w in self.graph.weighted_neighbors(u):
+                nd = d + w
+                if nd < dist.get(v, INF):
+                    dist[v] = nd
+                    self._set_parent(v, u)
+                    heapq.heappush(heap, (nd, next(unique), v))
+
+    def _repair(self, arcs):
+        dist = self._dist
+        heap = []
+        unique = count()
+
+        # 1. Aristas del árbol que empeoraron o desaparecieron: su subárbol queda afectado
+        affected = set()
+        for a, b, old, new in arcs:
+            worse = new is None or (old is not None and new > old)
+            if worse and self._parent.get(b) == a and b not in affected:
+                stack = [b]
+                while stack:
+                    x = stack.pop()
+                    if x in affected:
+                        continue
+                    affected.add(x)
+                    stack.extend(self._children.get(x, ()))
+        for x in affected:
+            dist[x] = INF
+            self._set_parent(x, None)
+
+        # 2. Sembrar los afectados desde sus predecesores no afectados
+        for x in affected:
+            best, best_parent = INF, None
+            for y, w in self.graph.weighted_predecessors(x):
+                if y not in affected and dist.get(y, INF) + w < best:
+                    best, best_parent = dist[y] + w, y
+            if best < INF:
+                dist[x] = best
+                self._set_parent(x, best_parent)
+                heapq.heappush(heap, (best, next(unique), x))
+
+        # 3. Aristas nuevas o más baratas que mejoran a su extremo (con el peso
+        #    vigente: dentro de un lote la misma arista puede cambiar varias veces)
+        for a, b, old, new in arcs:
+            if new is None or a not in dist:
+                continue
+            edge = self.graph.get_edge(a, b)
+            if edge is None:
+                continue
+            nd = dist[a] + edge.element()
+            if nd < dist.get(b, INF):
+                dist[b] = nd
+                self._set_parent(b, a)
+                heapq.heappush(heap, (nd, next(unique), b))
+
+        self._propagate(heap, unique)
+        for x in affected:
+            if dist[x] == INF:
+                del dist[x]
+                self._parent.pop(x, None)
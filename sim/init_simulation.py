@@ -1,25 +1,14 @@
-import random
-from model.graph import Graph
+from sim.network_generator import generate_network
 
 class InitSimulation:
 
     @staticmethod
-    def generate_connected_graph(n_nodes, m_edges):
-        graph = Graph(directed=False)
-        vertices = [graph.insert_vertex(i) for i in range(n_nodes)]
+    def generate_network(n_nodes, m_edges, topology="tree", seed=None):
+        """Red generada en arreglos (ver sim/network_generator.py), con roles ya asignados."""
+        return generate_network(n_nodes, m_edges, topology=topology, seed=seed)
 
-        for i in range(1, n_nodes):
-            u = vertices[i]
-            v = vertices[random.randint(0, i - 1)]
-            weight = random.randint(1, 10)
-            graph.insert_edge(u, v, weight)
-
-        added = set()
-        while len(list(graph.edges())) < m_edges:
-            u, v = random.sample(vertices, 2)
-            if (u, v) not in added and (v, u) not in added and not graph.get_edge(u, v):
-                weight = random.randint(1, 10)
-                graph.insert_edge(u, v, weight)
-                added.add((u, v))
-
-        return graph, vertices
+    @staticmethod
+    def generate_connected_graph(n_nodes, m_edges, seed=None):
+        # Árbol aleatorio + aristas extra, pesos 1..10; m_edges se limita al máximo posible
+        graph = generate_network(n_nodes, m_edges, seed=seed).to_graph()
+        return graph, list(graph.vertices())
@@ -1,6 +1,13 @@
 # sim/kruskal.py
 
+import numpy as np
+from model.compact_graph import CompactGraph
+from model.edge import Edge
+
 def kruskal_mst(graph):
+    if isinstance(graph, CompactGraph):
+        return _kruskal_compact(graph)
+
     parent = {}
     rank = {}
 
@@ -34,9 +41,35 @@ def kruskal_mst(graph):
             mst.append(e)
     return mst
 
-# Asumiendo que graph.vertices() da los Vertex originales
+def _kruskal_compact(graph):
+    # Orden y union-find sobre arreglos de ids; solo se crean Edge para el MST
+    sources, targets, weights = graph.edge_arrays()
+    order = np.argsort(weights, kind="stable")
+    parent = list(range(graph.vertex_count()))
+    rank = [0] * graph.vertex_count()
+
+    def find(u):
+        while parent[u] != u:
+            parent[u] = parent[parent[u]]
+            u = parent[u]
+        return u
+
+    mst = []
+    needed = graph.vertex_count() - 1
+    for u, v, w in zip(sources[order].tolist(), targets[order].tolist(), weights[order].tolist()):
+        ru, rv = find(u), find(v)
+        if ru == rv:
+            continue
+        if rank[ru] < rank[rv]:
+            ru, rv = rv, ru
+        parent[rv] = ru
+        if rank[ru] == rank[rv]:
+            rank[ru] += 1
+        mst.append(Edge(graph.vertex(u), graph.vertex(v), w))
+        if len(mst) == needed:
+            break
+    return mst
+
 def get_vertex_from_str(graph, s):
-    for vertex in graph.vertices():
-        if str(vertex) == str(s):
-            return vertex
-    return None
+    # Índice etiqueta -> Vertex del grafo (Graph o CompactGraph)
+    return graph.vertex_by_label(s)
@@ -0,0 +1,87 @@
+# sim/label_setting.py
+
+import heapq
+from itertools import count
+from sim.utils import to_internal, to_external
+
+# Motor de rutas con recarga basado en etiquetas (cost, batería restante).
+#
+# A diferencia de dijkstra_with_recharge:
+# - el estado no guarda el conjunto de estaciones usadas: llegar a una estación
+#   de recarga siempre deja la batería en autonomy - peso de la arista;
+# - una etiqueta en v se descarta si otra ya asentada en v tiene costo <= y
+#   batería >= (dominancia). Como el heap sale en orden de costo, basta con
+#   guardar la mayor batería asentada por vértice;
+# - cada etiqueta guarda un puntero a su padre en vez de copiar el camino.
+#
+# Como se permite reutilizar estaciones, puede encontrar rutas que el motor
+# antiguo rechaza; cuando ambos encuentran ruta, el costo nunca es mayor.
+
+def _label_search(graph, start, autonomy, recharge_nodes, targets):
+    neighbors = graph.weighted_neighbors
+    best_battery = {}
+    label_vertex = []
+    label_parent = []
+    found = {}
+    remaining = None if targets is None else set(targets)
+    unique = count()
+    # (costo, -batería, desempate, vértice, etiqueta padre): a igual costo sale primero la de más batería
+    heap = [(0, -autonomy, next(unique), start, -1)]
+
+    while heap:
+        cost, neg_battery, _, u, parent = heapq.heappop(heap)
+        battery = -neg_battery
+        if battery <= best_battery.get(u, -1):
+            continue
+        best_battery[u] = battery
+        label = len(label_vertex)
+        label_vertex.append(u)
+        label_parent.append(parent)
+
+        if u not in found and (remaining is None or u in remaining):
+            found[u] = (label, cost)
+            if remaining is not None:
+                remaining.discard(u)
+                if not remaining:
+                    break
+
+        for v, w in neighbors(u):
+            if w > autonomy:
+                continue
+            next_battery = (autonomy if v in recharge_nodes else battery) - w
+            if next_battery < 0 or next_battery <= best_battery.get(v, -1):
+                continue
+            heapq.heappush(heap, (cost + w, -next_battery, next(unique), v, label))
+
+    return found, label_vertex, label_parent
+
+def _unwind(label, label_vertex, label_parent):
+    path = []
+    while label != -1:
+        path.append(label_vertex[label])
+        label = label_parent[label]
+    path.reverse()
+    return path
+
+def label_setting_with_recharge(graph, start, goal, autonomy, recharge_nodes):
+    """Mismo contrato que dijkstra_with_recharge: devuelve (path, cost) o (None, inf)."""
+    recharge_nodes = {to_internal(graph, v) for v in recharge_nodes}
+    start, goal = to_internal(graph, start), to_internal(graph, goal)
+    found, label_vertex, label_parent = _label_search(graph, start, autonomy, recharge_nodes, {goal})
+    if goal not in found:
+        return None, float('inf')
+    label, cost = found[goal]
+    return to_external(graph, _unwind(label, label_vertex, label_parent)), cost
+
+def label_setting_with_recharge_all(graph, start, autonomy, recharge_nodes, targets=None):
+    """Versión de un origen a muchos destinos: {destino: (path, cost)}."""
+    recharge_nodes = {to_internal(graph, v) for v in recharge_nodes}
+    start = to_internal(graph, start)
+    if targets is not None:
+        targets = {to_internal(graph, v) for v in targets}
+    found, label_vertex, label_parent = _label_search(graph, start, autonomy, recharge_nodes, targets)
+    results = {}
+    for label, cost in found.values():
+        path = to_external(graph, _unwind(label, label_vertex, label_parent))
+        results[path[-1]] = (path, cost)
+    return results
@@ -0,0 +1,218 @@
+# sim/network_generator.py
+
+import numpy as np
+from model.compact_graph import CompactGraph
+
+ROLE_NAMES = ("storage", "recharge", "client")
+DEFAULT_ROLE_DISTRIBUTION = (("storage", 0.2), ("recharge", 0.2), ("client", 0.6))
+TOPOLOGIES = ("tree", "grid", "geometric", "scale_free")
+
+class GeneratedNetwork:
+    """
+    Resultado de generate_network:
+    - graph: CompactGraph (ids 0..n-1, elemento del vértice = id).
+    - roles: arreglo con el rol de cada id ("storage", "recharge" o "client").
+    - coords: arreglo (n, 2) de posiciones, o None si la topología no las usa.
+    """
+
+    def __init__(self, graph, roles, coords=None):
+        self.graph = graph
+        self.roles = roles
+        self.coords = coords
+
+    def ids_with_role(self, role):
+        return np.flatnonzero(self.roles == role)
+
+    def to_graph(self):
+        """Graph mutable equivalente (para la simulación interactiva)."""
+        return self.graph.thaw()
+
+    def node_roles(self, graph=None):
+        """{Vertex: rol}; con graph se usan sus Vertex (p. ej. los de to_graph())."""
+        if graph is None:
+            vertices = [self.graph.vertex(i) for i in range(self.graph.vertex_count())]
+        else:
+            vertices = list(graph.vertices())
+        return {v: self.roles[v.element()] for v in vertices}
+
+def generate_network(n_nodes, m_edges, topology="tree", seed=None, weight_range=(1, 10),
+                     role_distribution=DEFAULT_ROLE_DISTRIBUTION):
+    """
+    Genera una red conexa no dirigida directamente en arreglos NumPy.
+
+    Topologías:
+    - "tree": árbol aleatorio + aristas extra al azar hasta m_edges.
+    - "grid": grilla de ceil(sqrt(n)) columnas (m_edges se ignora).
+    - "geometric": puntos en el cuadrado unitario unidos si están a menos de un
+      radio elegido para rondar m_edges; el peso sale de la distancia.
+    - "scale_free": enlace preferencial (~m_edges / n aristas por nodo nuevo).
+
+    Los pesos son enteros en weight_range. Los roles se reparten en bloque
+    según role_distribution; lo que sobre por redondeo queda como "client".
+    """
+    if n_nodes < 1:
+        raise ValueError("n_nodes must be positive")
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology: {topology}")
+    rng = np.random.default_rng(seed)
+    low, high = weight_range
+    coords = None
+
+    if topology == "tree":
+        sources, targets = _tree_edges(rng, n_nodes, m_edges)
+        weights = rng.integers(low, high + 1, len(sources))
+    elif topology == "grid":
+        sources, targets, coords = _grid_edges(n_nodes)
+        weights = rng.integers(low, high + 1, len(sources))
+    elif topology == "geometric":
+        sources, targets, coords, weights = _geometric_edges(rng, n_nodes, m_edges, low, high)
+    else:
+        sources, targets = _scale_free_edges(rng, n_nodes, m_edges)
+        weights = rng.integers(low, high + 1, len(sources))
+
+    graph = CompactGraph.from_edges(sources, targets, weights, n_vertices=n_nodes)
+    return GeneratedNetwork(graph, _assign_roles(rng, n_nodes, role_distribution), coords)
+
+# ------------------ Topologías ------------------
+
+def _tree_edges(rng, n, m):
+    # Cada nodo i > 0 se cuelga de un nodo anterior al azar: árbol conexo
+    tree_targets = np.arange(1, n, dtype=np.int64)
+    tree_sources = (rng.random(n - 1) * tree_targets).astype(np.int64)
+    keys = np.sort(tree_sources * n + tree_targets)
+    m = min(m, n * (n - 1) // 2)
+
+    # Extras por rondas: se sobremuestrea y se descartan lazos y repetidas
+    extras = np.empty(0, dtype=np.int64)
+    while len(keys) + len(extras) < m:
+        need = m - len(keys) - len(extras)
+        a = rng.integers(0, n, need + need // 4 + 16)
+        b = rng.integers(0, n, len(a))
+        cand = np.minimum(a, b) * n + np.maximum(a, b)
+        cand = cand[a != b]
+        # unique con return_index conserva el orden de muestreo (sin sesgo al recortar)
+        _, first = np.unique(cand, return_index=True)
+        cand = cand[np.sort(first)]
+        cand = cand[~np.isin(cand, keys) & ~np.isin(cand, extras)]
+        extras = np.concatenate([extras, cand[:need]])
+    keys = np.concatenate([keys, extras])
+    return keys // n, keys % n
+
+def _grid_edges(n):
+    cols = int(np.ceil(np.sqrt(n)))
+    ids = np.arange(n, dtype=np.int64)
+    right = ids[(ids % cols != cols - 1) & (ids + 1 < n)]
+    down = ids[ids + cols < n]
+    sources = np.concatenate([right, down])
+    targets = np.concatenate([right + 1, down + cols])
+    coords = np.column_stack([ids % cols, ids // cols]).astype(np.float64)
+    return sources, targets, coords
+
+def _geometric_edges(rng, n, m, low, high):
+    points = rng.random((n, 2))
+    if n == 1:
+        return np.empty(0, np.int64), np.empty(0, np.int64), points, np.empty(0)
+    # Radio tal que el número esperado de pares cercanos sea ~m
+    radius = min(np.sqrt(2 * m / (np.pi * n * (n - 1))), np.sqrt(2))
+
+    # Binning en celdas de lado radius: solo se comparan celdas vecinas
+    side = max(1, int(1 / radius))
+    cell_xy = np.minimum((points * side).astype(np.int64), side - 1)
+    cell = cell_xy[:, 0] * side + cell_xy[:, 1]
+    order = np.argsort(cell, kind="stable")
+    counts = np.bincount(cell, minlength=side * side)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+    sources, targets = [], []
+    for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):
+        nx, ny = cell_xy[:, 0] + dx, cell_xy[:, 1] + dy
+        valid = (nx >= 0) & (nx < side) & (ny >= 0) & (ny < side)
+        i = np.flatnonzero(valid)
+        other = nx[i] * side + ny[i]
+        reps = counts[other]
+        # Todos los puntos de la celda vecina, para cada punto i
+        left = np.repeat(i, reps)
+        pos = np.arange(reps.sum()) - np.repeat(np.cumsum(reps) - reps, reps)
+        right = order[np.repeat(starts[other], reps) + pos]
+        keep = left < right if (dx, dy) == (0, 0) else np.ones(len(left), dtype=bool)
+        left, right = left[keep], right[keep]
+        close = np.sum((points[left] - points[right]) ** 2, axis=1) <= radius * radius
+        sources.append(left[close])
+        targets.append(right[close])
+    sources = np.concatenate(sources)
+    targets = np.concatenate(targets)
+
+    # Cadena de conexión: las componentes sueltas se unen en orden de x
+    comp = _components(n, sources, targets)
+    roots = np.unique(comp)
+    if len(roots) > 1:
+        chain = roots[np.argsort(points[roots, 0], kind="stable")]
+        sources = np.concatenate([sources, chain[:-1]])
+        targets = np.concatenate([targets, chain[1:]])
+
+    dist = np.sqrt(np.sum((points[sources] - points[targets]) ** 2, axis=1))
+    # Proporcional a la distancia dentro del radio; las aristas de la cadena
+    # pueden ser más largas y se acotan a high
+    weights = np.clip(np.rint(low + (high - low) * dist / radius), low, high).astype(np.int64)
+    return sources, targets, points, weights
+
+def _scale_free_edges(rng, n, m):
+    if n == 1:
+        return np.empty(0, np.int64), np.empty(0, np.int64)
+    # Cada nodo nuevo i aporta per_node[i - 1] aristas hacia nodos anteriores
+    per_node = np.full(n - 1, max(1, m // (n - 1)), dtype=np.int64)
+    if m > n - 1:
+        per_node[:m % (n - 1)] += 1
+    sources = np.repeat(np.arange(1, n, dtype=np.int64), per_node)
+    first_edge = np.repeat(np.cumsum(per_node) - per_node, per_node)
+    total = len(sources)
+
+    # Enlace preferencial sin bucle secuencial: con prob. 1/2 destino uniforme
+    # entre los anteriores; si no, un extremo de una arista previa al azar (que
+    # elige nodos en proporción a su grado). "Copiar el destino" de la arista j
+    # es un puntero a targets[j]; se resuelven todos saltando punteros.
+    targets = (rng.random(total) * sources).astype(np.int64)
+    pointer = np.arange(total, dtype=np.int64)
+    copy = (rng.random(total) < 0.5) & (first_edge > 0)
+    j = (rng.random(total) * first_edge).astype(np.int64)[copy]
+    copy_idx = np.flatnonzero(copy)
+    take_source = rng.random(len(copy_idx)) < 0.5
+    targets[copy_idx[take_source]] = sources[j[take_source]]
+    pointer[copy_idx[~take_source]] = j[~take_source]
+    while True:
+        jumped = pointer[pointer]
+        if np.array_equal(jumped, pointer):
+            break
+        pointer = jumped
+    targets = targets[pointer]
+
+    keys = np.unique(sources * n + targets)
+    return keys // n, keys % n
+
+# ------------------ Auxiliares ------------------
+
+def _components(n, sources, targets):
+    """Componente (id del representante) de cada vértice: enganche + salto de punteros."""
+    comp = np.arange(n, dtype=np.int64)
+    while True:
+        cu, cv = comp[sources], comp[targets]
+        differ = cu != cv
+        if not differ.any():
+            return comp
+        cu, cv = cu[differ], cv[differ]
+        hi, lo = np.maximum(cu, cv), np.minimum(cu, cv)
+        np.minimum.at(comp, hi, lo)
+        while True:
+            jumped = comp[comp]
+            if np.array_equal(jumped, comp):
+                break
+            comp = jumped
+
+def _assign_roles(rng, n, role_distribution):
+    roles = np.full(n, "client", dtype=object)
+    start = 0
+    for role, share in role_distribution:
+        count = int(n * share)
+        roles[start:start + count] = role
+        start += count
+    return roles[rng.permutation(n)]
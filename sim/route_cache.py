@@ -0,0 +1,72 @@
+# sim/route_cache.py
+
+import threading
+import weakref
+from collections import OrderedDict
+
+class RouteCache:
+    """
+    Caché LRU acotada de resultados (path, cost).
+
+    La clave incluye graph.version(), así que cualquier insert/remove sobre el
+    grafo deja obsoletas sus entradas: nunca se sirve una ruta de una versión
+    anterior (las entradas viejas simplemente salen por LRU).
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(graph, start, goal, autonomy, recharge_nodes, engine=None):
+        return (id(graph), graph.version(), start, goal, autonomy, frozenset(recharge_nodes), engine)
+
+    def get(self, key, graph):
+        """Devuelve el resultado guardado o None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            # id(graph) puede reutilizarse tras liberar un grafo: se confirma con la weakref
+            if entry is None or entry[0]() is not graph:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            path, cost = entry[1]
+        return (list(path) if path is not None else None), cost
+
+    def put(self, key, graph, result):
+        path, cost = result
+        with self._lock:
+            self._entries[key] = (weakref.ref(graph), (list(path) if path is not None else None, cost))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, graph, start, goal, autonomy, recharge_nodes, compute, engine=None):
+        key = self.make_key(graph, start, goal, autonomy, recharge_nodes, engine)
+        result = self.get(key, graph)
+        if result is None:
+            result = compute()
+            self.put(key, graph, result)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
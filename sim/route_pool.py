@@ -0,0 +1,136 @@
+# sim/route_pool.py
+
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from sim.simulation import Simulation
+
+# Estado de cada proceso trabajador: la red se carga una sola vez en el
+# inicializador y queda "caliente" para todas las consultas siguientes.
+_worker = {}
+
+def save_network(path, graph, autonomy, recharge_nodes):
+    """Guarda lo que necesitan los trabajadores: grafo, autonomía y estaciones de recarga."""
+    # Escritura atómica: un trabajador que arranca justo ahora nunca lee un archivo a medias
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump({"graph": graph, "autonomy": autonomy, "recharge_nodes": list(recharge_nodes)}, f)
+    os.replace(tmp, path)
+
+def _init_worker(network_file):
+    with open(network_file, "rb") as f:
+        network = pickle.load(f)
+    graph = network["graph"]
+    _worker["graph"] = graph
+    _worker["autonomy"] = network["autonomy"]
+    _worker["recharge_nodes"] = network["recharge_nodes"]
+    _worker["labels"] = {str(v): v for v in graph.vertices()}
+
+def _route_chunk(chunk):
+    graph, labels = _worker["graph"], _worker["labels"]
+    results = []
+    for index, origin, destination, autonomy in chunk:
+        if autonomy is None:
+            autonomy = _worker["autonomy"]
+        u, v = labels.get(str(origin)), labels.get(str(destination))
+        path, cost = (None, None)
+        if u is not None and v is not None:
+            path, cost = Simulation.get_shortest_path(graph, u, v, autonomy, _worker["recharge_nodes"])
+        results.append({
+            "index": index,
+            "origin": origin,
+            "destination": destination,
+            "autonomy": autonomy,
+            "path": [str(x) for x in path] if path else None,
+            "cost": cost if path else None,
+        })
+    return results
+
+class RoutePool:
+    """
+    Pool de procesos para costear muchas rutas en paralelo.
+    Si el archivo de red cambia (nueva simulación) se crea un pool nuevo; el
+    anterior se cierra recién cuando terminan los pedidos que lo están usando
+    (los endpoints sync corren en varios hilos a la vez).
+    """
+
+    def __init__(self, network_file, workers=None, chunk_size=64):
+        self._network_file = os.path.abspath(network_file)
+        self._workers = workers
+        self._chunk_size = chunk_size
+        self._executor = None
+        self._mtime = None
+        self._lock = threading.Lock()
+        self._users = {}            # pool -> pedidos en curso
+        self._retired = set()       # pools reemplazados que esperan a sus pedidos
+
+    def ready(self):
+        return os.path.exists(self._network_file)
+
+    def _acquire(self):
+        """El pool vigente, contado como en uso hasta _release()."""
+        with self._lock:
+            mtime = os.path.getmtime(self._network_file)
+            if self._executor is None or mtime != self._mtime:
+                if self._executor is not None:
+                    self._retire(self._executor)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    initializer=_init_worker,
+                    initargs=(self._network_file,),
+                )
+                self._mtime = mtime
+            executor = self._executor
+            self._users[executor] = self._users.get(executor, 0) + 1
+            return executor
+
+    def _release(self, executor):
+        with self._lock:
+            self._users[executor] -= 1
+            if self._users[executor] == 0:
+                del self._users[executor]
+                if executor in self._retired:
+                    self._retired.discard(executor)
+                    executor.shutdown(wait=False)
+
+    def _retire(self, executor):
+        # Con el lock tomado: se cierra ahora si nadie lo usa, si no al último _release
+        if self._users.get(executor):
+            self._retired.add(executor)
+        else:
+            executor.shutdown(wait=False)
+
+    def route_many(self, pairs):
+        """
+        pairs: iterable de (origin, destination, autonomy) con etiquetas str
+        (autonomy None = la de la simulación). Genera dicts a medida que
+        terminan los bloques; cada uno trae "index" con su posición en la entrada.
+        """
+        executor = self._acquire()
+        try:
+            chunk, futures = [], []
+            for index, (origin, destination, autonomy) in enumerate(pairs):
+                chunk.append((index, origin, destination, autonomy))
+                if len(chunk) == self._chunk_size:
+                    futures.append(executor.submit(_route_chunk, chunk))
+                    chunk = []
+            if chunk:
+                futures.append(executor.submit(_route_chunk, chunk))
+            for future in as_completed(futures):
+                yield from future.result()
+        finally:
+            self._release(executor)
+
+    def shutdown(self):
+        """Cierra todos los pools (al apagar la API), cancelando lo pendiente."""
+        with self._lock:
+            executors = set(self._users) | self._retired
+            if self._executor is not None:
+                executors.add(self._executor)
+            self._executor = None
+            self._users.clear()
+            self._retired.clear()
+        for executor in executors:
+            executor.shutdown(cancel_futures=True)
@@ -0,0 +1,89 @@
+# sim/route_table.py
+
+from sim.dijkstra import dijkstra_with_recharge_all
+from sim.label_setting import label_setting_with_recharge_all
+from sim.simulation import Simulation
+
+# engine -> búsqueda de un origen a muchos destinos
+_ENGINES = {
+    "labels": label_setting_with_recharge_all,
+    "legacy": dijkstra_with_recharge_all,
+}
+
+class RouteTable:
+    """
+    Tabla precalculada de rutas almacén → cliente.
+
+    Por cada nodo de almacenamiento se hace UNA búsqueda con recarga hacia todos
+    los clientes (de forma perezosa, la primera vez que se consulta ese origen),
+    y después cada consulta (origen, destino) es una búsqueda en un dict.
+    La tabla se descarta solo si cambia el grafo (otro objeto o una nueva
+    versión), la autonomía o el conjunto de estaciones de recarga (ver refresh).
+    Los pares fuera de la tabla pasan por Simulation.get_shortest_path, así
+    que repetirlos sale de Simulation.route_cache.
+    """
+
+    def __init__(self, graph, storage_nodes, client_nodes, autonomy, recharge_nodes, engine="labels"):
+        self._engine = engine
+        self._search_all = _ENGINES[engine]
+        self._storage_nodes = list(storage_nodes)
+        self._client_nodes = list(client_nodes)
+        self._storage_set = set(self._storage_nodes)
+        self._client_set = set(self._client_nodes)
+        self._labels = {str(v): v for v in self._storage_nodes + self._client_nodes}
+        self._bind(graph, autonomy, recharge_nodes)
+
+    def _bind(self, graph, autonomy, recharge_nodes):
+        self._graph = graph
+        self._autonomy = autonomy
+        self._recharge_nodes = list(recharge_nodes)
+        self._signature = self._make_signature(graph, autonomy, recharge_nodes)
+        self._tables = {}
+
+    @staticmethod
+    def _make_signature(graph, autonomy, recharge_nodes):
+        return (id(graph), graph.version(), autonomy, frozenset(recharge_nodes))
+
+    def is_stale(self, graph, autonomy, recharge_nodes):
+        return self._signature != self._make_signature(graph, autonomy, recharge_nodes)
+
+    def refresh(self, graph, autonomy, recharge_nodes):
+        """Reconstruye la tabla solo si cambió alguno de sus parámetros. Devuelve True si se descartó."""
+        if not self.is_stale(graph, autonomy, recharge_nodes):
+            return False
+        self._bind(graph, autonomy, recharge_nodes)
+        return True
+
+    def invalidate(self):
+        self._tables = {}
+
+    def _table_for(self, origin):
+        table = self._tables.get(origin)
+        if table is None:
+            table = self._search_all(
+                self._graph, origin, self._autonomy, self._recharge_nodes, targets=self._client_nodes
+            )
+            self._tables[origin] = table
+        return table
+
+    def build(self):
+        """Calcula de inmediato las tablas de todos los almacenes."""
+        for origin in self._storage_nodes:
+            self._table_for(origin)
+        return self
+
+    def lookup(self, origin, destination):
+        """Devuelve (path, cost) igual que Simulation.get_shortest_path."""
+        if origin in self._storage_set and destination in self._client_set:
+            return self._table_for(origin).get(destination, (None, float('inf')))
+        # Par fuera de la tabla (p.ej. origen que no es almacén): búsqueda puntual con caché
+        return Simulation.get_shortest_path(self._graph, origin, destination, self._autonomy,
+                                            self._recharge_nodes, engine=self._engine)
+
+    def lookup_labels(self, origin, destination):
+        """Igual que lookup, pero con las etiquetas str de los nodos (para la API)."""
+        u = self._labels.get(str(origin))
+        v = self._labels.get(str(destination))
+        if u is None or v is None:
+            return None, float('inf')
+        return self.lookup(u, v)
@@ -1,15 +1,44 @@
 from collections import deque
 from domain.route import Route
 from sim.kruskal import kruskal_mst
-from sim.dijkstra import dijkstra_with_recharge
+from sim.dijkstra import dijkstra_shortest_path, dijkstra_with_recharge
+from sim.label_setting import label_setting_with_recharge
+from sim.route_cache import RouteCache
+from sim.utils import to_internal, to_external
+
+# Motores disponibles para rutas con recarga
+RECHARGE_ENGINES = {
+    "labels": label_setting_with_recharge,
+    "legacy": dijkstra_with_recharge,
+}
 
 class Simulation:
+    # Motor por defecto; "legacy" usa la búsqueda original para comparar
+    recharge_engine = "labels"
+    # Resultados de get_shortest_path por (grafo, versión, origen, destino, autonomía, recargas)
+    route_cache = RouteCache(maxsize=1024)
+
+    @staticmethod
+    def get_shortest_path(graph, start, end, autonomy, recharge_nodes, engine=None):
+        engine = engine or Simulation.recharge_engine
+        search = RECHARGE_ENGINES[engine]
+        return Simulation.route_cache.get_or_compute(
+            graph, start, end, autonomy, recharge_nodes,
+            lambda: search(graph, start, end, autonomy, recharge_nodes),
+            engine=engine,
+        )
+
     @staticmethod
-    def get_shortest_path(graph, start, end, autonomy, recharge_nodes):
-        return dijkstra_with_recharge(graph, start, end, autonomy, recharge_nodes)
+    def shortest_path(graph, start, end, hierarchy=None):
+        """Camino más corto sin restricción de batería; usa la Contraction Hierarchy si se entrega."""
+        if hierarchy is not None:
+            return hierarchy.shortest_path(start, end)
+        return dijkstra_shortest_path(graph, start, end)
 
     @staticmethod
     def bfs_shortest_path(graph, start, goal, autonomy_limit, recharge_nodes):
+        recharge_nodes = {to_internal(graph, v) for v in recharge_nodes}
+        start, goal = to_internal(graph, start), to_internal(graph, goal)
         queue = deque()
         queue.append((start, [start], 0))
         visited = set()
@@ -17,13 +46,11 @@ class Simulation:
         while queue:
             current, path, cost = queue.popleft()
             if current == goal and cost <= autonomy_limit:
-                return Route(path, cost)
+                return Route(to_external(graph, path), cost)
 
             visited.add(current)
 
-            for neighbor in graph.neighbors(current):
-                edge = graph.get_edge(current, neighbor)
-                edge_weight = edge.element()
+            for neighbor, edge_weight in graph.weighted_neighbors(current):
                 new_cost = cost + edge_weight
 
                 if new_cost > autonomy_limit and current not in recharge_nodes:
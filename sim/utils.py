@@ -1,3 +1,18 @@
+from model.compact_graph import CompactGraph
+
+
+def to_internal(graph, v):
+    """Traduce un Vertex a la clave que usa el grafo internamente (id entero en CompactGraph)."""
+    return graph.vertex_id(v) if isinstance(graph, CompactGraph) else v
+
+
+def to_external(graph, path):
+    """Traduce un camino de claves internas a objetos Vertex."""
+    if path is None or not isinstance(graph, CompactGraph):
+        return path
+    return [graph.vertex(i) for i in path]
+
+
 def safe_str(text):
     """Convierte a str y reemplaza símbolos unicode y tildes para compatibilidad con FPDF clásico."""
     if not isinstance(text, str):
@@ -0,0 +1,161 @@
+# sim/visit_counter.py
+
+import numpy as np
+
+class VisitCounter:
+    """
+    Visitas por nodo en un arreglo NumPy indexado por id entero de vértice.
+
+    Los ids (y sus etiquetas) los da vertices, un objeto con vertex_id(label),
+    label(id) y vertex_count(): normalmente el PathTrie de las rutas, así los
+    caminos internados (trie.path(rid)) se cuentan sin pasar por etiquetas.
+
+    Un lote de rutas es un solo increment_many(ids concatenados) (np.bincount).
+    Para el código que usaba node_visits como Map, también se puede leer por
+    etiqueta: get, [], in, items() (solo nodos con visitas).
+    """
+
+    def __init__(self, vertices, counts=None):
+        self.vertices = vertices
+        self._counts = np.zeros(max(vertices.vertex_count(), 8), dtype=np.int64)
+        if counts is not None:
+            counts = np.asarray(counts, dtype=np.int64)
+            self._grow(len(counts))
+            self._counts[:len(counts)] = counts
+        self._roles = None          # id -> código de rol (-1 sin rol)
+        self._role_names = []
+
+    def _grow(self, n):
+        if n > len(self._counts):
+            counts = np.zeros(max(n, 2 * len(self._counts)), dtype=np.int64)
+            counts[:len(self._counts)] = self._counts
+            self._counts = counts
+
+    def _n(self):
+        return self.vertices.vertex_count()
+
+    # ------------------ Conteo ------------------
+
+    def increment_many(self, ids, weights=None):
+        """Suma una visita (o weights) por cada id; ids puede repetir valores."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(ids):
+            return
+        n = max(self._n(), int(ids.max()) + 1)
+        self._grow(n)
+        self._counts[:n] += np.bincount(ids, weights=weights, minlength=n).astype(np.int64)
+
+    def increment(self, label, by=1):
+        vid = self.vertices.vertex_id(label)
+        self._grow(vid + 1)
+        self._counts[vid] += by
+
+    def increment_path(self, labels):
+        self.increment_many([self.vertices.vertex_id(label) for label in labels])
+
+    def merge(self, other):
+        """Suma las visitas de otro contador (con los mismos ids o, si no, por etiqueta)."""
+        theirs = other.counts()
+        if other.vertices is self.vertices:
+            self._grow(len(theirs))
+            self._counts[:len(theirs)] += theirs
+        else:
+            ids = np.array([self.vertices.vertex_id(other.vertices.label(i)) for i in range(len(theirs))],
+                           dtype=np.int64)
+            self.increment_many(ids, weights=theirs)
+        return self
+
+    # ------------------ Consultas ------------------
+
+    def counts(self):
+        """Vista de solo lectura (sin copia) de las visitas por id."""
+        n = self._n()
+        self._grow(n)
+        view = self._counts[:n]
+        view.flags.writeable = False
+        return view
+
+    def count(self, vid):
+        return int(self._counts[vid]) if vid < len(self._counts) else 0
+
+    def total(self):
+        return int(self._counts.sum())
+
+    def top_k(self, k):
+        """[(etiqueta, visitas)] de los k nodos más visitados (empates por id), sin ordenar todo."""
+        counts = self.counts()
+        k = min(k, int(np.count_nonzero(counts)))
+        if k <= 0:
+            return []
+        ids = np.argpartition(-counts, k - 1)[:k] if k < len(counts) else np.arange(len(counts))
+        ids = ids[np.lexsort((ids, -counts[ids]))]
+        return [(self.vertices.label(i), int(counts[i])) for i in ids.tolist()]
+
+    def set_roles(self, node_roles):
+        """Rol de cada nodo ({etiqueta: rol}) para las sumas por rol."""
+        self._role_names = sorted(set(node_roles.values()))
+        codes = {role: i for i, role in enumerate(self._role_names)}
+        ids = [self.vertices.vertex_id(label) for label in node_roles]
+        self._grow(self._n())
+        self._roles = np.full(len(self._counts), -1, dtype=np.int64)
+        self._roles[ids] = [codes[role] for role in node_roles.values()]
+
+    def role_sums(self):
+        """{rol: visitas sumadas} con un solo np.bincount."""
+        if self._roles is None:
+            return {}
+        counts = self.counts()
+        n = len(counts)
+        roles = self._roles[:n] if len(self._roles) >= n else np.concatenate(
+            (self._roles, np.full(n - len(self._roles), -1, dtype=np.int64)))
+        mask = roles >= 0
+        sums = np.bincount(roles[mask], weights=counts[mask], minlength=len(self._role_names))
+        return {role: int(total) for role, total in zip(self._role_names, sums)}
+
+    # ------------------ Interfaz tipo Map (por etiqueta) ------------------
+
+    def _id_of(self, label):
+        # Sin internar: consultar una etiqueta desconocida no la agrega
+        vid = self.vertices.find_vertex(label)
+        return -1 if vid is None or vid >= len(self._counts) else vid
+
+    def get(self, label, default=None):
+        vid = self._id_of(label)
+        if vid < 0 or not self._counts[vid]:
+            return default
+        return int(self._counts[vid])
+
+    def __getitem__(self, label):
+        value = self.get(label)
+        if value is None:
+            raise KeyError(f"Key {label} not found")
+        return value
+
+    def __setitem__(self, label, value):
+        vid = self.vertices.vertex_id(label)
+        self._grow(vid + 1)
+        self._counts[vid] = value
+
+    def __contains__(self, label):
+        return self.get(label) is not None
+
+    def __len__(self):
+        return int(np.count_nonzero(self.counts()))
+
+    def items(self):
+        counts = self.counts()
+        for vid in np.flatnonzero(counts).tolist():
+            yield self.vertices.label(vid), int(counts[vid])
+
+    def __iter__(self):
+        return (label for label, _ in self.items())
+
+    # El arreglo se guarda recortado a los ids usados
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_counts"] = self.counts().copy()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._counts = np.array(self._counts, dtype=np.int64)
@@ -0,0 +1,70 @@
+# sim/visit_stats.py
+
+from tda.ranked_counter import RankedCounter
+
+class VisitStats:
+    """
+    Visitas por nodo con rankings que se mantienen al registrar cada ruta.
+
+    Cada visita actualiza el ranking general, el ranking del rol del nodo y el
+    total de ese rol, así que top(rol, k) cuesta O(k) sin recorrer ni ordenar
+    todos los nodos. Los nodos se identifican por su etiqueta (str).
+    """
+
+    def __init__(self, node_roles=None):
+        self._role_of = {str(label): role for label, role in (node_roles or {}).items()}
+        self._overall = RankedCounter()
+        self._by_role = {}          # rol -> RankedCounter
+        self._totals = {}           # rol -> visitas sumadas
+
+    @classmethod
+    def from_visits(cls, node_visits, node_roles=None):
+        """Arma los rankings desde un {etiqueta: visitas} ya existente (un solo ordenamiento)."""
+        stats = cls(node_roles)
+        stats.reload(node_visits)
+        return stats
+
+    def reload(self, node_visits):
+        """Rehace los rankings desde node_visits (p. ej. tras sumar un lote grande de rutas)."""
+        counts = {str(label): count for label, count in node_visits.items() if count}
+        per_role = {}
+        self._totals = {}
+        for label, count in counts.items():
+            role = self._role_of.get(label)
+            if role is not None:
+                per_role.setdefault(role, {})[label] = count
+                self._totals[role] = self._totals.get(role, 0) + count
+        self._overall = RankedCounter(counts)
+        self._by_role = {role: RankedCounter(c) for role, c in per_role.items()}
+
+    def increment(self, label, by=1):
+        label = str(label)
+        self._overall.increment(label, by)
+        role = self._role_of.get(label)
+        if role is not None:
+            counter = self._by_role.get(role)
+            if counter is None:
+                counter = self._by_role[role] = RankedCounter()
+            counter.increment(label, by)
+            self._totals[role] = self._totals.get(role, 0) + by
+
+    def record_path(self, labels):
+        """Una visita a cada nodo de una ruta."""
+        for label in labels:
+            self.increment(label)
+
+    def top(self, role=None, k=None):
+        """[(etiqueta, visitas)] de más a menos visitado, del rol dado (o de todos)."""
+        counter = self._overall if role is None else self._by_role.get(role)
+        if counter is None:
+            return []
+        return list(counter.top_k(k))
+
+    def count(self, label):
+        return self._overall.get(str(label))
+
+    def role_total(self, role):
+        return self._totals.get(role, 0)
+
+    def role(self, label):
+        return self._role_of.get(str(label))
@@ -1,34 +1,157 @@
+import heapq
+from collections.abc import Mapping
+
+
 class Node:
-    def __init__(self, key):
+    __slots__ = 'key', 'left', 'right', 'height', 'freq', 'size', 'max_freq'
+
+    def __init__(self, key, freq=1):
         self.key = key
         self.left = None
         self.right = None
-        self.height = 0
+        self.height = 1
+        self.freq = freq
+        self.size = 1           # nodes in this subtree
+        self.max_freq = freq    # largest freq in this subtree
+
+    def __getstate__(self):
+        return (self.key, self.left, self.right, self.height, self.freq, self.size, self.max_freq)
+
+    def __setstate__(self, state):
+        if isinstance(state, dict):
+            # Node pickled before __slots__; AVL.__setstate__ fixes any missing aggregates
+            state = (state["key"], state.get("left"), state.get("right"), state.get("height", 1),
+                     state.get("freq", 0), state.get("size", 1), state.get("max_freq", 0))
+        (self.key, self.left, self.right, self.height,
+         self.freq, self.size, self.max_freq) = state
+
+
+class _FreqView(Mapping):
+    """Read-only {key: freq} view over the tree (kept for code that used AVL.freqs)."""
+
+    def __init__(self, tree):
+        self._tree = tree
+
+    def __getitem__(self, key):
+        node = self._tree._find(key)
+        if node is None:
+            raise KeyError(key)
+        return node.freq
+
+    def __iter__(self):
+        return (key for key, _ in self._tree.items())
+
+    def __len__(self):
+        return len(self._tree)
+
 
 class AVL:
+    """
+    AVL tree of keys with an insertion count (freq) stored on each node.
+
+    Nodes are augmented with their subtree size and subtree max freq, which
+    gives rank/select in O(log n), ordered range queries, and top_k(k) by
+    frequency in O(k log n) without visiting the whole tree.
+
+    Route keys are PathTrie route ids, not strings, so "routes starting at a
+    node" is answered by the trie: PathTrie.with_prefix(labels) gives the
+    ids, and get_freq(rid) their counts (see api.main.routes_with_prefix).
+
+    Trees can be bulk-built from sorted (key, freq) pairs in O(n), joined and
+    split in O(log n), and merged (summing freqs). Insertion and traversal are
+    iterative; the tree pickles as two flat lists and is rebuilt in O(n).
+    """
+
     def __init__(self):
         self.root = None
-        self.freqs = {}
 
-    def insert(self, key):
-        self.root = self._insert(self.root, key)
-        self.freqs[key] = self.freqs.get(key, 0) + 1
+    @classmethod
+    def from_sorted(cls, items):
+        """Builds a balanced tree from (key, freq) pairs in strictly increasing key order, in O(n)."""
+        items = list(items)
+        if not all(a[0] < b[0] for a, b in zip(items, items[1:])):
+            raise ValueError("from_sorted requires strictly increasing keys")
+        tree = cls()
+        tree.root = tree._build(items, 0, len(items))
+        return tree
 
-    def _insert(self, node, key):
-        if node is None:
-            return Node(key)
-        if key < node.key:
-            node.left = self._insert(node.left, key)
-        elif key > node.key:
-            node.right = self._insert(node.right, key)
-        else:
-            return node
-        node.height = 1 + max(self._height(node.left), self._height(node.right))
-        return self._rebalance(node)
+    def _build(self, items, lo, hi):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        key, freq = items[mid]
+        node = Node(key, freq)
+        if lo < mid:
+            # Aggregates inline (this runs once per key on every load)
+            left = node.left = self._build(items, lo, mid)
+            node.height = left.height + 1
+            node.size += left.size
+            if left.max_freq > node.max_freq:
+                node.max_freq = left.max_freq
+        if mid + 1 < hi:
+            # The right half is never longer than the left one: the height is already right
+            right = node.right = self._build(items, mid + 1, hi)
+            node.size += right.size
+            if right.max_freq > node.max_freq:
+                node.max_freq = right.max_freq
+        return node
+
+    @property
+    def freqs(self):
+        return _FreqView(self)
+
+    def __len__(self):
+        return self._size(self.root)
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def insert(self, key, count=1):
+        """Adds key (or count more occurrences of it); a single descent updates freq and aggregates."""
+        path = []
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                path.append((node, True))
+                node = node.left
+            elif key > node.key:
+                path.append((node, False))
+                node = node.right
+            else:
+                node.freq += count
+                if node.freq > node.max_freq:
+                    node.max_freq = node.freq
+                # Only max_freq can change above, and only while it is smaller
+                for parent, _ in reversed(path):
+                    if parent.max_freq >= node.freq:
+                        break
+                    parent.max_freq = node.freq
+                return
+        child = Node(key, count)
+        while path:
+            parent, went_left = path.pop()
+            if went_left:
+                parent.left = child
+            else:
+                parent.right = child
+            self._update(parent)
+            child = self._rebalance(parent)
+        self.root = child
 
     def _height(self, n):
         return n.height if n else 0
 
+    def _size(self, n):
+        return n.size if n else 0
+
+    def _max_freq(self, n):
+        return n.max_freq if n else 0
+
+    def _update(self, n):
+        n.height = 1 + max(self._height(n.left), self._height(n.right))
+        n.size = 1 + self._size(n.left) + self._size(n.right)
+        n.max_freq = max(n.freq, self._max_freq(n.left), self._max_freq(n.right))
+
     def _get_balance(self, n):
         return self._height(n.left) - self._height(n.right) if n else 0
 
@@ -49,8 +172,8 @@ class AVL:
         T2 = y.left
         y.left = x
         x.right = T2
-        x.height = 1 + max(self._height(x.left), self._height(x.right))
-        y.height = 1 + max(self._height(y.left), self._height(y.right))
+        self._update(x)
+        self._update(y)
         return y
 
     def _right_rotate(self, y):
@@ -58,19 +181,241 @@ class AVL:
         T2 = x.right
         x.right = y
         y.left = T2
-        y.height = 1 + max(self._height(y.left), self._height(y.right))
-        x.height = 1 + max(self._height(x.left), self._height(x.right))
+        self._update(y)
+        self._update(x)
         return x
 
+    def _find(self, key):
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return node
+        return None
+
+    # ------------------ Queries ------------------
+
     def in_order(self):
+        return list(self.items())
+
+    def __iter__(self):
+        return (key for key, _ in self.items())
+
+    def items(self, lo=None, hi=None):
+        """Lazily yields (key, freq) with lo <= key < hi in key order (None = unbounded)."""
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            if node is not None:
+                if lo is not None and node.key < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            else:
+                node = stack.pop()
+                if hi is not None and not node.key < hi:
+                    return
+                yield node.key, node.freq
+                node = node.right
+
+    def get_freq(self, key):
+        node = self._find(key)
+        return node.freq if node else 0
+
+    def rank(self, key):
+        """Number of keys strictly smaller than key."""
+        rank = 0
+        node = self.root
+        while node is not None:
+            if key <= node.key:
+                node = node.left
+            else:
+                rank += self._size(node.left) + 1
+                node = node.right
+        return rank
+
+    def select(self, i):
+        """(key, freq) of the i-th smallest key (0-based)."""
+        if not 0 <= i < len(self):
+            raise IndexError("AVL index out of range")
+        node = self.root
+        while True:
+            left = self._size(node.left)
+            if i < left:
+                node = node.left
+            elif i == left:
+                return node.key, node.freq
+            else:
+                i -= left + 1
+                node = node.right
+
+    def range(self, lo=None, hi=None):
+        """(key, freq) with lo <= key < hi in key order (None = unbounded), as a list."""
+        return list(self.items(lo, hi))
+
+    def top_k(self, k):
+        """
+        The k most frequent (key, freq), highest first; ties in key order.
+
+        Best-first search over subtrees ordered by (max_freq, lower bound on
+        their keys): each result pops O(log n) entries from the heap.
+        """
+        if self.root is None or k <= 0:
+            return []
+        lowest = self.root
+        while lowest.left is not None:
+            lowest = lowest.left
+        seq = 0
+        # (-freq, key bound, 0 = single node / 1 = subtree, tiebreak, node)
+        heap = [(-self.root.max_freq, lowest.key, 1, seq, self.root)]
         result = []
-        def _in_order(n):
-            if n:
-                _in_order(n.left)
-                result.append((n.key, self.freqs.get(n.key, 0)))
-                _in_order(n.right)
-        _in_order(self.root)
+        while heap and len(result) < k:
+            neg, bound, subtree, _, node = heapq.heappop(heap)
+            if not subtree:
+                result.append((node.key, node.freq))
+                continue
+            heapq.heappush(heap, (-node.freq, node.key, 0, seq + 1, node))
+            if node.left is not None:
+                heapq.heappush(heap, (-node.left.max_freq, bound, 1, seq + 2, node.left))
+            if node.right is not None:
+                heapq.heappush(heap, (-node.right.max_freq, node.key, 1, seq + 3, node.right))
+            seq += 3
         return result
 
-    def get_freq(self, key):
-        return self.freqs.get(key, 0)
+    # ------------------ Join / split / merge ------------------
+
+    def _join(self, left, mid, right):
+        """Tree with left's keys, then mid, then right's keys; O(|height difference|)."""
+        hl, hr = self._height(left), self._height(right)
+        if hl > hr + 1:
+            left.right = self._join(left.right, mid, right)
+            self._update(left)
+            return self._rebalance(left)
+        if hr > hl + 1:
+            right.left = self._join(left, mid, right.left)
+            self._update(right)
+            return self._rebalance(right)
+        mid.left, mid.right = left, right
+        self._update(mid)
+        return mid
+
+    def _split(self, node, key):
+        """(keys < key, node with key or None, keys > key) of a subtree, in O(log n)."""
+        if node is None:
+            return None, None, None
+        left, right = node.left, node.right
+        if key < node.key:
+            l, hit, r = self._split(left, key)
+            return l, hit, self._join(r, node, right)
+        if node.key < key:
+            l, hit, r = self._split(right, key)
+            return self._join(left, node, l), hit, r
+        node.left = node.right = None
+        self._update(node)
+        return left, node, right
+
+    def _pop_min(self, node):
+        """(subtree without its smallest node, that node)."""
+        if node.left is None:
+            right = node.right
+            node.right = None
+            self._update(node)
+            return right, node
+        node.left, smallest = self._pop_min(node.left)
+        self._update(node)
+        return self._rebalance(node), smallest
+
+    def join(self, other):
+        """
+        Appends other, whose keys must all be greater than this tree's, in
+        O(log n). other is left empty.
+        """
+        if other.root is None:
+            return self
+        if self.root is not None:
+            last = self.root
+            while last.right is not None:
+                last = last.right
+            first = other.root
+            while first.left is not None:
+                first = first.left
+            if not last.key < first.key:
+                raise ValueError("join requires every key of other to be greater")
+            rest, mid = self._pop_min(other.root)
+            self.root = self._join(self.root, mid, rest)
+        else:
+            self.root = other.root
+        other.root = None
+        return self
+
+    def split(self, key):
+        """
+        Splits into (keys < key, keys >= key) as two new trees in O(log n).
+        This tree is left empty.
+        """
+        left, hit, right = self._split(self.root, key)
+        if hit is not None:
+            right = self._join(None, hit, right)
+        self.root = None
+        low, high = AVL(), AVL()
+        low.root, high.root = left, right
+        return low, high
+
+    def merge(self, other):
+        """
+        Adds every key of other into this tree, summing freqs. Works by
+        splitting this tree around other's nodes (O(m log(n/m + 1)) for m <= n
+        keys in other); other is copied first and stays unchanged.
+        """
+        self.root = self._union(self.root, self._copy(other.root))
+        return self
+
+    def _union(self, a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        l, hit, r = self._split(a, b.key)
+        left = self._union(l, b.left)
+        right = self._union(r, b.right)
+        if hit is not None:
+            b.freq += hit.freq
+        return self._join(left, b, right)
+
+    def _copy(self, node):
+        if node is None:
+            return None
+        copy = Node(node.key, node.freq)
+        copy.left = self._copy(node.left)
+        copy.right = self._copy(node.right)
+        self._update(copy)
+        return copy
+
+    # ------------------ Pickle ------------------
+
+    def __getstate__(self):
+        # Flat lists instead of the node graph: smaller, and rebuilt in O(n)
+        items = self.in_order()
+        return {"keys": [key for key, _ in items], "freqs": [freq for _, freq in items]}
+
+    def __setstate__(self, state):
+        if "keys" in state:
+            self.root = self._build(list(zip(state["keys"], state["freqs"])), 0, len(state["keys"]))
+            return
+        freqs = state.pop("freqs", None)
+        self.__dict__.update(state)
+        if freqs is not None or self.root is not None:
+            # Older pickles: node graph, and before that freqs in a side dict
+            # with nodes lacking freq/size/max_freq
+            def upgrade(n):
+                if n:
+                    upgrade(n.left)
+                    upgrade(n.right)
+                    if freqs is not None:
+                        n.freq = freqs.get(n.key, 0)
+                    self._update(n)
+            upgrade(self.root)
@@ -1,65 +1,133 @@
+_EMPTY = object()     # slot never used: ends a probe sequence
+_DELETED = object()   # tombstone: slot freed by a deletion, probing continues past it
+
+
 class Map:
+    """
+    Hash map with open addressing and linear probing.
+
+    Entries live in three parallel lists (keys, values, hashes) whose size is
+    a power of two. Deleted slots become tombstones so probe sequences stay
+    intact; tombstones are dropped whenever the table is rebuilt. The table
+    grows when used slots (live + tombstones) pass 2/3 of the capacity and
+    shrinks when live entries fall below 20%, always in a single pass that
+    places every entry directly in the new lists.
+    """
+
+    _MIN_CAPACITY = 8
+
     def __init__(self, capacity=8):
+        self._allocate(self._round_capacity(capacity))
+
+    @classmethod
+    def from_items(cls, items):
+        """Build a map from (key, value) pairs, sizing the table once."""
+        items = list(items)
+        m = cls(len(items) * 3 // 2 + 1)
+        for key, value in items:
+            m[key] = value
+        return m
+
+    def _round_capacity(self, n):
+        capacity = self._MIN_CAPACITY
+        while capacity < n:
+            capacity *= 2
+        return capacity
+
+    def _allocate(self, capacity):
         self._capacity = capacity
-        self._table = [[] for _ in range(self._capacity)]  # Bucket array
-        self._n = 0  # Number of items
+        self._mask = capacity - 1
+        self._keys = [_EMPTY] * capacity
+        self._values = [None] * capacity
+        self._hashes = [0] * capacity
+        self._n = 0         # live entries
+        self._used = 0      # live entries + tombstones
+
+    def _find(self, key, h):
+        """Index of key, or -1 (never raises)."""
+        keys, hashes, mask = self._keys, self._hashes, self._mask
+        i = h & mask
+        while True:
+            k = keys[i]
+            if k is _EMPTY:
+                return -1
+            if k is not _DELETED and hashes[i] == h and (k is key or k == key):
+                return i
+            i = (i + 1) & mask
+
+    def _insert(self, key, value, h):
+        """Set key; returns the slot used. May grow the table first."""
+        keys, hashes, mask = self._keys, self._hashes, self._mask
+        i = h & mask
+        tombstone = -1
+        while True:
+            k = keys[i]
+            if k is _EMPTY:
+                break
+            if k is _DELETED:
+                if tombstone < 0:
+                    tombstone = i
+            elif hashes[i] == h and (k is key or k == key):
+                self._values[i] = value
+                return i
+            i = (i + 1) & mask
+        if tombstone >= 0:
+            i = tombstone       # reuse: the used count does not change
+        else:
+            if (self._used + 1) * 3 > self._capacity * 2:
+                self._resize(self._round_capacity((self._n + 1) * 2))
+                return self._insert(key, value, h)
+            self._used += 1
+        keys[i] = key
+        self._values[i] = value
+        hashes[i] = h
+        self._n += 1
+        return i
 
-    def _hash(self, key):
-        """Compute the index for a key using hash() and compression."""
-        return hash(key) % self._capacity
+    def _resize(self, new_capacity):
+        """Rebuild the table in a single pass (no equality checks, tombstones dropped)."""
+        old = zip(self._keys, self._values, self._hashes)
+        n = self._n
+        self._allocate(new_capacity)
+        keys, values, hashes, mask = self._keys, self._values, self._hashes, self._mask
+        for k, v, h in old:
+            if k is _EMPTY or k is _DELETED:
+                continue
+            i = h & mask
+            while keys[i] is not _EMPTY:
+                i = (i + 1) & mask
+            keys[i] = k
+            values[i] = v
+            hashes[i] = h
+        self._n = self._used = n
 
     def __setitem__(self, key, value):
         """Insert or update a key-value pair."""
-        bucket_index = self._hash(key)
-        bucket = self._table[bucket_index]
-        
-        for i, (k, v) in enumerate(bucket):
-            if k == key:
-                bucket[i] = (key, value)  # Update if exists
-                return
-        
-        bucket.append((key, value))
-        self._n += 1
-        
-        # Resize if load factor > 70%
-        if self._n > self._capacity * 0.7:
-            self._resize(2 * self._capacity)
+        self._insert(key, value, hash(key))
 
     def __getitem__(self, key):
         """Get the value associated with a key."""
-        bucket_index = self._hash(key)
-        for k, v in self._table[bucket_index]:
-            if k == key:
-                return v
-        raise KeyError(f"Key {key} not found")
+        i = self._find(key, hash(key))
+        if i < 0:
+            raise KeyError(f"Key {key} not found")
+        return self._values[i]
+
+    def _remove_at(self, i):
+        value = self._values[i]
+        self._keys[i] = _DELETED
+        self._values[i] = None
+        self._n -= 1
+        # Resize if load factor < 20%
+        if self._capacity > self._MIN_CAPACITY and self._n < self._capacity * 0.2:
+            self._resize(self._capacity // 2)
+        return value
 
     def __delitem__(self, key):
         """Delete an item by key."""
-        bucket_index = self._hash(key)
-        bucket = self._table[bucket_index]
-        
-        for i, (k, v) in enumerate(bucket):
-            if k == key:
-                del bucket[i]
-                self._n -= 1
-                
-                # Resize if load factor < 20%
-                if self._capacity > 8 and self._n < self._capacity * 0.2:
-                    self._resize(self._capacity // 2)
-                return
-        
-        raise KeyError(f"Key {key} not found")
-
-    def _resize(self, new_capacity):
-        """Resize the hash table."""
-        old_table = self._table
-        self._capacity = new_capacity
-        self._table = [[] for _ in range(new_capacity)]
-        self._n = 0
-        
-        for bucket in old_table:
-            for key, value in bucket:
-                self[key] = value  # Reinsert
+        i = self._find(key, hash(key))
+        if i < 0:
+            raise KeyError(f"Key {key} not found")
+        self._remove_at(i)
 
     def __len__(self):
         """Number of elements in the map."""
@@ -67,65 +135,49 @@ class Map:
 
     def __iter__(self):
         """Iterator over keys."""
-        for bucket in self._table:
-            for k, _ in bucket:
+        for k in self._keys:
+            if k is not _EMPTY and k is not _DELETED:
                 yield k
 
     def __contains__(self, key):
         """Check if a key exists."""
-        try:
-            _ = self[key]
-            return True
-        except KeyError:
-            return False
+        return self._find(key, hash(key)) >= 0
 
     def get(self, key, default=None):
         """Get value or default if key doesn't exist."""
-        try:
-            return self[key]
-        except KeyError:
-            return default
+        i = self._find(key, hash(key))
+        return default if i < 0 else self._values[i]
 
     def setdefault(self, key, default=None):
         """Return value if exists; otherwise set default and return it."""
-        bucket_index = self._hash(key)
-        bucket = self._table[bucket_index]
-        
-        for i, (k, v) in enumerate(bucket):
-            if k == key:
-                return v
-        
-        bucket.append((key, default))
-        self._n += 1
+        h = hash(key)
+        i = self._find(key, h)
+        if i >= 0:
+            return self._values[i]
+        self._insert(key, default, h)
         return default
 
     def pop(self, key, default=None):
         """Remove and return item, or default/KeyError if not found."""
-        bucket_index = self._hash(key)
-        bucket = self._table[bucket_index]
-        
-        for i, (k, v) in enumerate(bucket):
-            if k == key:
-                del bucket[i]
-                self._n -= 1
-                return v
-        
+        i = self._find(key, hash(key))
+        if i >= 0:
+            return self._remove_at(i)
         if default is not None:
             return default
         raise KeyError(f"Key {key} not found")
 
     def popitem(self):
         """Remove and return an arbitrary key-value pair."""
-        for bucket in self._table:
-            if bucket:
-                self._n -= 1
-                return bucket.pop()
+        keys = self._keys
+        for i in range(self._capacity - 1, -1, -1):
+            k = keys[i]
+            if k is not _EMPTY and k is not _DELETED:
+                return k, self._remove_at(i)
         raise KeyError("Map is empty")
 
     def clear(self):
         """Remove all items from the map."""
-        self._table = [[] for _ in range(self._capacity)]
-        self._n = 0
+        self._allocate(self._capacity)
 
     def keys(self):
         """Return a view of all keys."""
@@ -133,34 +185,36 @@ class Map:
 
     def values(self):
         """Return a view of all values."""
-        for bucket in self._table:
-            for _, v in bucket:
+        for k, v in zip(self._keys, self._values):
+            if k is not _EMPTY and k is not _DELETED:
                 yield v
 
     def items(self):
         """Return a view of all key-value pairs."""
-        for bucket in self._table:
-            for item in bucket:
-                yield item
+        for k, v in zip(self._keys, self._values):
+            if k is not _EMPTY and k is not _DELETED:
+                yield k, v
 
     def update(self, other):
-        """Update map with key-value pairs from another map/dict."""
-        if isinstance(other, Map):
-            for key, value in other.items():
-                self[key] = value
+        """Update map with key-value pairs from another map/dict (or an iterable of pairs)."""
+        if isinstance(other, (Map, dict)):
+            # Grow once up front instead of repeatedly while inserting
+            needed = self._round_capacity((self._n + len(other)) * 3 // 2 + 1)
+            if needed > self._capacity:
+                self._resize(needed)
+            pairs = other.items()
         else:
-            for key, value in dict(other).items():
-                self[key] = value
+            pairs = other
+        for key, value in pairs:
+            self._insert(key, value, hash(key))
 
     def __eq__(self, other):
         """Compare if two maps are equal."""
         if not isinstance(other, Map) or len(self) != len(other):
             return False
         for key, value in self.items():
-            try:
-                if other[key] != value:
-                    return False
-            except KeyError:
+            i = other._find(key, hash(key))
+            if i < 0 or other._values[i] != value:
                 return False
         return True
 
@@ -170,17 +224,21 @@ class Map:
 
     def __str__(self):
         """String representation of the map."""
-        items = []
-        for bucket in self._table:
-            for key, value in bucket:
-                items.append(f"{key!r}: {value!r}")
-        return "{" + ", ".join(items) + "}"
-
-
-# Example usage
-m = Map()
-m["name"] = "Alice"
-m["age"] = 30
-print(m.items())  # Outputs all key-value pairs
-print(m.pop("age"))  # Outputs: 30
-print("name" in m)  # Outputs: True
\ No newline at end of file
+        return "{" + ", ".join(f"{key!r}: {value!r}" for key, value in self.items()) + "}"
+
+    # ------------------ Pickle ------------------
+
+    # Stored as plain pairs: the sentinels are per-process objects, and hashes
+    # of str keys change between interpreter runs, so the table is rebuilt
+    def __getstate__(self):
+        return {"items": list(self.items())}
+
+    def __setstate__(self, state):
+        if "_table" in state:
+            # Pickle of the earlier separate-chaining Map: list of buckets of (key, value)
+            items = [item for bucket in state["_table"] for item in bucket]
+        else:
+            items = state["items"]
+        self._allocate(self._round_capacity(len(items) * 3 // 2 + 1))
+        for key, value in items:
+            self._insert(key, value, hash(key))
@@ -0,0 +1,159 @@
+class _Node:
+    __slots__ = 'key', 'value', 'left', 'right', 'parent', 'rev', 'best'
+
+    def __init__(self, key, value):
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        self.parent = None
+        self.rev = False
+        self.best = self
+
+
+class LinkCutTree:
+    """
+    Link-cut tree (Sleator-Tarjan) over hashable keys, with path-maximum queries.
+
+    Every operation is O(log n) amortized. Each node carries a value, and
+    path_max(a, b) returns the key with the largest value on the tree path a..b.
+    """
+
+    def __init__(self):
+        self._nodes = {}
+
+    def __contains__(self, key):
+        return key in self._nodes
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def add_node(self, key, value=float('-inf')):
+        self._nodes[key] = _Node(key, value)
+
+    def remove_node(self, key):
+        """Remove an isolated node (cut its links first)."""
+        del self._nodes[key]
+
+    # ------------------ splay-tree helpers ------------------
+
+    @staticmethod
+    def _is_root(x):
+        p = x.parent
+        return p is None or (p.left is not x and p.right is not x)
+
+    @staticmethod
+    def _push(x):
+        if x.rev:
+            x.left, x.right = x.right, x.left
+            if x.left:
+                x.left.rev = not x.left.rev
+            if x.right:
+                x.right.rev = not x.right.rev
+            x.rev = False
+
+    @staticmethod
+    def _update(x):
+        best = x
+        if x.left and x.left.best.value > best.value:
+            best = x.left.best
+        if x.right and x.right.best.value > best.value:
+            best = x.right.best
+        x.best = best
+
+    def _rotate(self, x):
+        p = x.parent
+        g = p.parent
+        if not self._is_root(p):
+            if g.left is p:
+                g.left = x
+            else:
+                g.right = x
+        x.parent = g
+        if p.left is x:
+            p.left = x.right
+            if x.right:
+                x.right.parent = p
+            x.right = p
+        else:
+            p.right = x.left
+            if x.left:
+                x.left.parent = p
+            x.left = p
+        p.parent = x
+        self._update(p)
+        self._update(x)
+
+    def _splay(self, x):
+        # Push pending reversals from the splay root down to x
+        stack = [x]
+        y = x
+        while not self._is_root(y):
+            y = y.parent
+            stack.append(y)
+        while stack:
+            self._push(stack.pop())
+        while not self._is_root(x):
+            p = x.parent
+            if not self._is_root(p):
+                g = p.parent
+                if (g.left is p) == (p.left is x):
+                    self._rotate(p)
+                else:
+                    self._rotate(x)
+            self._rotate(x)
+
+    def _access(self, x):
+        last = None
+        y = x
+        while y is not None:
+            self._splay(y)
+            y.right = last
+            self._update(y)
+            last = y
+            y = y.parent
+        self._splay(x)
+
+    def _make_root(self, x):
+        self._access(x)
+        x.rev = not x.rev
+
+    def _find_root(self, x):
+        self._access(x)
+        while True:
+            self._push(x)
+            if x.left is None:
+                break
+            x = x.left
+        self._splay(x)
+        return x
+
+    # ------------------ public operations ------------------
+
+    def connected(self, a, b):
+        x, y = self._nodes[a], self._nodes[b]
+        return x is y or self._find_root(x) is self._find_root(y)
+
+    def link(self, a, b):
+        """Join the trees of a and b with the link a-b (they must be disconnected)."""
+        x = self._nodes[a]
+        self._make_root(x)
+        x.parent = self._nodes[b]
+
+    def cut(self, a, b):
+        """Remove the link a-b (it must exist)."""
+        x, y = self._nodes[a], self._nodes[b]
+        self._make_root(x)
+        self._access(y)
+        # y is the splay root and x, its predecessor on the path, its left child
+        y.left.parent = None
+        y.left = None
+        self._update(y)
+
+    def path_max(self, a, b):
+        """(key, value) of the largest-valued node on the path a..b (they must be connected)."""
+        x, y = self._nodes[a], self._nodes[b]
+        self._make_root(x)
+        self._access(y)
+        best = y.best
+        return best.key, best.value
@@ -0,0 +1,238 @@
+from array import array
+
+SEPARATOR = " → "
+
+
+class PathTrie:
+    """
+    Interning dictionary for routes (sequences of vertex labels).
+
+    Labels are interned to small integer vertex ids, and every route is a
+    node of a trie over those ids, so routes sharing a prefix share its
+    storage. Each distinct route gets a compact integer route id in
+    insertion order; intern() and find() cost O(len(path)) dict lookups.
+
+    The trie lives in flat int arrays (parent node, vertex id, route id,
+    first child and next sibling per node) plus one dict of edges keyed by
+    (node, vertex) packed in an int. Decoding a route walks parent pointers
+    back to the root; prefix queries walk only the matching subtree.
+
+    remove(rid) forgets a route: its id and the trie nodes left without
+    routes or children are reused by later interns, so a trie that tracks a
+    bounded set of routes (e.g. the keys of a SpaceSaving summary) stays
+    bounded too. Vertex labels are never removed: their ids are shared with
+    other structures (e.g. visit counters indexed by vertex id), and there
+    is at most one per vertex of the graph.
+    """
+
+    _SHIFT = 32     # edge key = node << _SHIFT | vertex id
+
+    def __init__(self):
+        self._labels = []           # vertex id -> label
+        self._vertex_ids = {}       # label -> vertex id
+        self._parent = array('q', [-1])     # trie node -> parent node (node 0 is the root)
+        self._vertex = array('q', [-1])     # trie node -> vertex id on the edge from its parent
+        self._route = array('q', [-1])      # trie node -> route id ending here, or -1
+        self._first_child = array('q', [-1])
+        self._next_sibling = array('q', [-1])
+        self._route_node = array('q')       # route id -> trie node, or -1 once removed
+        self._edges = {}
+        self._free_nodes = []       # trie nodes released by remove() (parent -1)
+        self._free_routes = []      # route ids released by remove()
+
+    def __len__(self):
+        return len(self._route_node) - len(self._free_routes)
+
+    def vertex_id(self, label):
+        """Interns a vertex label (anything, via str()) and returns its id."""
+        label = str(label)
+        vid = self._vertex_ids.get(label)
+        if vid is None:
+            vid = self._vertex_ids[label] = len(self._labels)
+            self._labels.append(label)
+        return vid
+
+    def find_vertex(self, label):
+        """Id of a label already interned, or None (does not add it)."""
+        return self._vertex_ids.get(str(label))
+
+    def label(self, vid):
+        return self._labels[vid]
+
+    def vertex_count(self):
+        return len(self._labels)
+
+    def vertex_labels(self):
+        """vertex id -> label (the trie's own list; do not modify)."""
+        return self._labels
+
+    # ------------------ Interning ------------------
+
+    def intern(self, path):
+        """Route id of path (vertex labels), assigning the next id if it is new."""
+        node = 0
+        for label in path:
+            key = node << self._SHIFT | self.vertex_id(label)
+            child = self._edges.get(key)
+            if child is None:
+                child = self._edges[key] = self._new_node(node, key & ((1 << self._SHIFT) - 1))
+            node = child
+        rid = self._route[node]
+        if rid < 0:
+            if self._free_routes:
+                rid = self._free_routes.pop()
+                self._route_node[rid] = node
+            else:
+                rid = len(self._route_node)
+                self._route_node.append(node)
+            self._route[node] = rid
+        return rid
+
+    def _new_node(self, parent, vid):
+        if self._free_nodes:
+            node = self._free_nodes.pop()
+            self._parent[node] = parent
+            self._vertex[node] = vid
+            self._route[node] = -1
+            self._first_child[node] = -1
+        else:
+            node = len(self._parent)
+            self._parent.append(parent)
+            self._vertex.append(vid)
+            self._route.append(-1)
+            self._first_child.append(-1)
+            self._next_sibling.append(-1)
+        self._next_sibling[node] = self._first_child[parent]
+        self._first_child[parent] = node
+        return node
+
+    def remove(self, rid):
+        """
+        Forgets route rid (a no-op if it was already removed). Its id is
+        reused by a later intern(), and so is every node on its branch that
+        no longer ends a route or leads to one: O(len(path) * fan-out).
+        """
+        node = self._route_node[rid]
+        if node < 0:
+            return
+        self._route[node] = -1
+        self._route_node[rid] = -1
+        self._free_routes.append(rid)
+        while node > 0 and self._route[node] < 0 and self._first_child[node] < 0:
+            parent = self._parent[node]
+            del self._edges[parent << self._SHIFT | self._vertex[node]]
+            # Unlink it from the parent's child list
+            if self._first_child[parent] == node:
+                self._first_child[parent] = self._next_sibling[node]
+            else:
+                prev = self._first_child[parent]
+                while self._next_sibling[prev] != node:
+                    prev = self._next_sibling[prev]
+                self._next_sibling[prev] = self._next_sibling[node]
+            self._parent[node] = -1
+            self._free_nodes.append(node)
+            node = parent
+
+    def route_ids(self):
+        """Ids of the routes currently interned."""
+        return [rid for rid, node in enumerate(self._route_node) if node >= 0]
+
+    def find(self, path):
+        """Route id of path, or None if it was never interned."""
+        node = self._node_of(path)
+        if node is None or self._route[node] < 0:
+            return None
+        return self._route[node]
+
+    def _node_of(self, path):
+        node = 0
+        for label in path:
+            vid = self._vertex_ids.get(str(label))
+            if vid is None:
+                return None
+            node = self._edges.get(node << self._SHIFT | vid)
+            if node is None:
+                return None
+        return node
+
+    # ------------------ Decoding ------------------
+
+    def path(self, rid):
+        """The route as an array of vertex ids."""
+        ids = array('q')
+        node = self._route_node[rid]
+        while node > 0:
+            ids.append(self._vertex[node])
+            node = self._parent[node]
+        ids.reverse()
+        return ids
+
+    def labels(self, rid):
+        return [self._labels[v] for v in self.path(rid)]
+
+    def decode(self, rid):
+        """Display string of a route id ("a → b → c")."""
+        return SEPARATOR.join(self.labels(rid))
+
+    def with_prefix(self, prefix):
+        """Route ids of every route starting with the given labels (in trie order)."""
+        start = self._node_of(prefix)
+        if start is None:
+            return []
+        result, stack = [], [start]
+        while stack:
+            node = stack.pop()
+            if self._route[node] >= 0:
+                result.append(self._route[node])
+            child = self._first_child[node]
+            while child >= 0:
+                stack.append(child)
+                child = self._next_sibling[child]
+        return result
+
+    # ------------------ Flat form ------------------
+
+    def to_arrays(self):
+        """
+        The trie as flat sequences: labels (vertex id -> label) and, per trie
+        node, parent / vertex / route, plus route_node (route id -> node).
+        Edges, child links and the free lists (nodes with parent -1, routes
+        with node -1) are derived from these and rebuilt on load.
+        """
+        return {
+            "labels": self._labels,
+            "parent": self._parent,
+            "vertex": self._vertex,
+            "route": self._route,
+            "route_node": self._route_node,
+        }
+
+    @classmethod
+    def from_arrays(cls, labels, parent, vertex, route, route_node):
+        trie = cls.__new__(cls)
+        trie._labels = [str(label) for label in labels]
+        trie._vertex_ids = {label: vid for vid, label in enumerate(trie._labels)}
+        trie._parent = array('q', parent)
+        trie._vertex = array('q', vertex)
+        trie._route = array('q', route)
+        trie._route_node = array('q', route_node)
+        trie._edges = {}
+        trie._free_nodes = []
+        trie._free_routes = [rid for rid, node in enumerate(trie._route_node) if node < 0]
+        trie._first_child = array('q', [-1]) * len(trie._parent)
+        trie._next_sibling = array('q', [-1]) * len(trie._parent)
+        for node in range(1, len(trie._parent)):
+            p = trie._parent[node]
+            if p < 0:
+                trie._free_nodes.append(node)
+                continue
+            trie._edges[p << cls._SHIFT | trie._vertex[node]] = node
+            trie._next_sibling[node] = trie._first_child[p]
+            trie._first_child[p] = node
+        return trie
+
+    def __getstate__(self):
+        return self.to_arrays()
+
+    def __setstate__(self, state):
+        self.__dict__.update(PathTrie.from_arrays(**state).__dict__)
@@ -0,0 +1,135 @@
+class _Bucket:
+    __slots__ = 'count', 'keys', 'prev', 'next'
+
+    def __init__(self, count):
+        self.count = count
+        self.keys = {}          # insertion-ordered set of keys with this count
+        self.prev = None
+        self.next = None
+
+
+class RankedCounter:
+    """
+    Counter that keeps its keys ranked by count at all times.
+
+    Keys live in buckets of equal count, chained in increasing order (the
+    "stream-summary" layout). Incrementing a key by one moves it to the next
+    bucket in O(1); larger increments walk forward over the buckets in between.
+    top_k(k) walks down from the highest bucket, so it costs O(k) and never
+    sorts. Ties keep the order in which keys reached that count.
+    """
+
+    def __init__(self, counts=None):
+        self._where = {}        # key -> bucket
+        self._min = None
+        self._max = None
+        if counts:
+            self._build(counts)
+
+    def __len__(self):
+        return len(self._where)
+
+    def __contains__(self, key):
+        return key in self._where
+
+    def get(self, key, default=0):
+        bucket = self._where.get(key)
+        return default if bucket is None else bucket.count
+
+    def increment(self, key, by=1):
+        """Adds by (> 0) to key's count and returns the new count."""
+        if by <= 0:
+            raise ValueError("RankedCounter only supports positive increments")
+        old = self._where.get(key)
+        count = by if old is None else old.count + by
+        prev, nxt = old, (self._min if old is None else old.next)
+        while nxt is not None and nxt.count < count:
+            prev, nxt = nxt, nxt.next
+        if nxt is not None and nxt.count == count:
+            target = nxt
+        else:
+            target = self._link_after(prev, _Bucket(count))
+        target.keys[key] = None
+        self._where[key] = target
+        if old is not None:
+            del old.keys[key]
+            if not old.keys:
+                self._unlink(old)
+        return count
+
+    def remove(self, key):
+        """Drops key and returns its count (KeyError if absent)."""
+        bucket = self._where.pop(key)
+        del bucket.keys[key]
+        if not bucket.keys:
+            self._unlink(bucket)
+        return bucket.count
+
+    def min_item(self):
+        """(key, count) of the oldest key among the lowest counts, or None if empty."""
+        if self._min is None:
+            return None
+        return next(iter(self._min.keys)), self._min.count
+
+    def top_k(self, k=None):
+        """Yields up to k (key, count) pairs, highest count first (all if k is None)."""
+        bucket = self._max
+        while bucket is not None:
+            for key in bucket.keys:
+                if k is not None and k <= 0:
+                    return
+                yield key, bucket.count
+                if k is not None:
+                    k -= 1
+            bucket = bucket.prev
+
+    def items(self):
+        """(key, count) pairs in increasing count order."""
+        bucket = self._min
+        while bucket is not None:
+            for key in bucket.keys:
+                yield key, bucket.count
+            bucket = bucket.next
+
+    # ------------------ Internals ------------------
+
+    def _link_after(self, prev, bucket):
+        bucket.prev = prev
+        bucket.next = self._min if prev is None else prev.next
+        if prev is None:
+            self._min = bucket
+        else:
+            prev.next = bucket
+        if bucket.next is None:
+            self._max = bucket
+        else:
+            bucket.next.prev = bucket
+        return bucket
+
+    def _unlink(self, bucket):
+        if bucket.prev is None:
+            self._min = bucket.next
+        else:
+            bucket.prev.next = bucket.next
+        if bucket.next is None:
+            self._max = bucket.prev
+        else:
+            bucket.next.prev = bucket.prev
+
+    def _build(self, counts):
+        # Bulk load: one sort instead of walking the buckets once per key
+        tail = None
+        for key, count in sorted(counts.items(), key=lambda kv: kv[1]):
+            if count <= 0:
+                continue
+            if tail is None or tail.count != count:
+                tail = self._link_after(tail, _Bucket(count))
+            tail.keys[key] = None
+            self._where[key] = tail
+
+    # Pickled as a plain {key: count}; the bucket chain would recurse deeply
+    def __getstate__(self):
+        return {"counts": dict(self.items())}
+
+    def __setstate__(self, state):
+        self.__init__(state["counts"])
@@ -0,0 +1,129 @@
+from tda.ranked_counter import RankedCounter
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy hitters (Metwally, Agrawal, El Abbadi): approximate
+    frequency counts over a stream using at most `capacity` counters.
+
+    When a key arrives and every counter is taken, the key with the smallest
+    count m is evicted and the newcomer inherits m (recorded as its error).
+    With N insertions in total:
+    - every estimate overcounts by at most error(key) <= N / capacity;
+    - every key whose true frequency exceeds N / capacity is being tracked.
+
+    Counters live in a RankedCounter, so insert and eviction are O(1) and
+    top_k(k) is O(k). Summaries of separate streams can be merged, keeping
+    the same N / capacity bound over the combined stream.
+
+    The query methods mirror tda.avl.AVL (insert, get_freq, top_k, in_order,
+    len) so either can back the route rankings.
+    """
+
+    def __init__(self, capacity=1000):
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.total = 0              # N: insertions seen (including merged ones)
+        self._counts = RankedCounter()
+        self._errors = {}           # key -> overestimation bound
+
+    def __len__(self):
+        return len(self._counts)
+
+    def __contains__(self, key):
+        return key in self._counts
+
+    def insert(self, key, count=1):
+        """Counts key; returns the key evicted to make room for it, or None."""
+        self.total += count
+        if key in self._counts:
+            self._counts.increment(key, count)
+            return None
+        error, victim = 0, None
+        if len(self._counts) >= self.capacity:
+            victim, error = self._counts.min_item()
+            self._counts.remove(victim)
+            del self._errors[victim]
+        self._counts.increment(key, error + count)
+        self._errors[key] = error
+        return victim
+
+    def get_freq(self, key):
+        """Estimated frequency (an upper bound; 0 if the key is not tracked)."""
+        return self._counts.get(key)
+
+    def error(self, key):
+        return self._errors.get(key, 0)
+
+    def guaranteed(self, key):
+        """Lower bound on the key's true frequency."""
+        return self._counts.get(key) - self._errors.get(key, 0)
+
+    def error_bound(self):
+        """Largest possible overestimation of any key: N / capacity."""
+        return self.total / self.capacity
+
+    def top_k(self, k):
+        """The k keys with the highest estimates, as (key, estimate)."""
+        return list(self._counts.top_k(k))
+
+    def in_order(self):
+        """Tracked (key, estimate) in key order."""
+        return sorted(self._counts.items())
+
+    def merge(self, other):
+        """
+        Folds another summary into this one (Agarwal et al., "Mergeable
+        summaries"). A key missing from a full summary may still have up to
+        that summary's smallest count, so it is charged that much as both
+        count and error; then only the capacity largest counters are kept.
+        """
+        floor_self = self._floor()
+        floor_other = other._floor()
+        merged = {}
+        for key in set(self._errors) | set(other._errors):
+            count, error = 0, 0
+            for summary, floor in ((self, floor_self), (other, floor_other)):
+                if key in summary._counts:
+                    count += summary._counts.get(key)
+                    error += summary._errors[key]
+                else:
+                    count += floor
+                    error += floor
+            merged[key] = (count, error)
+        kept = sorted(merged.items(), key=lambda item: -item[1][0])[:self.capacity]
+        self.total += other.total
+        self._counts = RankedCounter({key: count for key, (count, _) in kept})
+        self._errors = {key: error for key, (_, error) in kept}
+        return self
+
+    def _floor(self):
+        # Smallest tracked count once full; while there is room nothing was evicted
+        if len(self._counts) < self.capacity:
+            return 0
+        return self._counts.min_item()[1]
+
+    # ------------------ Serialization ------------------
+
+    def to_dict(self):
+        """Plain JSON-friendly form, e.g. to ship a summary to another process."""
+        return {
+            "capacity": self.capacity,
+            "total": self.total,
+            "counts": [[key, count, self._errors[key]] for key, count in self._counts.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        summary = cls(data["capacity"])
+        summary.total = data["total"]
+        summary._counts = RankedCounter({key: count for key, count, _ in data["counts"]})
+        summary._errors = {key: error for key, _, error in data["counts"]}
+        return summary
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__dict__.update(SpaceSaving.from_dict(state).__dict__)
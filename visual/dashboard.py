@@ -7,12 +7,18 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import streamlit as st
 from sim.init_simulation import InitSimulation
 from sim.simulation import Simulation
+from sim.route_table import RouteTable
+from sim.contraction import ContractionHierarchy
+from sim.route_pool import save_network
 from visual.network_adapter import NetworkAdapter
 from visual.avl_visualizer import AVL_visualizer
 from tda.avl import AVL
+from tda.space_saving import SpaceSaving
+from tda.path_trie import PathTrie
 from tda.hash_map import Map
 from domain.client import Client
 from domain.order import Order
+from domain.order_table import OrderTable, ClientTable
 
 import networkx as nx
 import matplotlib.pyplot as plt
@@ -22,9 +28,11 @@ import folium
 from visual.report_generator import ReportGenerator
 from visual.map.map_adapter import MapAdapter
 from streamlit_folium import st_folium
-from sim.kruskal import kruskal_mst
-from api.main import sync_state_from_streamlit 
-import pickle
+from sim.dynamic_mst import DynamicMST
+from sim.visit_stats import VisitStats
+from sim.visit_counter import VisitCounter
+from api.main import (sync_state_from_streamlit, record_route, record_order_status, load_state,
+                      route_ranking, routes_with_prefix, HIERARCHY_FILE, NETWORK_FILE)
 
 st.set_page_config(layout="wide")
 
@@ -37,24 +45,20 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs([
 ])
 
 def refresh_from_api():
-    from tda.avl import AVL
-    from tda.hash_map import Map
-    from domain.client import Client
-    from domain.order import Order
-
-    STATE_FILE = "api_sim_state.pickle"
-    if not os.path.exists(STATE_FILE):
+    # Instantánea + bitácora de la API (incluye cancelaciones y entregas hechas por la API)
+    state = load_state()
+    if not state:
         return  # o puedes poner un st.warning aquí
 
-    with open(STATE_FILE, "rb") as f:
-        state = pickle.load(f)
-
     # Sobrescribe el session_state relevante:
     st.session_state['clients'] = state.get("clients", [])
     st.session_state['orders'] = state.get("orders", [])
     st.session_state['routes_avl'] = state.get("routes_avl", AVL())
+    st.session_state['route_trie'] = state.get("route_trie", PathTrie())
     st.session_state['node_visits'] = state.get("node_visits", Map())
     st.session_state['node_roles'] = state.get("node_roles", {})
+    st.session_state['visit_stats'] = state.get("visit_stats") or VisitStats.from_visits(
+        st.session_state['node_visits'], st.session_state['node_roles'])
     st.session_state['n_nodes'] = state.get("n_nodes", 0)
     st.session_state['m_edges'] = state.get("m_edges", 0)
     st.session_state['n_orders'] = state.get("n_orders", 0)
@@ -83,21 +87,22 @@ with tab1:
     n_nodes = st.slider("Number of Nodes", min_value=10, max_value=150, value=15)
     m_edges = st.slider("Number of Edges", min_value=10, max_value=300, value=20)
     n_orders = st.slider("Number of Orders", min_value=1, max_value=300, value=10)
+    # Modo acotado: solo se siguen las rutas más frecuentes (memoria fija, conteos aproximados)
+    bounded_routes = st.checkbox("Bounded route tracking (heavy hitters)", value=False)
+    route_capacity = st.number_input("Tracked routes", min_value=10, max_value=100000, value=1000,
+                                     step=10, disabled=not bounded_routes)
     autonomy = 50
 
     n_clients = int(n_nodes * 0.6)
     st.caption(f"Derived Client Nodes: {n_clients} (60% of {n_nodes})")
 
     if st.button("🟩 Start Simulation"):
-        graph, vertices = InitSimulation.generate_connected_graph(n_nodes, m_edges)
-        role_distribution = [("storage", 0.2), ("recharge", 0.2), ("client", 0.6)]
-        roles = []
-        for role, perc in role_distribution:
-            roles += [role] * int(n_nodes * perc)
-        while len(roles) < n_nodes:
-            roles.append("client")
-        random.shuffle(roles)
-        node_roles = {v: roles[i] for i, v in enumerate(vertices)}
+        network = InitSimulation.generate_network(n_nodes, m_edges)
+        graph = network.to_graph()
+        vertices = list(graph.vertices())
+        node_roles = network.node_roles(graph)
+        for v, role in node_roles.items():
+            graph.set_role(v, role)
 
         client_nodes = [v for v, r in node_roles.items() if r == "client"]
         recharge_nodes = [v for v, r in node_roles.items() if r == "recharge"]
@@ -114,6 +119,10 @@ with tab1:
             for i, v in enumerate(client_nodes)
         ]
 
+        # Una búsqueda por almacén; cada orden luego es un lookup en la tabla
+        route_table = RouteTable(graph, storage_nodes, client_nodes, autonomy, recharge_nodes,
+                                 engine=Simulation.recharge_engine)
+
         orders = []
         for i in range(n_orders):
             src = random.choice(storage_nodes)
@@ -123,11 +132,8 @@ with tab1:
             now = datetime.datetime.now().isoformat()
 
             # Calcula la ruta y el costo aquí:
-            route_result = Simulation.bfs_shortest_path(graph, src, tgt, autonomy, recharge_nodes)
-            if route_result and hasattr(route_result, "cost"):
-                route_cost = route_result.cost
-            else:
-                route_cost = None
+            route_path, cost = route_table.lookup(src, tgt)
+            route_cost = cost if route_path else None
 
             orders.append(Order(
                 order_id=f"O{str(i).zfill(3)}",
@@ -153,13 +159,27 @@ with tab1:
         st.session_state['node_roles'] = node_roles
         st.session_state['recharge_nodes'] = recharge_nodes
         st.session_state['storage_nodes'] = storage_nodes
-        st.session_state['node_visits'] = Map()  
-        st.session_state['clients'] = clients
-        st.session_state['orders'] = orders
-        st.session_state['routes_avl'] = AVL()
+        # Órdenes y clientes se guardan por columnas (las filas se leen como Order/Client)
+        st.session_state['clients'] = ClientTable.from_clients(clients)
+        st.session_state['orders'] = OrderTable.from_orders(orders)
+        st.session_state['routes_avl'] = SpaceSaving(int(route_capacity)) if bounded_routes else AVL()
+        # Las rutas se guardan por id (PathTrie); el texto "a → b" se arma solo para mostrarlas
+        st.session_state['route_trie'] = PathTrie()
+        # Visitas por id de vértice del mismo trie (la ruta internada se cuenta sin etiquetas)
+        st.session_state['node_visits'] = VisitCounter(st.session_state['route_trie'])
+        st.session_state['route_table'] = route_table
+        # MST mantenido: se actualiza solo ante cambios del grafo
+        st.session_state['mst'] = DynamicMST(graph)
+        # La red no cambia durante la simulación: se preprocesa una vez y la API la carga del disco
+        hierarchy = ContractionHierarchy(graph)
+        hierarchy.save(HIERARCHY_FILE)
+        st.session_state['hierarchy'] = hierarchy
+        save_network(NETWORK_FILE, graph, autonomy, recharge_nodes)
         st.session_state['simulation_ready'] = True
         st.session_state['last_route_path'] = None
         sync_state_from_streamlit()
+        # Rankings de visitas por rol que la API arma al cargar el estado
+        st.session_state['visit_stats'] = load_state()["visit_stats"]
 
 # ------------------ TAB 2: Visualización del grafo y cálculo de rutas ------------------
 with tab2:
@@ -211,39 +231,31 @@ with tab2:
                 format_func=lambda v: f"{v} (Cliente)"
             )
 
-            matching_order = None
-            for order in st.session_state.get('orders', []):
-                if (
-                    getattr(order, "origin", None) == str(start) and
-                    getattr(order, "destination", None) == str(end) and
-                    getattr(order, "status", None) == "pending"
-                ):
-                    matching_order = order
-                    break
+            # Filtro vectorizado sobre las columnas del OrderTable
+            pending = st.session_state['orders'].query(
+                origin=str(start), destination=str(end), status="pending", limit=1)
+            matching_order = pending[0] if pending else None
 
             if st.button("🧭 Calculate Route"):
-                path, cost = Simulation.get_shortest_path(
+                route_table = st.session_state['route_table']
+                route_table.refresh(
                     st.session_state['graph'],
-                    start,
-                    end,
                     st.session_state['autonomy'],
                     st.session_state['recharge_nodes']
                 )
+                path, cost = route_table.lookup(start, end)
                 if path and len(path) > 1:
                     st.session_state['last_route_path'] = path
                     st.success(f"Route found: {[str(v) for v in path]} (Cost: {cost})")
-                    # Actualiza rankings y AVL:
-                    route_key = " → ".join(str(v) for v in path)
-                    st.session_state['routes_avl'].insert(route_key)
-                    visits = st.session_state['node_visits']
-                    for v in path:
-                        v_str = str(v)
-                        if v_str in visits:
-                            visits[v_str] += 1
-                        else:
-                            visits[v_str] = 1
-                    # ---- SINCRONIZA ESTADO CON LA API ----
-                    sync_state_from_streamlit()
+                    # ---- SINCRONIZA CON LA API: un evento en la bitácora, no todo el estado ----
+                    # El evento interna la ruta y actualiza AVL, visitas y rankings por rol del
+                    # estado de la API, que es el mismo objeto que usa la sesión (no se suma aquí de nuevo)
+                    record_route(path)
+                    state = load_state()
+                    st.session_state['routes_avl'] = state["routes_avl"]
+                    st.session_state['route_trie'] = state["route_trie"]
+                    st.session_state['node_visits'] = state["node_visits"]
+                    st.session_state['visit_stats'] = state["visit_stats"]
                 else:
                     st.error("No route found (autonomy or recharge limit reached).")
                 st.rerun()
@@ -260,8 +272,12 @@ with tab2:
                         st.session_state['mst_visible'] = False
                         st.session_state['mst_edges'] = None
                     else:
-                        # Calcula y muestra el MST
-                        mst_edges = kruskal_mst(st.session_state['graph'])
+                        # Muestra el MST mantenido (se crea si la sesión no lo tiene)
+                        mst = st.session_state.get('mst')
+                        if mst is None or mst.graph is not st.session_state['graph']:
+                            mst = DynamicMST(st.session_state['graph'])
+                            st.session_state['mst'] = mst
+                        mst_edges = mst.edges()
                         # Si usas strings para nodos en NetworkX:
                         st.session_state['mst_edges'] = [(str(e.endpoints()[0]), str(e.endpoints()[1])) for e in mst_edges]
                         st.session_state['mst_visible'] = True
@@ -271,9 +287,15 @@ with tab2:
                 st.info(f"Pending order found for this route: {getattr(matching_order, 'order_id', '')} "
                         f"(Priority: {getattr(matching_order, 'priority', '')})")
                 if st.button("✅ Complete Delivery"):
-                    matching_order.status = "completed"
-                    matching_order.delivered_at = datetime.datetime.now().isoformat()
-                    st.success(f"Order {getattr(matching_order, 'order_id', '')} marked as completed at {matching_order.delivered_at}")
+                    delivered_at = datetime.datetime.now().isoformat()
+                    try:
+                        record_order_status(matching_order.order_id, "completed", delivered_at)
+                    except ValueError:
+                        st.error("The order is no longer pending (it may have been updated through the API).")
+                    else:
+                        matching_order.status = "completed"
+                        matching_order.delivered_at = delivered_at
+                        st.success(f"Order {getattr(matching_order, 'order_id', '')} marked as completed at {matching_order.delivered_at}")
                     st.rerun()
     else:
         st.info("No nodes registered yet.")
@@ -307,10 +329,13 @@ with tab4:
 
     # --- Top rutas más frecuentes ---
     st.markdown("### 🏅 Most Frequent Routes")
-    if avl_obj and avl_obj.root:
-        routes = avl_obj.in_order()
+    if avl_obj:
+        # top_k recorre solo las ramas con frecuencias altas (sin ordenar todas las rutas)
+        routes = route_ranking(st.session_state, 10)
+        if isinstance(avl_obj, SpaceSaving):
+            st.caption(f"Heavy-hitters mode: {len(avl_obj)} of at most {avl_obj.capacity} routes tracked; "
+                       f"frequencies may overcount by up to {avl_obj.error_bound():.1f}.")
         if routes:
-            routes = sorted(routes, key=lambda x: -x[1])
             st.markdown(
                 "<div style='margin-bottom: 1em;'>"
                 + "".join(
@@ -318,20 +343,33 @@ with tab4:
                     f"<b>{idx}.</b> <span style='color:deepskyblue'>{path}</span>"
                     f" <span style='color:orange'>(freq: {freq})</span>"
                     f"</div>"
-                    for idx, (path, freq) in enumerate(routes[:10], 1)
+                    for idx, (path, freq) in enumerate(routes, 1)
                 )
                 + "</div>",
                 unsafe_allow_html=True,
             )
         else:
             st.info("No routes registered yet.")
+
+        # --- Rutas que salen de un almacén (consulta por prefijo en el trie de rutas) ---
+        storage_labels = [str(v) for v in st.session_state.get('storage_nodes', [])]
+        if storage_labels:
+            origin = st.selectbox("Routes starting at storage node", storage_labels, key="routes_from_storage")
+            from_origin = routes_with_prefix(st.session_state, [origin])
+            if from_origin:
+                st.table([{"Route": path, "Freq": freq} for path, freq in from_origin])
+            else:
+                st.info("No routes registered from this node.")
     else:
         st.info("No routes registered yet.")
 
     # --- Visualización AVL ---
     st.markdown("### 🌳 AVL Tree Visualization")
-    if avl_obj and avl_obj.root:
-        G = NetworkAdapter.avl_to_nx_graph(avl_obj.root, avl_obj.freqs)
+    if isinstance(avl_obj, SpaceSaving):
+        st.info("Heavy-hitters mode keeps no AVL tree.")
+    elif avl_obj and avl_obj.root:
+        G = NetworkAdapter.avl_to_nx_graph(avl_obj.root, avl_obj.freqs,
+                                           key_label=st.session_state['route_trie'].decode)
         pos = AVL_visualizer.hierarchy_pos(G)
         fig, ax = plt.subplots(figsize=(10, 4))
         nx.draw(
@@ -349,7 +387,7 @@ with tab4:
         "Nodos": st.session_state.get("n_nodes", 0),
         "Aristas": st.session_state.get("m_edges", 0),
         "Órdenes totales": len(st.session_state.get("orders", [])),
-        "Rutas registradas": len(st.session_state.get("routes_avl", AVL()).in_order()),
+        "Rutas registradas": len(st.session_state.get("routes_avl", AVL())),
         "Clientes": len(st.session_state.get("clients", [])),
     }
 
@@ -360,15 +398,11 @@ with tab4:
     # 3. Rutas frecuentes (formato: lista de (ruta, frecuencia))
     avl_obj = st.session_state.get('routes_avl')
     routes = []
-    if avl_obj and avl_obj.root:
-        routes = sorted(avl_obj.in_order(), key=lambda x: -x[1])
+    if avl_obj:
+        routes = route_ranking(st.session_state, 10)
 
-    # 4. Nodos más usados (diccionario {str(node): visitas})
-    node_visits_map = st.session_state.get("node_visits", {})
-    if hasattr(node_visits_map, "items"):  # Es tu HashMap propio
-        node_visit_stats = {str(k): node_visits_map[k] for k in node_visits_map}
-    else:  # Es dict plano
-        node_visit_stats = node_visits_map
+    # 4. Nodos más usados: el VisitCounter se pasa tal cual (se lee por etiqueta)
+    node_visit_stats = st.session_state.get("node_visits", {})
 
     node_roles = st.session_state.get("node_roles", {})
     role_counts = {"storage": 0, "recharge": 0, "client": 0}
@@ -388,7 +422,8 @@ with tab4:
             routes,
             node_visit_stats,
             role_counts,
-            node_roles_str           # <-- Agrega esto para los rankings por tipo de nodo
+            node_roles_str,          # <-- Agrega esto para los rankings por tipo de nodo
+            visit_stats=st.session_state.get('visit_stats')
         )
         filename = generator.generate_pdf("reporte.pdf")
         with open(filename, "rb") as f:
@@ -410,18 +445,26 @@ with tab5:
 
     node_visits = st.session_state.get('node_visits', None)
     node_roles = st.session_state.get('node_roles', None)
+    visit_stats = st.session_state.get('visit_stats')
+    if visit_stats is None and node_visits and node_roles:
+        visit_stats = VisitStats.from_visits(node_visits, node_roles)
+        st.session_state['visit_stats'] = visit_stats
 
     if not node_visits or not node_roles or len(node_roles) == 0:
         st.info("No node data available. Run the simulation and generate at least one route.")
     else:
-        roles = {"client": [], "recharge": [], "storage": []}
-        visits_by_role = {"client": [], "recharge": [], "storage": []}
-
-        for v, role in node_roles.items():
-            v_str = str(v)
-            if role in roles:
-                roles[role].append(v_str)
-                visits_by_role[role].append(node_visits.get(v_str, 0))
+        role_sizes = {"client": 0, "recharge": 0, "storage": 0}
+        for role in node_roles.values():
+            if role in role_sizes:
+                role_sizes[role] += 1
+
+        # Top 10 de cada rol, ya ordenado por VisitStats (O(k), sin recorrer todos los nodos)
+        roles = {}
+        visits_by_role = {}
+        for role in role_sizes:
+            top = visit_stats.top(role, k=10)
+            roles[role] = [label for label, _ in top]
+            visits_by_role[role] = [count for _, count in top]
 
         no_clients = len(roles["client"]) == 0
         no_recharge = len(roles["recharge"]) == 0
@@ -470,9 +513,9 @@ with tab5:
 
         # --- Pie chart de proporciones ---
         st.markdown("### 🥧 Node Role Proportion")
-        n_storage = len(roles["storage"])
-        n_recharge = len(roles["recharge"])
-        n_client = len(roles["client"])
+        n_storage = role_sizes["storage"]
+        n_recharge = role_sizes["recharge"]
+        n_client = role_sizes["client"]
 
         if n_storage == 0 and n_recharge == 0 and n_client == 0:
             st.info("No nodes to display in pie chart.")
@@ -60,11 +60,7 @@ class MapAdapter:
             if n not in pos:
                 continue
             lat, lon = pos[n]
-            role = "client"
-            for key in node_roles:
-                if str(key) == str(n):
-                    role = node_roles[key]
-                    break
+            role = MapAdapter._role_of(graph, node_roles, n)
             icon_config = {
                 "storage": {"color": "orange", "icon": "warehouse", "prefix": "fa"},
                 "recharge": {"color": "green", "icon": "bolt", "prefix": "fa"},
@@ -82,12 +78,8 @@ class MapAdapter:
             for i in range(len(route_path) - 1):
                 u = route_path[i]
                 v = route_path[i + 1]
-                u_pos, v_pos = None, None
-                for pos_key in pos:
-                    if str(pos_key) == str(u):
-                        u_pos = pos[pos_key]
-                    if str(pos_key) == str(v):
-                        v_pos = pos[pos_key]
+                # Los nodos de G (y las claves de pos) son las etiquetas str de los Vertex
+                u_pos, v_pos = pos.get(str(u)), pos.get(str(v))
                 if u_pos and v_pos:
                     edge = graph.get_edge(u, v)
                     weight = edge.element() if edge else "?"
@@ -117,8 +109,16 @@ class MapAdapter:
     
     @staticmethod
     def _vertex_from_str(graph, s):
-        for v in graph.vertices():
-            if str(v) == str(s):
-                return v
-        return None
+        return graph.vertex_by_label(s)
+
+    @staticmethod
+    def _role_of(graph, node_roles, label):
+        # Primero el índice de roles del grafo; si no lo tiene, node_roles (claves Vertex o str)
+        v = MapAdapter._vertex_from_str(graph, label) if graph is not None else None
+        role = graph.role(v) if v is not None else None
+        if role is None:
+            role = node_roles.get(v) if v is not None else None
+        if role is None:
+            role = node_roles.get(str(label), "client")
+        return role
 
@@ -27,14 +27,15 @@ class NetworkAdapter:
             return {"k": 0.4, "iterations": 600, "scale": 8.0}
 
     @staticmethod
-    def avl_to_nx_graph(root, freqs, G=None, parent=None):
+    def avl_to_nx_graph(root, freqs, G=None, parent=None, key_label=str):
+        # key_label: texto a mostrar por clave (p. ej. PathTrie.decode para ids de ruta)
         if G is None:
             G = nx.DiGraph()
         if root:
-            label = f"{root.key}\nFreq: {freqs.get(root.key, 0)}"
+            label = f"{key_label(root.key)}\nFreq: {freqs.get(root.key, 0)}"
             G.add_node(label)
             if parent:
                 G.add_edge(parent, label)
-            NetworkAdapter.avl_to_nx_graph(root.left, freqs, G, label)
-            NetworkAdapter.avl_to_nx_graph(root.right, freqs, G, label)
+            NetworkAdapter.avl_to_nx_graph(root.left, freqs, G, label, key_label)
+            NetworkAdapter.avl_to_nx_graph(root.right, freqs, G, label, key_label)
         return G
@@ -4,9 +4,11 @@ import io
 import tempfile
 import os
 from sim.utils import safe_str
+from sim.visit_stats import VisitStats
 
 class ReportGenerator:
-    def __init__(self, system_stats, orders, clients, routes, node_visit_stats, role_counts, node_roles):
+    def __init__(self, system_stats, orders, clients, routes, node_visit_stats, role_counts, node_roles,
+                 visit_stats=None):
         self.system_stats = system_stats
         self.orders = orders
         self.clients = clients
@@ -14,14 +16,13 @@ class ReportGenerator:
         self.node_visit_stats = node_visit_stats
         self.role_counts = role_counts
         self.node_roles = node_roles
+        # Rankings por rol (sim/visit_stats.py); si no se pasan, se arman una vez aquí
+        if visit_stats is None:
+            visit_stats = VisitStats.from_visits(node_visit_stats, node_roles)
+        self.visit_stats = visit_stats
 
     def _make_role_visits(self, role_name, bar_color, title):
-        items = [
-            (safe_str(n), v)
-            for n, v in self.node_visit_stats.items()
-            if self.node_roles.get(str(n)) == role_name
-        ]
-        items = sorted(items, key=lambda x: x[1], reverse=True)[:10]
+        items = [(safe_str(n), v) for n, v in self.visit_stats.top(role_name, 10)]
         if not items:
             return None
         nodes = [k for k, _ in items]
@@ -81,9 +82,12 @@ class ReportGenerator:
         pdf.set_font("Arial", "B", 12)
         pdf.cell(0, 10, safe_str("Nodos mas utilizados"), ln=1)
         pdf.set_font("Arial", "", 12)
-        sorted_visits = sorted(self.node_visit_stats.items(), key=lambda x: x[1], reverse=True)
-        for idx, (node, visits) in enumerate(sorted_visits[:10], 1):
+        for idx, (node, visits) in enumerate(self.visit_stats.top(k=10), 1):
             pdf.cell(0, 8, safe_str(f"{idx}. Nodo {node} - Visitas: {visits}"), ln=1)
+        # Con un VisitCounter las sumas por rol salen de un solo bincount
+        if hasattr(self.node_visit_stats, "role_sums"):
+            for role, total in self.node_visit_stats.role_sums().items():
+                pdf.cell(0, 8, safe_str(f"Visitas a nodos {role}: {total}"), ln=1)
         pdf.ln(4)
 
         # 5. Tabla de pedidos recientes
@@ -107,7 +111,7 @@ class ReportGenerator:
         tempfiles = []
         if self.node_visit_stats:
             fig, ax = plt.subplots(figsize=(7, 3.2))
-            items = sorted(self.node_visit_stats.items(), key=lambda x: x[1], reverse=True)[:10]
+            items = self.visit_stats.top(k=10)
             nodes = [safe_str(str(k)) for k, _ in items]
             visits = [v for _, v in items]
             ax.bar(nodes, visits, color="steelblue")
@@ -196,5 +200,6 @@ class ReportGenerator:
         return filename
 
 # Ejemplo de uso:
-# generator = ReportGenerator(stats, orders, clients, routes, node_visit_stats, role_counts, node_roles)
+# generator = ReportGenerator(stats, orders, clients, routes, node_visit_stats, role_counts, node_roles,
+#                             visit_stats=st.session_state["visit_stats"])
 # generator.generate_pdf("reporte.pdf")